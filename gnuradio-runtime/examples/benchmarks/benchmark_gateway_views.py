@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+"""
+Measure the per-call overhead of turning the buffer pointers handed to a
+Python block into numpy arrays, comparing the per-call array construction
+used by earlier releases with the cached views of gateway_block.
+"""
+
+import ctypes
+import time
+from argparse import ArgumentParser
+
+import numpy
+
+from gnuradio.gr import gateway
+
+
+def legacy_pointer_to_ndarray(addr, dtype, nitems):
+    class array_like(object):
+        __array_interface__ = {
+            'data': (int(addr), False),
+            'typestr': dtype.base.str,
+            'descr': dtype.base.descr,
+            'shape': (nitems,) + dtype.shape,
+            'strides': None,
+            'version': 3
+        }
+    return numpy.asarray(array_like()).view(dtype.base)
+
+
+def legacy_views(capsules, dtype, nitems):
+    ctypes.pythonapi.PyCapsule_GetPointer.restype = ctypes.c_void_p
+    ctypes.pythonapi.PyCapsule_GetPointer.argtypes = [
+        ctypes.py_object, ctypes.c_char_p]
+    return [legacy_pointer_to_ndarray(
+        ctypes.pythonapi.PyCapsule_GetPointer(capsules[i], None),
+        dtype, nitems) for i in range(len(capsules))]
+
+
+def cached_views(cache, capsules, dtype, nitems):
+    return [cache.view(i, gateway._capsule_get_pointer(capsules[i], None),
+                       dtype, nitems) for i in range(len(capsules))]
+
+
+def make_capsules(buffers, offset):
+    capsule_new = ctypes.pythonapi.PyCapsule_New
+    capsule_new.restype = ctypes.py_object
+    capsule_new.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_void_p]
+    return [capsule_new(ctypes.addressof(b) + offset, None, None)
+            for b in buffers]
+
+
+def benchmark(name, func, calls):
+    start = time.perf_counter()
+    for args in calls:
+        func(*args)
+    delta = time.perf_counter() - start
+    print("%10s: %8d calls, %8.3f us/call" %
+          (name, len(calls), 1e6 * delta / len(calls)))
+    return delta
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("-p", "--ports", type=int, default=2,
+                        help="number of ports per work call")
+    parser.add_argument("-n", "--nitems", type=int, default=64,
+                        help="items per work call")
+    parser.add_argument("-b", "--buffer-items", type=int, default=8192,
+                        help="items in each (simulated) circular buffer")
+    parser.add_argument("-N", "--num-calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    dtype = numpy.dtype(numpy.complex64)
+    buffers = [(ctypes.c_char * (2 * args.buffer_items * dtype.itemsize))()
+               for _ in range(args.ports)]
+    # Walk the buffers the way the scheduler walks a circular buffer
+    step = args.nitems * dtype.itemsize
+    windows = [make_capsules(buffers, k * step)
+               for k in range(args.buffer_items // args.nitems or 1)]
+    calls = [windows[k % len(windows)] for k in range(args.num_calls)]
+
+    before = benchmark("legacy", legacy_views,
+                       [(c, dtype, args.nitems) for c in calls])
+    cache = gateway.ndarray_view_cache()
+    after = benchmark("cached", cached_views,
+                      [(cache, c, dtype, args.nitems) for c in calls])
+    print("speedup: %.1fx, cache hits: %d, misses: %d" %
+          (before / after, cache.hits, cache.misses))
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+"""
+Measure pmt.to_pmt/pmt.to_python on file metadata headers and PDU
+metadata dicts, comparing the linear type walk of earlier releases with
+the cached dispatch and symbol interning of pmt.pmt_to_python.
+"""
+
+import time
+from argparse import ArgumentParser
+
+import numpy
+import pmt
+from pmt import pmt_to_python as p2p
+
+
+########################################################################
+# Reference implementation as in earlier releases
+########################################################################
+def legacy_to_dict(p):
+    d = dict()
+    items = pmt.dict_items(p)
+    for i in range(pmt.length(items)):
+        pair = pmt.nth(i, items)
+        d[legacy_to_python(pmt.car(pair))] = legacy_to_python(pmt.cdr(pair))
+    return d
+
+
+def legacy_from_dict(p):
+    d = pmt.make_dict()
+    for k, v in list(p.items()):
+        d = pmt.dict_add(d, legacy_to_pmt(k), legacy_to_pmt(v))
+    return d
+
+
+def legacy_to_tuple(p):
+    return tuple(legacy_to_python(pmt.tuple_ref(p, i))
+                 for i in range(pmt.length(p)))
+
+
+def legacy_from_tuple(p):
+    return pmt.make_tuple(*map(legacy_to_pmt, p))
+
+
+def legacy_to_vector(p):
+    return [legacy_to_python(pmt.vector_ref(p, i))
+            for i in range(pmt.length(p))]
+
+
+def legacy_from_vector(p):
+    v = pmt.make_vector(len(p), pmt.PMT_NIL)
+    for i, elem in enumerate(p):
+        pmt.vector_set(v, i, legacy_to_pmt(elem))
+    return v
+
+
+legacy_mappings = (
+    (None, pmt.is_null, lambda x: None, lambda x: pmt.PMT_NIL),
+    (bool, pmt.is_bool, pmt.to_bool, pmt.from_bool),
+    (str, pmt.is_symbol, pmt.symbol_to_string, pmt.string_to_symbol),
+    (str, lambda x: False, None, None),
+    (int, pmt.is_integer, pmt.to_long, pmt.from_long),
+    (int, pmt.is_uint64, lambda x: int(pmt.to_uint64(x)), pmt.from_uint64),
+    (float, pmt.is_real, pmt.to_double, pmt.from_double),
+    (complex, pmt.is_complex, pmt.to_complex, pmt.from_complex),
+    (tuple, pmt.is_tuple, legacy_to_tuple, legacy_from_tuple),
+    (list, pmt.is_vector, legacy_to_vector, legacy_from_vector),
+    (dict, pmt.is_dict, legacy_to_dict, legacy_from_dict),
+    (tuple, pmt.is_pair,
+     lambda x: (legacy_to_python(pmt.car(x)), legacy_to_python(pmt.cdr(x))),
+     lambda x: pmt.cons(legacy_to_pmt(x[0]), legacy_to_pmt(x[1]))),
+    (numpy.ndarray, pmt.is_uniform_vector,
+     p2p.uvector_to_numpy, p2p.numpy_to_uvector),
+)
+
+
+def legacy_to_python(p):
+    for python_type, pmt_check, to_python, from_python in legacy_mappings:
+        if pmt_check(p):
+            return to_python(p)
+    raise ValueError("can't convert %s" % p)
+
+
+def legacy_to_pmt(p):
+    for python_type, pmt_check, to_python, from_python in legacy_mappings:
+        if python_type is None:
+            if p is None:
+                return from_python(p)
+        elif isinstance(p, python_type):
+            return from_python(p)
+    raise ValueError("can't convert %s" % p)
+
+
+########################################################################
+# Test data
+########################################################################
+def file_meta_header(k):
+    return {
+        "version": 0,
+        "rx_rate": 1e6,
+        "rx_time": (1600000000 + k, 0.25),
+        "rx_freq": 2.4e9,
+        "size": 8,
+        "type": 5,
+        "cplx": True,
+        "strt": 171,
+        "bytes": 8000000,
+    }
+
+
+def pdu_meta(k):
+    return {
+        "packet_num": k,
+        "packet_len": 1500,
+        "burst_id": "burst",
+        "freq_offset": -1234.5,
+        "snr": 17.25,
+        "crc_ok": True,
+    }
+
+
+def benchmark(name, func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    delta = time.perf_counter() - start
+    print("%24s: %8.2f us/dict" % (name, 1e6 * delta / len(items)))
+    return delta
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("-N", "--num-dicts", type=int, default=20000)
+    args = parser.parse_args()
+
+    for label, make in (("file metadata", file_meta_header),
+                        ("PDU metadata", pdu_meta)):
+        dicts = [make(k) for k in range(args.num_dicts)]
+        pmts = [pmt.to_pmt(d) for d in dicts]
+        print(label)
+        before = benchmark("legacy to_pmt", legacy_to_pmt, dicts)
+        after = benchmark("to_pmt", pmt.to_pmt, dicts)
+        print("%24s: %8.1fx" % ("speedup", before / after))
+        before = benchmark("legacy to_python", legacy_to_python, pmts)
+        after = benchmark("to_python", pmt.to_python, pmts)
+        print("%24s: %8.1fx" % ("speedup", before / after))
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
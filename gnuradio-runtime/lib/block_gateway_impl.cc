@@ -12,6 +12,10 @@
 
 #include <gnuradio/io_signature.h>
 
+#ifdef GR_CTRLPORT
+#include <gnuradio/rpcregisterhelpers.h>
+#endif
+
 namespace gr {
 
 block_gateway::sptr block_gateway::make(const py::object& p,
@@ -70,4 +74,75 @@ bool block_gateway_impl::stop(void)
     return ret.cast<bool>();
 }
 
+float block_gateway_impl::py_profile_counter(const char* name)
+{
+    py::gil_scoped_acquire acquire;
+
+    try {
+        return _py_handle.attr("profile_counter")(name).cast<float>();
+    } catch (const py::error_already_set& e) {
+        GR_LOG_WARN(d_logger,
+                    boost::format("profiling counter %1% unavailable: %2%") % name %
+                        e.what());
+        return 0;
+    }
+}
+
+void block_gateway_impl::setup_rpc()
+{
+#ifdef GR_CTRLPORT
+    add_rpc_variable(
+        rpcbasic_sptr(new rpcbasic_register_get<block_gateway_impl, float>(
+            alias(),
+            "avg python work time",
+            &block_gateway_impl::py_work_time_avg,
+            pmt::mp(0),
+            pmt::mp(1e9),
+            pmt::mp(0),
+            "us",
+            "Average time spent in Python per work call",
+            RPC_PRIVLVL_MIN,
+            DISPTIME | DISPOPTSTRIP)));
+
+    add_rpc_variable(
+        rpcbasic_sptr(new rpcbasic_register_get<block_gateway_impl, float>(
+            alias(),
+            "python work calls",
+            &block_gateway_impl::py_work_calls,
+            pmt::mp(0),
+            pmt::mp(1e12),
+            pmt::mp(0),
+            "",
+            "Number of profiled Python work calls",
+            RPC_PRIVLVL_MIN,
+            DISPTIME | DISPOPTSTRIP)));
+
+    add_rpc_variable(
+        rpcbasic_sptr(new rpcbasic_register_get<block_gateway_impl, float>(
+            alias(),
+            "avg python items in",
+            &block_gateway_impl::py_items_in_avg,
+            pmt::mp(0),
+            pmt::mp(32768),
+            pmt::mp(0),
+            "",
+            "Average items consumed per Python work call",
+            RPC_PRIVLVL_MIN,
+            DISPTIME | DISPOPTSTRIP)));
+
+    add_rpc_variable(
+        rpcbasic_sptr(new rpcbasic_register_get<block_gateway_impl, float>(
+            alias(),
+            "avg python items out",
+            &block_gateway_impl::py_items_out_avg,
+            pmt::mp(0),
+            pmt::mp(32768),
+            pmt::mp(0),
+            "",
+            "Average items produced per Python work call",
+            RPC_PRIVLVL_MIN,
+            DISPTIME | DISPOPTSTRIP)));
+#endif /* GR_CTRLPORT */
+}
+
 } /* namespace gr */
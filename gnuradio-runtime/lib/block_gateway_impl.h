@@ -38,6 +38,17 @@ public:
 
     bool start(void) override;
     bool stop(void) override;
+
+    void setup_rpc() override;
+
+    /*******************************************************************
+     * Work call statistics collected on the Python side, see
+     * gateway_block.enable_profiling; all zero while profiling is off.
+     ******************************************************************/
+    float py_work_time_avg() { return py_profile_counter("avg_work_time"); }
+    float py_work_calls() { return py_profile_counter("work_calls"); }
+    float py_items_in_avg() { return py_profile_counter("avg_items_in"); }
+    float py_items_out_avg() { return py_profile_counter("avg_items_out"); }
     void set_msg_handler_pybind(pmt::pmt_t which_port, std::string& handler_name) override
     {
         if (msg_queue.find(which_port) == msg_queue.end()) {
@@ -78,6 +89,8 @@ protected:
 
 private:
     py::handle _py_handle;
+
+    float py_profile_counter(const char* name);
 };
 
 } /* namespace gr */
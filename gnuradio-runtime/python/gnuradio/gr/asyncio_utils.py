@@ -0,0 +1,244 @@
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+"""
+Bridges between flowgraphs and asyncio event loops.
+
+msg_sink_async and msg_source_async are message-only blocks that can be
+msg_connect'ed like any other block and are awaited from an event loop.
+flowgraph_control wraps the (partly blocking) top_block control calls in
+coroutines.
+
+Example::
+
+    tb = gr.top_block()
+    sink = asyncio_utils.msg_sink_async()
+    tb.msg_connect(some_block, "out", sink, "in")
+
+    async def main():
+        fg = asyncio_utils.flowgraph_control(tb)
+        await fg.start()
+        async for msg in sink:
+            ...
+"""
+
+import asyncio
+import collections
+import threading
+
+import pmt
+
+from .gateway import sync_block
+
+
+class msg_sink_async(sync_block):
+    """
+    Message sink whose messages are retrieved with coroutines.
+
+    Messages are queued by the scheduler's message thread. The event loop
+    is only woken up while a consumer waits, and then at most once per
+    batch: all messages arriving until the loop gets around to the wakeup
+    are handed out together by get_batch. There can be one waiting
+    consumer at a time.
+
+    Args:
+        port: name of the message input port
+        to_python: convert messages with pmt.to_python before handing them
+                   out
+    """
+
+    def __init__(self, port="in", to_python=False):
+        sync_block.__init__(self, name="msg_sink_async",
+                            in_sig=None, out_sig=None)
+        self._port = pmt.intern(port)
+        self._to_python = to_python
+        self._pending = collections.deque()
+        self._lock = threading.Lock()
+        self._waiter = None
+        self._waiter_loop = None
+        self._wakeup_scheduled = False
+        self.wakeups = 0
+        self.message_port_register_in(self._port)
+        self.set_msg_handler(self._port, self.handle_msg)
+
+    def handle_msg(self, msg):
+        with self._lock:
+            self._pending.append(msg)
+            if self._waiter is None or self._wakeup_scheduled:
+                return
+            self._wakeup_scheduled = True
+            loop = self._waiter_loop
+        try:
+            loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            pass  # the loop was closed while a consumer was waiting
+
+    def _wake(self):
+        with self._lock:
+            self._wakeup_scheduled = False
+            waiter, self._waiter = self._waiter, None
+        self.wakeups += 1
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _take(self, max_items):
+        if max_items is None or max_items >= len(self._pending):
+            batch = list(self._pending)
+            self._pending.clear()
+        else:
+            popleft = self._pending.popleft
+            batch = [popleft() for _ in range(max_items)]
+        if self._to_python:
+            batch = [pmt.to_python(msg) for msg in batch]
+        return batch
+
+    def pending(self):
+        """
+        Number of messages received but not handed out yet.
+        """
+        return len(self._pending)
+
+    async def get_batch(self, max_items=None):
+        """
+        Return a list of all (at most max_items) pending messages, waiting
+        for at least one to arrive.
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            with self._lock:
+                if self._pending:
+                    return self._take(max_items)
+                if self._waiter is not None and not self._waiter.done():
+                    raise RuntimeError(
+                        "msg_sink_async supports one waiting consumer only")
+                waiter = self._waiter = loop.create_future()
+                self._waiter_loop = loop
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    if self._waiter is waiter:
+                        self._waiter = None
+                raise
+
+    async def get(self):
+        """
+        Return the next message, waiting for it if necessary.
+        """
+        return (await self.get_batch(1))[0]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+
+class msg_source_async(sync_block):
+    """
+    Message source publishing messages handed to it from an event loop (or
+    any other thread).
+
+    Publishing only enqueues the message with the connected blocks, so it
+    never blocks and needs no round trip through the loop. Messages that
+    are not PMTs are converted with pmt.to_pmt.
+
+    Args:
+        port: name of the message output port
+    """
+
+    def __init__(self, port="out"):
+        sync_block.__init__(self, name="msg_source_async",
+                            in_sig=None, out_sig=None)
+        self._port = pmt.intern(port)
+        self.message_port_register_out(self._port)
+
+    def publish(self, msg):
+        if not isinstance(msg, pmt.pmt_base):
+            msg = pmt.to_pmt(msg)
+        self.message_port_pub(self._port, msg)
+
+    async def publish_from(self, messages):
+        """
+        Publish every message of an (async) iterable; returns the number of
+        messages published.
+        """
+        count = 0
+        if hasattr(messages, "__aiter__"):
+            async for msg in messages:
+                self.publish(msg)
+                count += 1
+        else:
+            for msg in messages:
+                self.publish(msg)
+                count += 1
+        return count
+
+
+class flowgraph_control(object):
+    """
+    Coroutine wrappers for controlling a top_block from an event loop.
+
+    Calls that may block (start, stop, lock, unlock) run in an executor, by
+    default the loop's; wait uses top_block.wait_async and does not occupy
+    an executor thread.
+
+    Args:
+        tb: the gr.top_block to control
+        executor: concurrent.futures.Executor to run blocking calls in
+    """
+
+    def __init__(self, tb, executor=None):
+        self.tb = tb
+        self.executor = executor
+
+    def _call(self, func, *args):
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(self.executor, func, *args)
+
+    async def start(self, max_noutput_items=10000000):
+        await self._call(self.tb.start, max_noutput_items)
+
+    async def stop(self):
+        await self._call(self.tb.stop)
+
+    async def wait(self, timeout=None):
+        return await self.tb.wait_async(timeout)
+
+    async def run(self, max_noutput_items=10000000):
+        await self.start(max_noutput_items)
+        return await self.wait()
+
+    async def lock(self):
+        await self._call(self.tb.lock)
+
+    async def unlock(self):
+        await self._call(self.tb.unlock)
+
+    def locked(self):
+        """
+        Async context manager holding the flowgraph lock, for reconfiguring
+        the flowgraph::
+
+            async with fg.locked():
+                tb.disconnect(...)
+                tb.connect(...)
+        """
+        return _locked(self)
+
+
+class _locked(object):
+    def __init__(self, control):
+        self.control = control
+
+    async def __aenter__(self):
+        await self.control.lock()
+        return self.control
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.control.unlock()
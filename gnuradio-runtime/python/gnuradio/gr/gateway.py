@@ -9,9 +9,15 @@
 
 
 import numpy
+import collections
 import ctypes
+import math
+import time
+
+import pmt
 
 from . import gr_python as gr
+from . import tag_utils
 from .gr_python import io_signature  # , io_signaturev
 from .gr_python import block_gateway
 
@@ -20,17 +26,158 @@ from .gr_python import block_gateway
 # Magic to turn pointers into numpy arrays
 # http://docs.scipy.org/doc/numpy/reference/arrays.interface.html
 ########################################################################
+
+# Private prototype for PyCapsule_GetPointer, so that we neither have to
+# reset the signature on every work call nor clobber the one other
+# modules may have set on ctypes.pythonapi.
+_capsule_get_pointer = ctypes.PYFUNCTYPE(
+    ctypes.c_void_p, ctypes.py_object, ctypes.c_char_p)(
+        ("PyCapsule_GetPointer", ctypes.pythonapi))
+
+
 def pointer_to_ndarray(addr, dtype, nitems):
-    class array_like(object):
-        __array_interface__ = {
-            'data': (int(addr), False),
-            'typestr': dtype.base.str,
-            'descr': dtype.base.descr,
-            'shape': (nitems,) + dtype.shape,
-            'strides': None,
-            'version': 3
+    buf = (ctypes.c_char * (nitems * dtype.itemsize)).from_address(addr)
+    return numpy.frombuffer(buf, dtype.base).reshape((nitems,) + dtype.shape)
+
+
+class ndarray_view_cache(object):
+    """
+    Keeps one ndarray view per port so that work calls do not have to
+    build fresh arrays for every buffer pointer handed over by the
+    scheduler.
+
+    For each port, the cache remembers the base address and item type of
+    a view spanning all memory windows seen so far. A requested window
+    that lies inside that span is served by slicing the view; adjacent or
+    overlapping windows (as produced by walking a circular buffer) grow
+    the span. Only an unrelated address or a different item type builds a
+    new view. The last returned slice is handed out again unchanged if
+    neither the pointer nor the length changed.
+    """
+
+    def __init__(self):
+        self._views = {}
+        self._last = {}
+        self.hits = 0
+        self.misses = 0
+
+    def view(self, port, addr, dtype, nitems):
+        """
+        Return an ndarray of nitems items of type dtype at address addr.
+        """
+        last = self._last.get(port)
+        if last is not None and last[0] == addr and last[1] == nitems \
+                and last[2] is dtype:
+            self.hits += 1
+            return last[3]
+
+        itemsize = dtype.itemsize
+        entry = self._views.get(port)
+        if entry is not None and entry[1] is dtype and itemsize:
+            base, _, span = entry
+            offset, rem = divmod(addr - base, itemsize)
+            if not rem:
+                if 0 <= offset and offset + nitems <= len(span):
+                    arr = span[offset:offset + nitems]
+                    self._last[port] = (addr, nitems, dtype, arr)
+                    self.hits += 1
+                    return arr
+                # Grow the span if the new window touches the old one
+                if -nitems <= offset <= len(span):
+                    start = min(base, addr)
+                    end = max(base + len(span) * itemsize,
+                              addr + nitems * itemsize)
+                    span = pointer_to_ndarray(
+                        start, dtype, (end - start) // itemsize)
+                    self._views[port] = (start, dtype, span)
+                    offset = (addr - start) // itemsize
+                    arr = span[offset:offset + nitems]
+                    self._last[port] = (addr, nitems, dtype, arr)
+                    self.misses += 1
+                    return arr
+
+        arr = pointer_to_ndarray(addr, dtype, nitems)
+        self._views[port] = (addr, dtype, arr)
+        self._last[port] = (addr, nitems, dtype, arr)
+        self.misses += 1
+        return arr
+
+    def clear(self):
+        """
+        Drop all cached views.
+        """
+        self._views.clear()
+        self._last.clear()
+
+
+class work_profile(object):
+    """
+    Records wall time and item counts of a block's work calls.
+
+    Every call updates running totals and a histogram of call durations
+    with power-of-two bins in microseconds (bin i counts calls taking
+    less than 2**i us, bin 0 calls below 1 us, the last bin everything
+    longer). The last `history` calls are kept in a ring buffer for
+    closer inspection.
+    """
+
+    record_dtype = numpy.dtype([("time", numpy.float64),
+                                ("duration", numpy.float64),
+                                ("items_in", numpy.int64),
+                                ("items_out", numpy.int64)])
+
+    def __init__(self, history=1024, nbins=32):
+        self._history = collections.deque(maxlen=history)
+        self._nbins = nbins
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.items_in = 0
+        self.items_out = 0
+        self._hist = [0] * self._nbins
+        self._history.clear()
+
+    def record(self, start, duration, items_in, items_out):
+        self.calls += 1
+        self.total_time += duration
+        if duration > self.max_time:
+            self.max_time = duration
+        self.items_in += items_in
+        self.items_out += items_out
+        self._hist[min(int(duration * 1e6).bit_length(),
+                       self._nbins - 1)] += 1
+        self._history.append((start, duration, items_in, items_out))
+
+    def avg_time(self):
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def histogram(self):
+        """
+        Return (upper bin edges in seconds, counts) of the call durations.
+        """
+        edges = numpy.ldexp(1e-6, numpy.arange(self._nbins))
+        edges[-1] = numpy.inf
+        return edges, numpy.array(self._hist, dtype=numpy.int64)
+
+    def history(self):
+        """
+        Return the most recent calls as a structured array of
+        record_dtype; times are time.perf_counter() values.
+        """
+        return numpy.array(list(self._history), dtype=self.record_dtype)
+
+    def summary(self):
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "avg_time": self.avg_time(),
+            "max_time": self.max_time,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
         }
-    return numpy.asarray(array_like()).view(dtype.base)
 
 ########################################################################
 # io_signature for Python
@@ -122,6 +269,18 @@ class gateway_block(object):
 
         self.msg_handlers = {}
 
+        # One cached ndarray view per port, see ndarray_view_cache
+        self._in_views = ndarray_view_cache()
+        self._out_views = ndarray_view_cache()
+
+        # Batched work mode, see set_min_batch
+        self._batch_min = 0
+        self._batch_latency = None
+        self._batch_held_since = None
+
+        # Work call statistics, see enable_profiling
+        self._profile = None
+
     def __getattr__(self, name):
         """
         Pass-through member requests to the C++ object.
@@ -146,10 +305,35 @@ class gateway_block(object):
         This is the handler function for forecast calls from
         block_gateway in c++ across pybind11 wrappers
         """
+        if self._batch_hold(noutput_items) and not self._input_done(ninputs):
+            # Ask for a full batch worth of input; the scheduler keeps us
+            # blocked on input until it is there.
+            return self.forecast(self._batch_min, ninputs)
         return self.forecast(noutput_items, ninputs)
 
         # return ninput_items_required
 
+    def _batch_hold(self, noutput_items):
+        """
+        True if a call for noutput_items has to wait for a full batch,
+        see set_min_batch.
+        """
+        if noutput_items >= self._batch_min:
+            return False
+        now = time.monotonic()
+        if self._batch_held_since is None:
+            self._batch_held_since = now
+        return (self._batch_latency is None or
+                now - self._batch_held_since < self._batch_latency)
+
+    def _input_done(self, ninputs):
+        """
+        True if an upstream block finished, so that a batch left partial
+        will never be completed.
+        """
+        detail = self.gateway.detail()
+        return any(detail.input(i).done() for i in range(ninputs))
+
     def forecast(self, noutput_items, ninputs):
         """
         forecast is only called from a general block
@@ -172,28 +356,24 @@ class gateway_block(object):
         in_types = self.in_sig().port_types(ninputs)
         out_types = self.out_sig().port_types(noutputs)
 
-        ctypes.pythonapi.PyCapsule_GetPointer.restype = ctypes.c_void_p
-        ctypes.pythonapi.PyCapsule_GetPointer.argtypes = [
-            ctypes.py_object, ctypes.c_char_p]
+        in_view = self._in_views.view
+        out_view = self._out_views.view
 
         if self._block_type != gr.GW_BLOCK_GENERAL:
-            ii = [pointer_to_ndarray(
-                ctypes.pythonapi.PyCapsule_GetPointer(input_items[i], None),
-                in_types[i],
-                self.fixed_rate_noutput_to_ninput(noutput_items)
-            ) for i in range(ninputs)]
+            ninput = self.fixed_rate_noutput_to_ninput(noutput_items)
+            ii = [in_view(i, _capsule_get_pointer(input_items[i], None),
+                          in_types[i], ninput)
+                  for i in range(ninputs)]
         else:
-            ii = [pointer_to_ndarray(
-                ctypes.pythonapi.PyCapsule_GetPointer(input_items[i], None),
-                in_types[i],
-                ninput_items[i]
-            ) for i in range(ninputs)]
-
-        oo = [pointer_to_ndarray(
-            ctypes.pythonapi.PyCapsule_GetPointer(output_items[i], None),
-            out_types[i],
-            noutput_items
-        ) for i in range(noutputs)]
+            ii = [in_view(i, _capsule_get_pointer(input_items[i], None),
+                          in_types[i], ninput_items[i])
+                  for i in range(ninputs)]
+
+        oo = [out_view(i, _capsule_get_pointer(output_items[i], None),
+                       out_types[i], noutput_items)
+              for i in range(noutputs)]
+
+        self._batch_held_since = None
 
         if self._block_type != gr.GW_BLOCK_GENERAL:
             r = self.work(ii, oo)
@@ -203,6 +383,71 @@ class gateway_block(object):
 
         return r
 
+    def _profiled_general_work(self, noutput_items, ninput_items,
+                               input_items, output_items):
+        has_input = len(ninput_items) > 0
+        if has_input:
+            nread = self.gateway.nitems_read(0)
+        start = time.perf_counter()
+        r = gateway_block.handle_general_work(
+            self, noutput_items, ninput_items, input_items, output_items)
+        duration = time.perf_counter() - start
+        consumed = self.gateway.nitems_read(0) - nread if has_input else 0
+        self._profile.record(start, duration, consumed, max(r, 0))
+        return r
+
+    def enable_profiling(self, history=1024):
+        """
+        Start recording statistics of the work calls, see work_profile.
+
+        Items in are counted as consumed from input 0, items out as the
+        number returned by work. Recording adds a few microseconds to
+        every work call; when disabled (the default) there is no overhead
+        at all. The statistics are also published via ControlPort as
+        "avg python work time", "python work calls", "avg python items in"
+        and "avg python items out".
+
+        Args:
+
+        history (int): number of most recent calls to keep individually.
+        """
+        self._profile = work_profile(history)
+        # The C++ gateway looks handle_general_work up on every call, so
+        # shadowing it on the instance switches the instrumented path in.
+        self.handle_general_work = self._profiled_general_work
+
+    def disable_profiling(self):
+        """
+        Stop recording work call statistics; the collected ones stay
+        available through profile().
+        """
+        self.__dict__.pop("handle_general_work", None)
+
+    def profile(self):
+        """
+        Return the work_profile of this block, or None if profiling was
+        never enabled.
+        """
+        return self._profile
+
+    def profile_counter(self, name):
+        """
+        Return one of the ControlPort profiling counters as float; called
+        from the C++ gateway.
+        """
+        p = self._profile
+        if p is None or not p.calls:
+            return 0.0
+        if name == "avg_work_time":
+            return p.avg_time() * 1e6
+        if name == "work_calls":
+            return float(p.calls)
+        if name == "avg_items_in":
+            return p.items_in / p.calls
+        if name == "avg_items_out":
+            return p.items_out / p.calls
+        raise ValueError("unknown profiling counter: " + name)
+
     def general_work(self, *args, **kwargs):
         """general work to be overloaded in a derived class"""
         raise NotImplementedError("general work not implemented")
@@ -211,6 +456,60 @@ class gateway_block(object):
         """work to be overloaded in a derived class"""
         raise NotImplementedError("work not implemented")
 
+    def set_min_batch(self, min_items, alignment=1, max_latency=None):
+        """
+        Opt in to batched work calls.
+
+        Work is normally not called until there is input and output space
+        for at least min_items output items, and noutput_items is always a
+        multiple of alignment. The output buffers are made large enough to
+        hold two batches. This lets blocks doing their processing in numpy
+        amortize the Python call overhead.
+
+        Args:
+
+        min_items (int): batch size, in output items. 0 disables
+        batching. Call this before the flow graph
+        is started, it sets the minimum output buffer size.
+
+        alignment (int): noutput_items is always a multiple of this
+        (rounded up to a multiple of the interpolation for interp_block).
+
+        max_latency (float): if given, the longest time in seconds the
+        block waits for a full batch of input before it is called with
+        whatever is available. Without it, the block only runs on full
+        batches, except for the partial batch left over when the upstream
+        blocks finish. As with set_output_multiple, only a multiple of
+        alignment of those items is passed on.
+        """
+        if min_items < 0 or alignment < 1:
+            raise ValueError("min_items must be >= 0 and alignment >= 1")
+        if max_latency is not None and max_latency < 0:
+            raise ValueError("max_latency must be >= 0")
+
+        multiple = alignment * self._interp // math.gcd(alignment,
+                                                        self._interp)
+        self.gateway.set_output_multiple(multiple)
+        # the scheduler blocks on output until a whole batch fits
+        self.gateway.set_min_noutput_items(min_items)
+        if min_items:
+            self.gateway.set_min_output_buffer(2 * min_items)
+        self._batch_min = min_items
+        self._batch_latency = max_latency
+        self._batch_held_since = None
+        if max_latency is not None:
+            # Blocked-on-input waits are bounded by this timer, so the
+            # deadline gets re-evaluated even if no new input shows up.
+            self.gateway.set_blkd_input_timer_value(
+                max(1, int(max_latency * 1000)))
+
+    def min_batch(self):
+        """
+        Return the minimum batch size set with set_min_batch, in output
+        items.
+        """
+        return self._batch_min
+
     def start(self):
         return True
 
@@ -223,6 +522,47 @@ class gateway_block(object):
     def out_sig(self):
         return self.__out_sig
 
+    def get_tags_in_window_array(self, which_input, rel_start, rel_end,
+                                 key=None):
+        """
+        Like get_tags_in_window, but return the tags as a structured
+        numpy array of dtype tag_utils.tag_dtype (see tags_to_array).
+        """
+        if key is None:
+            tags = self.gateway.get_tags_in_window(
+                which_input, rel_start, rel_end)
+        else:
+            if isinstance(key, str):
+                key = pmt.intern(key)
+            tags = self.gateway.get_tags_in_window(
+                which_input, rel_start, rel_end, key)
+        return tag_utils.tags_to_array(tags)
+
+    def get_tags_in_range_array(self, which_input, abs_start, abs_end,
+                                key=None):
+        """
+        Like get_tags_in_range, but return the tags as a structured
+        numpy array of dtype tag_utils.tag_dtype (see tags_to_array).
+        """
+        if key is None:
+            tags = self.gateway.get_tags_in_range(
+                which_input, abs_start, abs_end)
+        else:
+            if isinstance(key, str):
+                key = pmt.intern(key)
+            tags = self.gateway.get_tags_in_range(
+                which_input, abs_start, abs_end, key)
+        return tag_utils.tags_to_array(tags)
+
+    def add_item_tags(self, which_output, tags):
+        """
+        Add all tags of a structured array of dtype tag_utils.tag_dtype
+        (see make_tag_array) to an output.
+        """
+        add_item_tag = self.gateway.add_item_tag
+        for tag in tag_utils.array_to_tags(tags):
+            add_item_tag(which_output, tag)
+
     def set_msg_handler(self, which_port, handler_function):
         self.gateway.set_msg_handler_pybind(
             which_port, handler_function.__name__)
@@ -8,6 +8,8 @@
 #
 #
 
+import numpy
+
 from gnuradio import gr
 import pmt
 
@@ -48,71 +50,183 @@ def vectors_to_strings(data, tags, tsb_tag_key):
     return [vector_to_string(packet) for packet in packets]
 
 
-def count_bursts(data, tags, tsb_tag_key, vlen=1):
+def length_tags_to_arrays(tags, tsb_tag_key, vlen=1):
+    """
+    Extract the length tags with key tsb_tag_key from a list of tags.
+
+    Returns two int64 numpy arrays (offsets, lengths), sorted by offset.
+    Lengths are multiplied by vlen.
+    """
     lengthtags = [t for t in tags
                   if pmt.symbol_to_string(t.key) == tsb_tag_key]
-    lengths = {}
-    for tag in lengthtags:
-        if tag.offset in lengths:
-            raise ValueError(
-                "More than one tags with key {0} with the same offset={1}."
-                .format(tsb_tag_key, tag.offset))
-        lengths[tag.offset] = pmt.to_long(tag.value) * vlen
-    in_burst = False
-    in_packet = False
-    packet_length = None
-    packet_pos = None
-    burst_count = 0
-    for pos in range(len(data)):
-        if pos in lengths:
-            if in_packet:
-                print("Got tag at pos {0} current packet_pos is {1}".format(
-                    pos, packet_pos))
-                raise Exception("Received packet tag while in packet.")
-            packet_pos = -1
-            packet_length = lengths[pos]
-            in_packet = True
-            if not in_burst:
-                burst_count += 1
-            in_burst = True
-        elif not in_packet:
-            in_burst = False
-        if in_packet:
-            packet_pos += 1
-            if packet_pos == packet_length - 1:
-                in_packet = False
-                packet_pos = None
-    return burst_count
+    offsets = numpy.array([t.offset for t in lengthtags], dtype=numpy.int64)
+    lengths = numpy.array([pmt.to_long(t.value) for t in lengthtags],
+                          dtype=numpy.int64) * vlen
+    order = numpy.argsort(offsets, kind='stable')
+    offsets = offsets[order]
+    lengths = lengths[order]
+    dups = numpy.flatnonzero(offsets[1:] == offsets[:-1])
+    if len(dups):
+        raise ValueError(
+            "More than one tags with key {0} with the same offset={1}."
+            .format(tsb_tag_key, offsets[dups[0]]))
+    return offsets, lengths
+
+
+def count_bursts_arrays(offsets, lengths, nitems):
+    """
+    Count bursts of back-to-back packets in a stream of nitems items.
+
+    offsets and lengths describe the packets (see length_tags_to_arrays),
+    sorted by offset. Packets starting at or after nitems are ignored.
+    """
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+    lengths = numpy.asarray(lengths, dtype=numpy.int64)
+    keep = offsets < nitems
+    offsets = offsets[keep]
+    lengths = lengths[keep]
+    if not len(offsets):
+        return 0
+    # A zero length packet never ends, so any later tag is inside of it
+    ends = numpy.where(lengths > 0, offsets + lengths - 1,
+                       numpy.iinfo(numpy.int64).max)
+    inside = numpy.flatnonzero(offsets[1:] <= ends[:-1])
+    if len(inside):
+        print("Got tag at pos {0} current packet_pos is {1}".format(
+            offsets[inside[0] + 1],
+            offsets[inside[0] + 1] - offsets[inside[0]]))
+        raise Exception("Received packet tag while in packet.")
+    return 1 + int(numpy.count_nonzero(offsets[1:] != ends[:-1] + 1))
 
 
-def vectors_to_packets(data, tags, tsb_tag_key, vlen=1):
-    lengthtags = [t for t in tags
-                  if pmt.symbol_to_string(t.key) == tsb_tag_key]
-    lengths = {}
-    for tag in lengthtags:
-        if tag.offset in lengths:
-            raise ValueError(
-                "More than one tags with key {0} with the same offset={1}."
-                .format(tsb_tag_key, tag.offset))
-        lengths[tag.offset] = pmt.to_long(tag.value) * vlen
-    if 0 not in lengths:
+def count_bursts(data, tags, tsb_tag_key, vlen=1):
+    offsets, lengths = length_tags_to_arrays(tags, tsb_tag_key, vlen)
+    return count_bursts_arrays(offsets, lengths, len(data))
+
+
+def packet_boundaries(offsets, lengths, nitems, tsb_tag_key='length'):
+    """
+    Follow the chain of packets starting at item 0 through a stream of
+    nitems items, as described by sorted offsets and lengths arrays.
+
+    Returns the start offsets of the packets (an int64 array, the last
+    one followed by nitems). Tags that do not start a packet in the chain
+    are ignored. Raises ValueError if the chain has gaps or the final
+    packet is incomplete.
+    """
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+    lengths = numpy.asarray(lengths, dtype=numpy.int64)
+    if not len(offsets) or offsets[0] != 0:
         raise ValueError("There is no tag with key {0} and an offset of 0"
                          .format(tsb_tag_key))
+    if nitems == 0:
+        return offsets[:0]
+    ends = offsets + lengths
+    # Fast path: the tags describe back-to-back packets covering the data
+    n = numpy.searchsorted(offsets, nitems)
+    if numpy.all(lengths[:n] > 0) and \
+            numpy.array_equal(offsets[1:n], ends[:n - 1]) and \
+            ends[n - 1] == nitems:
+        return offsets[:n]
+
+    starts = []
     pos = 0
-    packets = []
-    while pos < len(data):
-        if pos not in lengths:
+    while pos < nitems:
+        index = numpy.searchsorted(offsets, pos)
+        if index == len(offsets) or offsets[index] != pos:
             raise ValueError("There is no tag with key {0} and an offset of {1}."
                              "We were expecting one."
                              .format(tsb_tag_key, pos))
-        length = lengths[pos]
-        if length == 0:
+        if lengths[index] == 0:
             raise ValueError("Packets cannot have zero length.")
-        if pos + length > len(data):
+        if ends[index] > nitems:
             raise ValueError("The final packet is incomplete.")
-        packets.append(data[pos: pos + length])
-        pos += length
-    return packets
+        starts.append(pos)
+        pos = int(ends[index])
+    return numpy.array(starts, dtype=numpy.int64)
+
+
+def split_packets(data, offsets, lengths, tsb_tag_key='length'):
+    """
+    Split data into packets given arrays of packet offsets and lengths.
+
+    For numpy arrays, the packets are views into data (numpy.split);
+    other sequences are sliced.
+    """
+    starts = packet_boundaries(offsets, lengths, len(data), tsb_tag_key)
+    if not len(starts):
+        return []
+    if isinstance(data, numpy.ndarray):
+        return numpy.split(data, starts[1:])
+    bounds = starts.tolist() + [len(data)]
+    return [data[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def vectors_to_packets(data, tags, tsb_tag_key, vlen=1):
+    offsets, lengths = length_tags_to_arrays(tags, tsb_tag_key, vlen)
+    return split_packets(data, offsets, lengths, tsb_tag_key)
+
+
+def join_packets(packets, vlen=1):
+    """
+    Concatenate packets into a single numpy array.
+
+    Returns (data, offsets, lengths) with offsets and lengths in units of
+    vlen items, ready for make_lengthtags or a stream-to-tagged-stream
+    style replay.
+    """
+    lengths = numpy.array([len(p) for p in packets], dtype=numpy.int64)
+    offsets = numpy.zeros(len(lengths), dtype=numpy.int64)
+    numpy.cumsum(lengths[:-1], out=offsets[1:])
+    if len(packets):
+        data = numpy.concatenate([numpy.asarray(p) for p in packets])
+    else:
+        data = numpy.array([])
+    return data, offsets // vlen, lengths // vlen
+
+
+def iter_packets(chunks, offsets, lengths):
+    """
+    Generator yielding packets from a capture read in chunks.
+
+    chunks is an iterable of consecutive pieces of the stream (e.g. blocks
+    read from a file or slices of a numpy.memmap); offsets and lengths are
+    the absolute packet positions (see length_tags_to_arrays). Items
+    between packets are skipped. Packets contained in a single chunk are
+    yielded as views of that chunk; only packets crossing a chunk boundary
+    are copied.
+    """
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+    lengths = numpy.asarray(lengths, dtype=numpy.int64)
+    ends = offsets + lengths
+    if numpy.any(offsets[1:] < ends[:-1]):
+        raise Exception("Received packet tag while in packet.")
+
+    index = 0
+    buf = None
+    buf_start = 0
+    for chunk in chunks:
+        chunk = numpy.asarray(chunk)
+        if buf is None or not len(buf):
+            buf = chunk
+        else:
+            buf = numpy.concatenate((buf, chunk))
+        buf_end = buf_start + len(buf)
+        last = numpy.searchsorted(ends, buf_end, side='right')
+        for k in range(index, last):
+            yield buf[offsets[k] - buf_start:ends[k] - buf_start]
+        index = last
+        # Keep the start of an unfinished packet for the next chunk
+        if index < len(offsets) and offsets[index] < buf_end:
+            keep_from = offsets[index]
+        else:
+            keep_from = buf_end
+        buf = buf[keep_from - buf_start:]
+        buf_start = keep_from
+        if index == len(offsets):
+            return
+    if index < len(offsets) and buf is not None and len(buf):
+        raise ValueError("The final packet is incomplete.")
 
 
 def packets_to_vectors(packets, tsb_tag_key, vlen=1):
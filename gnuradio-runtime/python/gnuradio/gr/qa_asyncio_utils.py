@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import asyncio
+
+import pmt
+from gnuradio import gr, gr_unittest
+from gnuradio.gr import asyncio_utils
+
+
+class test_asyncio_utils(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.tb = gr.top_block()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        self.tb = None
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(asyncio.wait_for(coro, 10))
+
+    def test_001_source_to_sink(self):
+        src = asyncio_utils.msg_source_async()
+        snk = asyncio_utils.msg_sink_async(to_python=True)
+        self.tb.msg_connect(src, "out", snk, "in")
+        fg = asyncio_utils.flowgraph_control(self.tb)
+
+        async def exchange():
+            await fg.start()
+            self.assertEqual(await src.publish_from(range(100)), 100)
+            received = []
+            while len(received) < 100:
+                received.extend(await snk.get_batch())
+            src.publish(pmt.intern("last"))
+            last = await snk.get()
+            await fg.stop()
+            self.assertTrue(await fg.wait())
+            return received, last
+
+        received, last = self.run_async(exchange())
+        self.assertEqual(received, list(range(100)))
+        self.assertEqual(last, "last")
+
+    def test_002_batch_limit(self):
+        snk = asyncio_utils.msg_sink_async()
+        for i in range(10):
+            snk.handle_msg(pmt.from_long(i))
+        self.assertEqual(snk.pending(), 10)
+        batch = self.run_async(snk.get_batch(4))
+        self.assertEqual([pmt.to_long(m) for m in batch], [0, 1, 2, 3])
+        batch = self.run_async(snk.get_batch())
+        self.assertEqual(len(batch), 6)
+        self.assertEqual(snk.pending(), 0)
+        self.assertEqual(snk.wakeups, 0)
+
+    def test_003_batched_wakeup(self):
+        snk = asyncio_utils.msg_sink_async()
+
+        async def consume():
+            consumer = asyncio.ensure_future(snk.get_batch())
+            while snk._waiter is None:
+                await asyncio.sleep(0)
+            # all of these arrive before the loop gets to the wakeup
+            for i in range(10):
+                snk.handle_msg(pmt.from_long(i))
+            return await consumer
+
+        batch = self.run_async(consume())
+        self.assertEqual([pmt.to_long(m) for m in batch], list(range(10)))
+        self.assertEqual(snk.wakeups, 1)
+
+    def test_004_locked(self):
+        src = asyncio_utils.msg_source_async()
+        snk = asyncio_utils.msg_sink_async()
+        self.tb.msg_connect(src, "out", snk, "in")
+        fg = asyncio_utils.flowgraph_control(self.tb)
+
+        async def reconfigure():
+            await fg.start()
+            async with fg.locked():
+                self.tb.msg_disconnect(src, "out", snk, "in")
+                self.tb.msg_connect(src, "out", snk, "in")
+            src.publish(1)
+            msg = await snk.get()
+            await fg.stop()
+            await fg.wait()
+            return msg
+
+        self.assertEqual(pmt.to_long(self.run_async(reconfigure())), 1)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(test_asyncio_utils)
@@ -10,9 +10,46 @@
 #
 
 
+import asyncio
+import threading
+
+import numpy
+
 from gnuradio import gr, gr_unittest
 
 
+class counting_source(gr.sync_block):
+    """
+    Produces nitems zeros and then signals done; runs forever if nitems
+    is None.
+    """
+
+    def __init__(self, nitems=None):
+        gr.sync_block.__init__(self, name="counting_source",
+                               in_sig=None, out_sig=[numpy.float32])
+        self.nitems = nitems
+        self.produced = 0
+
+    def work(self, input_items, output_items):
+        if self.nitems is not None and self.produced >= self.nitems:
+            return -1
+        n = len(output_items[0])
+        if self.nitems is not None:
+            n = min(n, self.nitems - self.produced)
+        output_items[0][:n] = 0
+        self.produced += n
+        return n
+
+
+class discard_sink(gr.sync_block):
+    def __init__(self):
+        gr.sync_block.__init__(self, name="discard_sink",
+                               in_sig=[numpy.float32], out_sig=None)
+
+    def work(self, input_items, output_items):
+        return len(input_items[0])
+
+
 class test_flowgraph (gr_unittest.TestCase):
 
     def setUp(self):
@@ -25,6 +62,71 @@ class test_flowgraph (gr_unittest.TestCase):
         self.tb.start()
         self.tb.stop()
 
+    def test_001_wait_timeout(self):
+        self.tb.connect(counting_source(), discard_sink())
+        self.tb.start()
+        self.assertFalse(self.tb.wait(timeout=0.05))
+        self.tb.stop()
+        self.assertTrue(self.tb.wait(timeout=10))
+
+    def test_002_wait_async(self):
+        src = counting_source(10000)
+        self.tb.connect(src, discard_sink())
+        loop = asyncio.new_event_loop()
+        try:
+            self.tb.start()
+            self.assertTrue(loop.run_until_complete(
+                self.tb.wait_async(timeout=10)))
+        finally:
+            loop.close()
+        self.assertEqual(src.produced, 10000)
+
+    def test_003_wait_async_timeout(self):
+        self.tb.connect(counting_source(), discard_sink())
+        loop = asyncio.new_event_loop()
+        try:
+            self.tb.start()
+            self.assertFalse(loop.run_until_complete(
+                self.tb.wait_async(timeout=0.05)))
+            self.tb.stop()
+            self.assertTrue(loop.run_until_complete(
+                self.tb.wait_async(timeout=10)))
+        finally:
+            loop.close()
+
+    def test_004_wait_async_cancel(self):
+        self.tb.connect(counting_source(), discard_sink())
+        loop = asyncio.new_event_loop()
+        try:
+            self.tb.start()
+            for _ in range(3):
+                self.assertFalse(loop.run_until_complete(
+                    self.tb.wait_async(timeout=0.01)))
+            task = loop.create_task(self.tb.wait_async())
+            loop.run_until_complete(asyncio.sleep(0.01))
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                loop.run_until_complete(task)
+            # the flowgraph is still running, without callbacks left over
+            self.assertTrue(self.tb._waiter_pending())
+            self.assertEqual(self.tb._waiter._callbacks, [])
+            self.tb.stop()
+            self.assertTrue(loop.run_until_complete(
+                self.tb.wait_async(timeout=10)))
+        finally:
+            loop.close()
+
+    def test_005_wait_from_thread(self):
+        src = counting_source(10000)
+        self.tb.connect(src, discard_sink())
+        self.tb.start()
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(self.tb.wait()))
+        waiter.start()
+        waiter.join(10)
+        self.assertEqual(result, [True])
+        self.assertEqual(src.produced, 10000)
+
 
 if __name__ == '__main__':
     gr_unittest.run(test_flowgraph)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import numpy
+
+from gnuradio import gr, gr_unittest
+from gnuradio.gr import packet_utils
+
+
+class test_packet_utils(gr_unittest.TestCase):
+
+    def test_round_trip(self):
+        packets = [[1, 2, 3], [4], [5, 6], [7, 8, 9, 10]]
+        data, tags = packet_utils.packets_to_vectors(packets, 'len')
+        self.assertEqual(data, list(range(1, 11)))
+        self.assertEqual(
+            packet_utils.vectors_to_packets(data, tags, 'len'), packets)
+        split = packet_utils.vectors_to_packets(
+            numpy.array(data), tags, 'len')
+        self.assertEqual([list(p) for p in split], packets)
+
+    def test_split_join_arrays(self):
+        packets = [numpy.arange(n, dtype=numpy.complex64) for n in (5, 1, 3)]
+        data, offsets, lengths = packet_utils.join_packets(packets)
+        self.assertEqual(list(offsets), [0, 5, 6])
+        self.assertEqual(list(lengths), [5, 1, 3])
+        split = packet_utils.split_packets(data, offsets, lengths)
+        for p, q in zip(packets, split):
+            self.assertComplexTuplesAlmostEqual(p, q)
+        # the packets are views into data
+        split[1][0] = 42
+        self.assertEqual(data[5], 42)
+
+    def test_split_errors(self):
+        data = numpy.zeros(10)
+        with self.assertRaises(ValueError):
+            packet_utils.split_packets(data, [1, 4], [3, 6])
+        with self.assertRaises(ValueError):
+            packet_utils.split_packets(data, [0, 4], [3, 6])
+        with self.assertRaises(ValueError):
+            packet_utils.split_packets(data, [0, 4], [4, 7])
+        # Tags that are not on a packet boundary are ignored
+        split = packet_utils.split_packets(data, [0, 2, 4], [4, 1, 6])
+        self.assertEqual([len(p) for p in split], [4, 6])
+
+    def test_count_bursts(self):
+        # two bursts: [0, 4) + [4, 6), then [8, 10)
+        tags = packet_utils.make_lengthtags([4, 2, 2], [0, 4, 8], 'len')
+        self.assertEqual(packet_utils.count_bursts(range(12), tags, 'len'), 2)
+        # packets starting after the end of the data are ignored
+        self.assertEqual(packet_utils.count_bursts(range(8), tags, 'len'), 1)
+        tags = packet_utils.make_lengthtags([4, 2], [0, 3], 'len')
+        with self.assertRaises(Exception):
+            packet_utils.count_bursts(range(12), tags, 'len')
+
+    def test_iter_packets(self):
+        data = numpy.arange(100)
+        offsets = numpy.array([0, 10, 35, 70])
+        lengths = numpy.array([10, 20, 30, 5])
+        chunks = (data[k:k + 16] for k in range(0, len(data), 16))
+        packets = list(packet_utils.iter_packets(chunks, offsets, lengths))
+        self.assertEqual(len(packets), len(offsets))
+        for p, o, n in zip(packets, offsets, lengths):
+            self.assertEqual(list(p), list(range(o, o + n)))
+        with self.assertRaises(ValueError):
+            list(packet_utils.iter_packets([data[:50]], offsets, lengths))
+
+
+if __name__ == '__main__':
+    gr_unittest.run(test_packet_utils)
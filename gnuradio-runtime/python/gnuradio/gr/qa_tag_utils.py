@@ -112,6 +112,43 @@ class test_tag_utils (gr_unittest.TestCase):
         self.assertTrue(pmt.equal(tmax.value, pmt.from_long(max(offsets))))
         self.assertTrue(pmt.equal(tmax.srcid, srcid))
 
+    def test_tag_array(self):
+        offsets = (6, 3, 8)
+        tags = []
+        for k in offsets:
+            t = gr.tag_t()
+            t.offset = k
+            t.key = pmt.intern('even' if k % 2 == 0 else 'odd')
+            t.value = pmt.from_long(k)
+            t.srcid = pmt.intern('qa_tag_utils')
+            tags.append(t)
+
+        arr = gr.tags_to_array(tags)
+        self.assertEqual(arr.dtype, gr.tag_dtype)
+        self.assertEqual(list(arr['offset']), list(offsets))
+        even = arr[arr['key'] == gr.tag_key_id('even')]
+        self.assertEqual(list(even['offset']), [6, 8])
+        self.assertEqual(gr.tag_values(even), [6, 8])
+        self.assertEqual(gr.tag_key_name(arr['key'][1]), 'odd')
+        self.assertEqual(gr.tag_key_id(pmt.intern('odd')), arr['key'][1])
+
+        for t, t2 in zip(tags, gr.array_to_tags(arr)):
+            self.assertEqual(t.offset, t2.offset)
+            self.assertTrue(pmt.equal(t.key, t2.key))
+            self.assertTrue(pmt.equal(t.value, t2.value))
+            self.assertTrue(pmt.equal(t.srcid, t2.srcid))
+
+    def test_make_tag_array(self):
+        arr = gr.make_tag_array([1, 2, 3], 'length', [10, 20, 30])
+        self.assertEqual(len(arr), 3)
+        self.assertEqual(gr.tag_values(arr), [10, 20, 30])
+        tags = gr.array_to_tags(arr)
+        self.assertEqual([t.offset for t in tags], [1, 2, 3])
+        self.assertTrue(pmt.equal(tags[0].key, pmt.intern('length')))
+        self.assertTrue(pmt.equal(tags[2].value, pmt.from_long(30)))
+        self.assertTrue(pmt.equal(tags[0].srcid, pmt.PMT_F))
+        self.assertEqual(len(gr.tags_to_array([])), 0)
+
 
 if __name__ == '__main__':
     gr_unittest.run(test_tag_utils)
@@ -1,3 +1,7 @@
+# Private names: gr/__init__.py star-imports this module into gr
+import threading as _threading
+
+import numpy as _numpy
 import pmt
 
 from . import gr_python as gr
@@ -103,3 +107,124 @@ def python_to_tag(tag_struct):
         return tag
     else:
         return None
+
+
+########################################################################
+# Bulk tag access
+########################################################################
+
+# Structured array layout used by the bulk tag functions. Values and
+# srcids are kept as PMTs and only decoded on request (see tag_values).
+tag_dtype = _numpy.dtype([('offset', _numpy.int64),
+                          ('key', _numpy.int32),
+                          ('value', object),
+                          ('srcid', object)])
+
+_key_lock = _threading.Lock()
+_key_ids = {}
+_key_names = []
+_key_symbols = []
+
+
+def tag_key_id(key):
+    """
+    Return the interned integer id of a tag key.
+
+    The key can be given as a string or as a PMT symbol. Ids are stable for
+    the lifetime of the process and can be used to filter the 'key' field
+    of arrays returned by tags_to_array with vector operations.
+    """
+    if not isinstance(key, str):
+        key = pmt.symbol_to_string(key)
+    try:
+        return _key_ids[key]
+    except KeyError:
+        with _key_lock:
+            if key not in _key_ids:
+                _key_names.append(key)
+                _key_symbols.append(pmt.intern(key))
+                _key_ids[key] = len(_key_names) - 1
+            return _key_ids[key]
+
+
+def tag_key_name(key_id):
+    """ Return the key string for an interned key id """
+    return _key_names[key_id]
+
+
+def tag_key_symbol(key_id):
+    """ Return the key PMT symbol for an interned key id """
+    return _key_symbols[key_id]
+
+
+def tags_to_array(tags):
+    """
+    Convert a sequence of stream tags to a numpy structured array of
+    dtype tag_dtype.
+
+    Offsets become int64 and keys become interned key ids; values and
+    srcids are stored as PMTs without being converted to Python.
+    """
+    arr = _numpy.empty(len(tags), dtype=tag_dtype)
+    if len(tags):
+        arr['offset'] = [tag.offset for tag in tags]
+        arr['key'] = [tag_key_id(tag.key) for tag in tags]
+        arr['value'] = [tag.value for tag in tags]
+        arr['srcid'] = [tag.srcid for tag in tags]
+    return arr
+
+
+def array_to_tags(arr):
+    """
+    Convert a structured array of dtype tag_dtype back to a list of stream
+    tags. Values and srcids that are not PMTs are converted with
+    pmt.to_pmt; missing srcids default to PMT_F.
+    """
+    tags = []
+    for offset, key, value, srcid in zip(arr['offset'].tolist(),
+                                         arr['key'].tolist(),
+                                         arr['value'], arr['srcid']):
+        tag = gr.tag_t()
+        tag.offset = offset
+        tag.key = _key_symbols[key]
+        tag.value = value if isinstance(value, pmt.pmt_base) \
+            else pmt.to_pmt(value)
+        if srcid is None:
+            tag.srcid = pmt.PMT_F
+        elif isinstance(srcid, pmt.pmt_base):
+            tag.srcid = srcid
+        else:
+            tag.srcid = pmt.to_pmt(srcid)
+        tags.append(tag)
+    return tags
+
+
+def make_tag_array(offsets, key, values, srcid=None):
+    """
+    Build a tag array for tags sharing one key.
+
+    Args:
+
+    offsets: absolute item offsets of the tags
+
+    key (str or PMT symbol): key of all tags
+
+    values: one value per tag, as PMTs or Python objects
+
+    srcid: srcid of all tags (PMT, Python object or None for PMT_F)
+    """
+    offsets = _numpy.asarray(offsets, dtype=_numpy.int64)
+    arr = _numpy.empty(len(offsets), dtype=tag_dtype)
+    arr['offset'] = offsets
+    arr['key'] = tag_key_id(key)
+    arr['value'] = list(values)
+    arr['srcid'] = [srcid] * len(offsets)
+    return arr
+
+
+def tag_values(arr):
+    """
+    Decode the values of a tag array (or of a slice of it) to Python
+    objects.
+    """
+    return [pmt.to_python(value) for value in arr['value']]
@@ -14,9 +14,19 @@ from .gr_python import (top_block_pb,
                         top_block_unlock_unlocked)  # , dot_graph_tb)
 
 from .hier_block2 import hier_block2
+import asyncio
+import sys
 import threading
+import time
 
-from .hier_block2 import hier_block2
+# Lock acquisition is only interruptible by signals on POSIX; elsewhere the
+# waiting thread has to wake up periodically to notice a KeyboardInterrupt.
+_SIGINT_POLL_INTERVAL = None if sys.platform != 'win32' else 0.1
+
+# asyncio.get_running_loop is new in Python 3.7; inside a coroutine
+# get_event_loop gives the same loop on 3.6.
+_get_running_loop = getattr(asyncio, 'get_running_loop',
+                            asyncio.get_event_loop)
 
 
 class _top_block_waiter(threading.Thread):
@@ -30,10 +40,11 @@ class _top_block_waiter(threading.Thread):
     threads running, no one will know.  Thus instead of directly waiting
     in the thread that calls wait (which is likely to be the Python main
     thread), we create a separate thread that does the blocking wait,
-    and then use the thread that called wait to do a slow poll of an
-    event queue.  That thread, which is executing "wait" below is
-    interruptible, and if it sees a KeyboardInterrupt, executes a stop
-    on the top_block, then goes back to waiting for it to complete.
+    and then use the thread that called wait to block on an event, which
+    unlike the C++ wait can be interrupted by signals.  That thread, which
+    is executing "wait" below is interruptible, and if it sees a
+    KeyboardInterrupt, executes a stop on the top_block, then goes back
+    to waiting for it to complete.
     This ensures that the unlocked wait that was in progress (in the
     _top_block_waiter thread) can complete, release its mutex and back
     out.  If we don't do that, we are never able to clean up, and nasty
@@ -45,24 +56,66 @@ class _top_block_waiter(threading.Thread):
 
     def __init__(self, tb):
         threading.Thread.__init__(self)
-        self.setDaemon(1)
+        self.daemon = True
         self.tb = tb
         self.event = threading.Event()
+        self._callbacks = []
+        self._callbacks_lock = threading.Lock()
         self.start()
 
     def run(self):
         top_block_wait_unlocked(self.tb)
-        self.event.set()
+        with self._callbacks_lock:
+            self.event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
 
-    def wait(self, handle_sigint=True):
-        try:
-            while not self.event.wait(0.1):
+    def add_done_callback(self, callback):
+        """
+        Call callback() from the waiter thread once the flowgraph finished,
+        or immediately if it already has.
+        """
+        with self._callbacks_lock:
+            if not self.event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_done_callback(self, callback):
+        """
+        Forget a callback added with add_done_callback that was not called
+        yet.
+        """
+        with self._callbacks_lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
                 pass
+
+    def wait(self, handle_sigint=True, timeout=None):
+        """
+        Block until the flowgraph finished or timeout seconds passed.
+
+        Returns True if the flowgraph finished.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                remaining = _SIGINT_POLL_INTERVAL
+                if deadline is not None:
+                    remaining = max(0.0, deadline - time.monotonic())
+                    if _SIGINT_POLL_INTERVAL is not None:
+                        remaining = min(remaining, _SIGINT_POLL_INTERVAL)
+                if self.event.wait(remaining):
+                    return True
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
         except KeyboardInterrupt:
             if not handle_sigint:
                 raise
             self.tb.stop()
-            self.wait()
+            return self.wait()
 
 
 #
@@ -92,6 +145,8 @@ class top_block(hier_block2):
         # not calling hier_block2.__init__, we set our own _impl
         self._impl = top_block_pb(name, catch_exceptions)
         self.handle_sigint = True
+        self._waiter = None
+        self._waiter_lock = threading.Lock()
 
     def start(self, max_noutput_items=10000000):
         """
@@ -118,11 +173,79 @@ class top_block(hier_block2):
         """
         top_block_unlock_unlocked(self._impl)
 
-    def wait(self):
+    def _get_waiter(self):
+        """
+        Return the waiter thread for the current run, creating it if needed.
+
+        A wait that timed out leaves its waiter running, so subsequent calls
+        to wait/wait_async share it instead of piling up blocked threads.
+        """
+        with self._waiter_lock:
+            if self._waiter is None or self._waiter.event.is_set():
+                self._waiter = _top_block_waiter(self._impl)
+            return self._waiter
+
+    def _waiter_pending(self):
+        waiter = self._waiter
+        return waiter is not None and not waiter.event.is_set()
+
+    def wait(self, timeout=None):
         """
         Wait for the flowgraph to finish running
+
+        Args:
+            timeout: maximum number of seconds to wait, or None to wait
+                     until the flowgraph is done
+
+        Returns:
+            True if the flowgraph finished, False if the timeout expired.
+        """
+        if (timeout is None and not self._waiter_pending() and
+                threading.current_thread() is not threading.main_thread()):
+            # Signals are only delivered to the main thread, so there is
+            # nothing to stay responsive for: wait in the calling thread.
+            top_block_wait_unlocked(self._impl)
+            return True
+        return self._get_waiter().wait(self.handle_sigint, timeout)
+
+    async def wait_async(self, timeout=None):
+        """
+        Coroutine waiting for the flowgraph to finish running
+
+        The event loop is woken up exactly once, when the scheduler is done;
+        no polling is involved. The main thread is never blocked, so ^C is
+        handled by the event loop as usual. Cancelling the awaiting task
+        (or a timeout) only ends the wait, the flowgraph keeps running;
+        stop it explicitly if that is wanted.
+
+        Args:
+            timeout: maximum number of seconds to wait, or None to wait
+                     until the flowgraph is done
+
+        Returns:
+            True if the flowgraph finished, False if the timeout expired.
         """
-        _top_block_waiter(self._impl).wait(self.handle_sigint)
+        loop = _get_running_loop()
+        done = loop.create_future()
+
+        def _set_done():
+            if not done.done():
+                done.set_result(True)
+
+        def _wake_loop():
+            try:
+                loop.call_soon_threadsafe(_set_done)
+            except RuntimeError:
+                pass  # the loop was closed in the meantime
+
+        waiter = self._get_waiter()
+        waiter.add_done_callback(_wake_loop)
+        try:
+            return await asyncio.wait_for(done, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiter.remove_done_callback(_wake_loop)
 
     # def dot_graph(self):
     #     """
@@ -46,3 +46,5 @@ PMT_EOF = get_PMT_EOF()
 
 from .pmt_to_python import pmt_to_python as to_python
 from .pmt_to_python import python_to_pmt as to_pmt
+from .pmt_to_python import intern_symbol
+from .pmt_to_python import uvector_view, numpy_to_uvector, uvector_to_numpy
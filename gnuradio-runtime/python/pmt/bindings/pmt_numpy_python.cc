@@ -0,0 +1,119 @@
+/*
+ * Copyright 2026 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+
+/*
+ * Buffer based conversion between uniform vectors and numpy arrays.
+ * Not generated by bindtool.
+ */
+
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+namespace py = pybind11;
+
+#include <pmt/pmt.h>
+#include <complex>
+#include <cstdint>
+
+namespace {
+
+template <typename T>
+py::array uvector_view_of(const pmt::pmt_t& v)
+{
+    size_t nbytes;
+    const void* data = pmt::uniform_vector_elements(v, nbytes);
+
+    // The capsule holds a reference to the uniform vector, so its storage
+    // stays alive for as long as the array or any view derived from it.
+    py::capsule owner(new pmt::pmt_t(v),
+                      [](void* p) { delete static_cast<pmt::pmt_t*>(p); });
+    py::array arr(py::dtype::of<T>(),
+                  { nbytes / sizeof(T) },
+                  { sizeof(T) },
+                  static_cast<const T*>(data),
+                  owner);
+    // PMTs may be shared between several message consumers
+    arr.attr("setflags")(false);
+    return arr;
+}
+
+py::array uvector_view(const pmt::pmt_t& v)
+{
+    if (pmt::is_u8vector(v))
+        return uvector_view_of<uint8_t>(v);
+    if (pmt::is_s8vector(v))
+        return uvector_view_of<int8_t>(v);
+    if (pmt::is_u16vector(v))
+        return uvector_view_of<uint16_t>(v);
+    if (pmt::is_s16vector(v))
+        return uvector_view_of<int16_t>(v);
+    if (pmt::is_u32vector(v))
+        return uvector_view_of<uint32_t>(v);
+    if (pmt::is_s32vector(v))
+        return uvector_view_of<int32_t>(v);
+    if (pmt::is_u64vector(v))
+        return uvector_view_of<uint64_t>(v);
+    if (pmt::is_s64vector(v))
+        return uvector_view_of<int64_t>(v);
+    if (pmt::is_f32vector(v))
+        return uvector_view_of<float>(v);
+    if (pmt::is_f64vector(v))
+        return uvector_view_of<double>(v);
+    if (pmt::is_c32vector(v))
+        return uvector_view_of<std::complex<float>>(v);
+    if (pmt::is_c64vector(v))
+        return uvector_view_of<std::complex<double>>(v);
+    throw py::value_error("uvector_view: not a uniform vector");
+}
+
+template <typename T>
+void bind_init_from_array(py::module& m,
+                          const char* name,
+                          pmt::pmt_t (*init)(size_t, const T*))
+{
+    // forcecast/c_style only copy if the array has a different type or is
+    // not contiguous; otherwise the data is copied exactly once, into the
+    // new uniform vector.
+    m.def(
+        name,
+        [init](py::array_t<T, py::array::c_style | py::array::forcecast> a) {
+            return init(a.size(), a.data());
+        },
+        py::arg("array"),
+        "Make a new uniform vector holding a copy of the array's elements.");
+}
+
+} // namespace
+
+void bind_pmt_numpy(py::module& m)
+{
+    m.def("uvector_view",
+          &uvector_view,
+          py::arg("v"),
+          "Return a read-only numpy array sharing memory with the uniform "
+          "vector v. The array keeps v alive.");
+
+    bind_init_from_array<uint8_t>(m, "init_u8vector_from_array", &pmt::init_u8vector);
+    bind_init_from_array<int8_t>(m, "init_s8vector_from_array", &pmt::init_s8vector);
+    bind_init_from_array<uint16_t>(
+        m, "init_u16vector_from_array", &pmt::init_u16vector);
+    bind_init_from_array<int16_t>(m, "init_s16vector_from_array", &pmt::init_s16vector);
+    bind_init_from_array<uint32_t>(
+        m, "init_u32vector_from_array", &pmt::init_u32vector);
+    bind_init_from_array<int32_t>(m, "init_s32vector_from_array", &pmt::init_s32vector);
+    bind_init_from_array<uint64_t>(
+        m, "init_u64vector_from_array", &pmt::init_u64vector);
+    bind_init_from_array<int64_t>(m, "init_s64vector_from_array", &pmt::init_s64vector);
+    bind_init_from_array<float>(m, "init_f32vector_from_array", &pmt::init_f32vector);
+    bind_init_from_array<double>(m, "init_f64vector_from_array", &pmt::init_f64vector);
+    bind_init_from_array<std::complex<float>>(
+        m, "init_c32vector_from_array", &pmt::init_c32vector);
+    bind_init_from_array<std::complex<double>>(
+        m, "init_c64vector_from_array", &pmt::init_c64vector);
+}
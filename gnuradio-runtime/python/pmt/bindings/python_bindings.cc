@@ -16,6 +16,7 @@
 namespace py = pybind11;
 
 void bind_pmt(py::module&);
+void bind_pmt_numpy(py::module&);
 void bind_pmt_pool(py::module&);
 // void bind_pmt_serial_tags(py::module&);
 void bind_pmt_sugar(py::module&);
@@ -40,6 +41,7 @@ PYBIND11_MODULE(pmt_python, m)
     // py::module::import("gnuradio.gr");
 
     bind_pmt(m);
+    bind_pmt_numpy(m);
     bind_pmt_pool(m);
     // bind_pmt_serial_tags(m);
     bind_pmt_sugar(m);
@@ -7,6 +7,7 @@
 
 
 from . import pmt_python as pmt
+import functools
 import numpy
 
 # SWIG isn't taking in the #define PMT_NIL;
@@ -16,6 +17,15 @@ PMT_NIL = pmt.get_PMT_NIL()
 # define missing
 
 
+@functools.lru_cache(maxsize=4096)
+def intern_symbol(name):
+    """
+    Cached string_to_symbol: returns the same PMT symbol object for repeated
+    names without going through the PMT symbol table each time.
+    """
+    return pmt.string_to_symbol(name)
+
+
 def pmt_to_tuple(p):
     elems = list()
     for i in range(pmt.length(p)):
@@ -46,37 +56,38 @@ def pmt_from_vector(p):
 
 def pmt_to_dict(p):
     d = dict()
+    # walk the a-list instead of indexing it with nth(), which is O(n)
     items = pmt.dict_items(p)
-    for i in range(pmt.length(items)):
-        pair = pmt.nth(i, items)
-        k = pmt.car(pair)
-        v = pmt.cdr(pair)
-        d[pmt_to_python(k)] = pmt_to_python(v)
+    while pmt.is_pair(items):
+        pair = pmt.car(items)
+        d[pmt_to_python(pmt.car(pair))] = pmt_to_python(pmt.cdr(pair))
+        items = pmt.cdr(items)
     return d
 
 
 def pmt_from_dict(p):
     d = pmt.make_dict()
-    for k, v in list(p.items()):
-        # dict is immutable -> therefore pmt_dict_add returns the new dict
-        d = pmt.dict_add(d, python_to_pmt(k), python_to_pmt(v))
+    for k, v in p.items():
+        # Python dict keys are unique, so there is no need for dict_add to
+        # look for (and delete) an existing entry first
+        d = pmt.acons(python_to_pmt(k), python_to_pmt(v), d)
     return d
 
 
 numpy_mappings = {
-    numpy.dtype(numpy.float32): (pmt.init_f32vector, float, pmt.f32vector_elements, pmt.is_f32vector),
-    numpy.dtype(numpy.float64): (pmt.init_f64vector, float, pmt.f64vector_elements, pmt.is_f64vector),
-    numpy.dtype(numpy.complex64): (pmt.init_c32vector, complex, pmt.c32vector_elements, pmt.is_c32vector),
-    numpy.dtype(numpy.complex128): (pmt.init_c64vector, complex, pmt.c64vector_elements, pmt.is_c64vector),
-    numpy.dtype(numpy.int8): (pmt.init_s8vector, int, pmt.s8vector_elements, pmt.is_s8vector),
-    numpy.dtype(numpy.int16): (pmt.init_s16vector, int, pmt.s16vector_elements, pmt.is_s16vector),
-    numpy.dtype(numpy.int32): (pmt.init_s32vector, int, pmt.s32vector_elements, pmt.is_s32vector),
+    numpy.dtype(numpy.float32): (pmt.init_f32vector, float, pmt.f32vector_elements, pmt.is_f32vector, pmt.init_f32vector_from_array),
+    numpy.dtype(numpy.float64): (pmt.init_f64vector, float, pmt.f64vector_elements, pmt.is_f64vector, pmt.init_f64vector_from_array),
+    numpy.dtype(numpy.complex64): (pmt.init_c32vector, complex, pmt.c32vector_elements, pmt.is_c32vector, pmt.init_c32vector_from_array),
+    numpy.dtype(numpy.complex128): (pmt.init_c64vector, complex, pmt.c64vector_elements, pmt.is_c64vector, pmt.init_c64vector_from_array),
+    numpy.dtype(numpy.int8): (pmt.init_s8vector, int, pmt.s8vector_elements, pmt.is_s8vector, pmt.init_s8vector_from_array),
+    numpy.dtype(numpy.int16): (pmt.init_s16vector, int, pmt.s16vector_elements, pmt.is_s16vector, pmt.init_s16vector_from_array),
+    numpy.dtype(numpy.int32): (pmt.init_s32vector, int, pmt.s32vector_elements, pmt.is_s32vector, pmt.init_s32vector_from_array),
     #    numpy.dtype(numpy.int64): (pmt.init_s64vector, int, pmt.s64vector_elements, pmt.is_s64vector),
-    numpy.dtype(numpy.uint8): (pmt.init_u8vector, int, pmt.u8vector_elements, pmt.is_u8vector),
-    numpy.dtype(numpy.uint16): (pmt.init_u16vector, int, pmt.u16vector_elements, pmt.is_u16vector),
-    numpy.dtype(numpy.uint32): (pmt.init_u32vector, int, pmt.u32vector_elements, pmt.is_u32vector),
+    numpy.dtype(numpy.uint8): (pmt.init_u8vector, int, pmt.u8vector_elements, pmt.is_u8vector, pmt.init_u8vector_from_array),
+    numpy.dtype(numpy.uint16): (pmt.init_u16vector, int, pmt.u16vector_elements, pmt.is_u16vector, pmt.init_u16vector_from_array),
+    numpy.dtype(numpy.uint32): (pmt.init_u32vector, int, pmt.u32vector_elements, pmt.is_u32vector, pmt.init_u32vector_from_array),
     #    numpy.dtype(numpy.uint64): (pmt.init_u64vector, int, pmt.u64vector_elements, pmt.is_u64vector),
-    numpy.dtype(numpy.byte): (pmt.init_u8vector, int, pmt.u8vector_elements, pmt.is_u8vector),
+    numpy.dtype(numpy.byte): (pmt.init_u8vector, int, pmt.u8vector_elements, pmt.is_u8vector, pmt.init_u8vector_from_array),
 }
 
 uvector_mappings = dict(
@@ -84,21 +95,44 @@ uvector_mappings = dict(
 
 
 def numpy_to_uvector(numpy_array):
+    """
+    Make a uniform vector from a numpy array.
+
+    The elements are copied once, straight from the array's memory into
+    the new uniform vector (PMTs always own their storage). The uniform
+    vector does not reference the array afterwards.
+    """
     try:
         mapping = numpy_mappings[numpy_array.dtype]
-        pc = list(map(mapping[1], numpy.ravel(numpy_array)))
-        return mapping[0](numpy_array.size, pc)
     except KeyError:
         raise ValueError(
             "unsupported numpy array dtype for conversion to pmt %s" % (numpy_array.dtype))
+    return mapping[4](numpy_array)
+
+
+def uvector_view(uvector):
+    """
+    Return a read-only numpy array sharing memory with a uniform vector.
+
+    No data is copied. The array holds a reference to the uniform vector,
+    so the vector's storage stays valid for as long as the array (or any
+    array derived from it) exists, even if all other references to the
+    PMT are gone. The array is read-only because PMTs are routinely shared
+    between message consumers; note that it still reflects changes made
+    to the vector through the *vector_set functions.
+    """
+    return pmt.uvector_view(uvector)
 
 
 def uvector_to_numpy(uvector):
-    match = None
+    """
+    Return a writable numpy array holding a copy of a uniform vector's
+    elements. Use uvector_view to avoid the copy.
+    """
     for test_func in list(uvector_mappings.keys()):
         if test_func(uvector):
-            match = uvector_mappings[test_func]
-            return numpy.array(match[0](uvector), dtype=match[1])
+            return numpy.array(pmt.uvector_view(uvector),
+                               dtype=uvector_mappings[test_func][1])
     else:
         raise ValueError(
             "unsupported uvector data type for conversion to numpy array %s" % (uvector))
@@ -107,7 +141,7 @@ def uvector_to_numpy(uvector):
 type_mappings = (  # python type, check pmt type, to python, from python
     (None, pmt.is_null, lambda x: None, lambda x: PMT_NIL),
     (bool, pmt.is_bool, pmt.to_bool, pmt.from_bool),
-    (str, pmt.is_symbol, pmt.symbol_to_string, pmt.string_to_symbol),
+    (str, pmt.is_symbol, pmt.symbol_to_string, intern_symbol),
     (str, lambda x: False, None, lambda x: pmt.string_to_symbol(x.encode('utf-8'))),
     (int, pmt.is_integer, pmt.to_long, pmt.from_long),
     (int, pmt.is_uint64, lambda x: int(pmt.to_uint64(x)), pmt.from_uint64),
@@ -122,8 +156,29 @@ type_mappings = (  # python type, check pmt type, to python, from python
 )
 
 
+# All PMTs are exposed as pmt_base to Python, so we can't dispatch on their
+# Python type. Split the checks on is_number() instead, which saves going
+# through the container checks for scalars and vice versa, and test the
+# common types first. Apart from null (which is also an empty dict) and
+# dict (which is also a pair) the checks are mutually exclusive, so only
+# those need to keep their relative order.
+_number_mappings = tuple(
+    m for check in (pmt.is_integer, pmt.is_real, pmt.is_uint64,
+                    pmt.is_complex)
+    for m in type_mappings if m[1] is check)
+_other_mappings = tuple(
+    m for check in (pmt.is_symbol, pmt.is_null, pmt.is_bool, pmt.is_dict,
+                    pmt.is_tuple, pmt.is_uniform_vector, pmt.is_vector,
+                    pmt.is_pair)
+    for m in type_mappings if m[1] is check)
+
+# Python type -> from_python, filled on first use of each concrete type
+_from_python_dispatch = {}
+
+
 def pmt_to_python(p):
-    for python_type, pmt_check, to_python, from_python in type_mappings:
+    mappings = _number_mappings if pmt.is_number(p) else _other_mappings
+    for python_type, pmt_check, to_python, from_python in mappings:
         if pmt_check(p):
             try:
                 return to_python(p)
@@ -135,10 +190,15 @@ def pmt_to_python(p):
 
 
 def python_to_pmt(p):
+    from_python = _from_python_dispatch.get(type(p))
+    if from_python is not None:
+        return from_python(p)
     for python_type, pmt_check, to_python, from_python in type_mappings:
         if python_type is None:
             if p is None:
+                _from_python_dispatch[type(p)] = from_python
                 return from_python(p)
         elif isinstance(p, python_type):
+            _from_python_dispatch[type(p)] = from_python
             return from_python(p)
     raise ValueError("can't convert %s type to pmt (%s)" % (type(p), p))
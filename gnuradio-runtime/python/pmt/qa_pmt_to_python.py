@@ -32,6 +32,62 @@ class test_pmt_to_python(unittest.TestCase):
         self.assertTrue(nparr.dtype == narr.dtype)
         self.assertTrue(np.alltrue(nparr == narr))
 
+    def test_uvector_round_trip_all_types(self):
+        import numpy as np
+        for dtype in (np.uint8, np.uint16, np.int16, np.uint32, np.int32,
+                      np.float32, np.float64, np.complex64, np.complex128):
+            narr = (np.arange(64) % 100).astype(dtype)
+            uvector = pmt.to_pmt(narr)
+            self.assertEqual(pmt.length(uvector), len(narr))
+            nparr = pmt.to_python(uvector)
+            self.assertEqual(nparr.dtype, narr.dtype)
+            self.assertTrue(np.array_equal(nparr, narr))
+            # to_python hands out a private, writable copy
+            nparr[0] = 1
+            self.assertEqual(pmt2py.uvector_to_numpy(uvector)[0], 0)
+
+    def test_uvector_from_non_contiguous_array(self):
+        import numpy as np
+        narr = np.arange(20, dtype=np.float32).reshape(4, 5)[:, ::2]
+        uvector = pmt2py.numpy_to_uvector(narr)
+        self.assertTrue(np.array_equal(pmt.uvector_view(uvector),
+                                       np.ravel(narr)))
+
+    def test_uvector_view(self):
+        import numpy as np
+        uvector = pmt.init_f32vector(4, [1, 2, 3, 4])
+        view = pmt.uvector_view(uvector)
+        self.assertEqual(view.dtype, np.float32)
+        self.assertFalse(view.flags.writeable)
+        with self.assertRaises(ValueError):
+            view[0] = 5
+        # the view shares memory with the uvector
+        pmt.f32vector_set(uvector, 0, 10)
+        self.assertEqual(view[0], 10)
+        # and keeps it alive
+        del uvector
+        self.assertEqual(list(view[1:] * 2), [4, 6, 8])
+        with self.assertRaises(ValueError):
+            pmt.uvector_view(pmt.intern("not a uvector"))
+
+    def test_dict_round_trip(self):
+        d = {"rx_time": (1600000000, 0.25), "rx_rate": 1e6,
+             "cplx": True, "size": 8, "name": "burst", "none": None}
+        p = pmt.to_pmt(d)
+        self.assertTrue(pmt.is_dict(p))
+        self.assertTrue(pmt.equal(pmt.dict_ref(p, pmt.intern("size"),
+                                               pmt.PMT_NIL),
+                                  pmt.from_long(8)))
+        self.assertEqual(pmt.to_python(p), d)
+        # second conversion goes through the cached dispatch
+        self.assertEqual(pmt.to_python(pmt.to_pmt(d)), d)
+
+    def test_intern_symbol(self):
+        s = pmt.intern_symbol("rx_time")
+        self.assertIs(s, pmt.intern_symbol("rx_time"))
+        self.assertTrue(pmt.eq(s, pmt.string_to_symbol("rx_time")))
+        self.assertTrue(pmt.is_symbol(pmt.to_pmt("rx_time")))
+
 
 if __name__ == '__main__':
     unittest.main()
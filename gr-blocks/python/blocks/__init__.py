@@ -27,6 +27,7 @@ from .msg_pair_to_var import msg_pair_to_var
 from .var_to_msg import var_to_msg_pair
 from .matrix_interleaver import *
 from .parse_file_metadata import parse_header, parse_extra_dict
+from .file_meta_reader import file_meta_reader
 
 # alias old add_vXX and multiply_vXX
 add_vcc = add_cc
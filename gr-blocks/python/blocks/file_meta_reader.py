@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import os
+
+import numpy
+import pmt
+
+from . import parse_file_metadata
+
+# One entry per header (segment) of a file_meta_sink capture
+segment_dtype = numpy.dtype([
+    ('hdr_offset', numpy.int64),    # byte offset of the header
+    ('extra_len', numpy.int64),     # length of the extra dict in bytes
+    ('data_offset', numpy.int64),   # byte offset of the segment's data
+    ('nbytes', numpy.int64),        # size of the segment's data in bytes
+    ('start_item', numpy.int64),    # index of the segment's first item
+    ('nitems', numpy.int64),        # number of items in the segment
+    ('rx_time_secs', numpy.uint64),
+    ('rx_time_fracs', numpy.float64),
+    ('rx_time', numpy.float64),     # time of the segment's first item
+    ('rx_rate', numpy.float64),
+])
+
+# file type string (see parse_file_metadata) -> numpy base type
+ftype_to_numpy = {"bytes": numpy.int8,
+                  "short": numpy.int16,
+                  "int": numpy.int32,
+                  "long": numpy.int32,
+                  "long long": numpy.int64,
+                  "float": numpy.float32,
+                  "double": numpy.float64}
+
+INDEX_VERSION = 1
+
+
+class file_meta_reader(object):
+    """
+    Random access to the samples of a file written by blocks.file_meta_sink.
+
+    The data file is memory-mapped, and the headers are walked only once to
+    build an index of all segments (offsets, lengths, rx_time and rx_rate),
+    which is cached in a file next to the capture and reused as long as the
+    capture does not change. Items can then be read by sample index or by
+    time; reads within one segment, and all reads of detached captures, are
+    numpy views of the mapped file.
+
+    Args:
+        filename: the data file
+        detached: whether the headers are in a separate file
+        hdr_filename: the header file of a detached capture (default:
+            filename + ".hdr")
+        index_filename: where to cache the index (default: filename +
+            ".idx.npz"); None disables the cache
+    """
+
+    def __init__(self, filename, detached=False, hdr_filename=None,
+                 index_filename=""):
+        self.filename = filename
+        self.detached = detached
+        if detached:
+            self.hdr_filename = hdr_filename or filename + ".hdr"
+        else:
+            self.hdr_filename = filename
+        if index_filename == "":
+            index_filename = filename + ".idx.npz"
+        self.index_filename = index_filename
+
+        if os.path.getsize(filename):
+            self._data = numpy.memmap(filename, dtype=numpy.uint8, mode='r')
+        else:
+            self._data = numpy.zeros(0, dtype=numpy.uint8)
+
+        self.segments = self._load_index()
+        if self.segments is None:
+            self.segments, self._format = self._build_index()
+            self._save_index()
+
+        itemsize, ftype, cplx = self._format
+        base = numpy.dtype(ftype_to_numpy[ftype])
+        if cplx:
+            if base == numpy.float32:
+                base = numpy.dtype(numpy.complex64)
+            elif base == numpy.float64:
+                base = numpy.dtype(numpy.complex128)
+            else:
+                base = numpy.dtype((base, 2))
+        vlen = itemsize // base.itemsize
+        self.dtype = base if vlen == 1 else numpy.dtype((base, vlen))
+        self.itemsize = itemsize
+
+    ####################################################################
+    # Index handling
+    ####################################################################
+    def _stamp(self):
+        stamp = []
+        names = [self.filename]
+        if self.hdr_filename != self.filename:
+            names.append(self.hdr_filename)
+        for name in names:
+            st = os.stat(name)
+            stamp += [st.st_size, st.st_mtime_ns]
+        return numpy.array([INDEX_VERSION, int(self.detached)] + stamp,
+                           dtype=numpy.int64)
+
+    def _load_index(self):
+        if not self.index_filename or not os.path.exists(self.index_filename):
+            return None
+        try:
+            with numpy.load(self.index_filename) as index:
+                if not numpy.array_equal(index['stamp'], self._stamp()):
+                    return None
+                self._format = (int(index['itemsize']), str(index['ftype']),
+                                bool(index['cplx']))
+                return index['segments']
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save_index(self):
+        if not self.index_filename:
+            return
+        try:
+            with open(self.index_filename, "wb") as f:
+                numpy.savez(f, stamp=self._stamp(), segments=self.segments,
+                            itemsize=self._format[0], ftype=self._format[1],
+                            cplx=self._format[2])
+        except OSError:
+            # The cache is optional, e.g. for captures on read-only media
+            pass
+
+    def _build_index(self):
+        hdr_len = parse_file_metadata.HEADER_LENGTH
+        if self.detached:
+            headers = numpy.memmap(self.hdr_filename, dtype=numpy.uint8,
+                                   mode='r')
+        else:
+            headers = self._data
+
+        entries = []
+        fmt = None
+        hdr_offset = 0
+        data_offset = 0
+        start_item = 0
+        while hdr_offset + hdr_len <= len(headers):
+            header = pmt.deserialize_str(
+                headers[hdr_offset:hdr_offset + hdr_len].tobytes())
+            info = parse_file_metadata.parse_header(header, False)
+            seg_fmt = (info["size"], info["type"], info["cplx"])
+            if fmt is None:
+                fmt = seg_fmt
+            elif seg_fmt != fmt:
+                raise ValueError(
+                    "Item format changes at header {0}: {1} != {2}".format(
+                        len(entries), seg_fmt, fmt))
+            nbytes = info["nbytes"]
+            if not self.detached:
+                data_offset = hdr_offset + info["hdr_len"]
+                # The last segment of a truncated capture
+                nbytes = min(nbytes, max(0, len(headers) - data_offset))
+            nitems = nbytes // info["size"]
+            entries.append((hdr_offset, info["extra_len"], data_offset,
+                            nbytes, start_item, nitems,
+                            info["rx_time_secs"], info["rx_time_fracs"],
+                            info["rx_time"], info["rx_rate"]))
+            start_item += nitems
+            if self.detached:
+                hdr_offset += info["hdr_len"]
+                data_offset += nbytes
+            else:
+                hdr_offset = data_offset + nbytes
+
+        if fmt is None:
+            raise ValueError("No header found in {0}".format(self.hdr_filename))
+        return numpy.array(entries, dtype=segment_dtype), fmt
+
+    ####################################################################
+    # Access
+    ####################################################################
+    def __len__(self):
+        """ Total number of items in the capture """
+        if not len(self.segments):
+            return 0
+        last = self.segments[-1]
+        return int(last['start_item'] + last['nitems'])
+
+    def segment_of(self, index):
+        """ Return the number of the segment containing item index """
+        if not 0 <= index < len(self):
+            raise IndexError("item index {0} out of range".format(index))
+        return int(numpy.searchsorted(self.segments['start_item'], index,
+                                      side='right')) - 1
+
+    def segment_data(self, segment):
+        """ Return all items of a segment as a view of the mapped file """
+        seg = self.segments[segment]
+        start = int(seg['data_offset'])
+        return self._data[start:start + int(seg['nitems']) * self.itemsize] \
+            .view(self.dtype)
+
+    def extras(self, segment):
+        """ Return the extra dictionary of a segment as a PMT (or None) """
+        seg = self.segments[segment]
+        if not seg['extra_len']:
+            return None
+        with open(self.hdr_filename, "rb") as f:
+            f.seek(int(seg['hdr_offset']) + parse_file_metadata.HEADER_LENGTH)
+            return pmt.deserialize_str(f.read(int(seg['extra_len'])))
+
+    def read(self, start, stop):
+        """
+        Return items [start, stop) of the capture.
+
+        The result is a view of the mapped file if the range lies within
+        one segment (or the capture is detached), a copy otherwise.
+        """
+        start = max(0, start)
+        stop = min(len(self), stop)
+        if stop <= start:
+            return numpy.zeros(0, dtype=self.dtype)
+        if self.detached:
+            offset = int(self.segments[0]['data_offset']) + \
+                start * self.itemsize
+            return self._data[offset:offset + (stop - start) * self.itemsize] \
+                .view(self.dtype)
+
+        first = self.segment_of(start)
+        last = self.segment_of(stop - 1)
+        parts = []
+        for k in range(first, last + 1):
+            seg_start = int(self.segments[k]['start_item'])
+            data = self.segment_data(k)
+            parts.append(data[max(0, start - seg_start):stop - seg_start])
+        return parts[0] if len(parts) == 1 else numpy.concatenate(parts)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step < 0:
+                return self.read(stop + 1, start + 1)[::step]
+            return self.read(start, stop)[::step]
+        if key < 0:
+            key += len(self)
+        return self.read(key, key + 1)[0]
+
+    def time_of(self, index):
+        """ Return the rx_time of item index in seconds """
+        seg = self.segments[self.segment_of(index)]
+        return seg['rx_time'] + (index - seg['start_item']) / seg['rx_rate']
+
+    def index_at(self, t):
+        """
+        Return the index of the first item at or after time t (in seconds).
+        Times before the capture map to 0, times after it to len(self).
+        """
+        times = self.segments['rx_time']
+        k = int(numpy.searchsorted(times, t, side='right')) - 1
+        if k < 0:
+            return 0
+        seg = self.segments[k]
+        # allow for rounding errors in the time -> index conversion
+        offset = int(numpy.ceil((t - seg['rx_time']) * seg['rx_rate'] - 1e-6))
+        # t may fall in a gap between the segments
+        return int(seg['start_item']) + min(offset, int(seg['nitems']))
+
+    def read_time(self, t_start, t_stop):
+        """ Return the items with t_start <= rx_time < t_stop """
+        return self.read(self.index_at(t_start), self.index_at(t_stop))
@@ -53,8 +53,8 @@ def parse_header(p, VERBOSE=False):
         sys.exit(1)
 
     # GET FILE FORMAT VERSION NUMBER
-    if(pmt.dict_has_key(p, pmt.string_to_symbol("version"))):
-        r = pmt.dict_ref(p, pmt.string_to_symbol("version"), dump)
+    if(pmt.dict_has_key(p, pmt.intern_symbol("version"))):
+        r = pmt.dict_ref(p, pmt.intern_symbol("version"), dump)
         version = pmt.to_long(r)
         if(VERBOSE):
             print("Version Number: {0}".format(version))
@@ -64,8 +64,8 @@ def parse_header(p, VERBOSE=False):
         sys.exit(1)
 
     # EXTRACT SAMPLE RATE
-    if(pmt.dict_has_key(p, pmt.string_to_symbol("rx_rate"))):
-        r = pmt.dict_ref(p, pmt.string_to_symbol("rx_rate"), dump)
+    if(pmt.dict_has_key(p, pmt.intern_symbol("rx_rate"))):
+        r = pmt.dict_ref(p, pmt.intern_symbol("rx_rate"), dump)
         samp_rate = pmt.to_double(r)
         info["rx_rate"] = samp_rate
         if(VERBOSE):
@@ -76,8 +76,8 @@ def parse_header(p, VERBOSE=False):
         sys.exit(1)
 
     # EXTRACT TIME STAMP
-    if(pmt.dict_has_key(p, pmt.string_to_symbol("rx_time"))):
-        r = pmt.dict_ref(p, pmt.string_to_symbol("rx_time"), dump)
+    if(pmt.dict_has_key(p, pmt.intern_symbol("rx_time"))):
+        r = pmt.dict_ref(p, pmt.intern_symbol("rx_time"), dump)
         secs = pmt.tuple_ref(r, 0)
         fracs = pmt.tuple_ref(r, 1)
         secs = pmt.to_uint64(secs)
@@ -100,8 +100,8 @@ def parse_header(p, VERBOSE=False):
         sys.exit(1)
 
     # EXTRACT ITEM SIZE
-    if(pmt.dict_has_key(p, pmt.string_to_symbol("size"))):
-        r = pmt.dict_ref(p, pmt.string_to_symbol("size"), dump)
+    if(pmt.dict_has_key(p, pmt.intern_symbol("size"))):
+        r = pmt.dict_ref(p, pmt.intern_symbol("size"), dump)
         dsize = pmt.to_long(r)
         info["size"] = dsize
         if(VERBOSE):
@@ -112,8 +112,8 @@ def parse_header(p, VERBOSE=False):
         sys.exit(1)
 
     # EXTRACT DATA TYPE
-    if(pmt.dict_has_key(p, pmt.string_to_symbol("type"))):
-        r = pmt.dict_ref(p, pmt.string_to_symbol("type"), dump)
+    if(pmt.dict_has_key(p, pmt.intern_symbol("type"))):
+        r = pmt.dict_ref(p, pmt.intern_symbol("type"), dump)
         dtype = pmt.to_long(r)
         stype = ftype_to_string[dtype]
         info["type"] = stype
@@ -125,8 +125,8 @@ def parse_header(p, VERBOSE=False):
         sys.exit(1)
 
     # EXTRACT COMPLEX
-    if(pmt.dict_has_key(p, pmt.string_to_symbol("cplx"))):
-        r = pmt.dict_ref(p, pmt.string_to_symbol("cplx"), dump)
+    if(pmt.dict_has_key(p, pmt.intern_symbol("cplx"))):
+        r = pmt.dict_ref(p, pmt.intern_symbol("cplx"), dump)
         cplx = pmt.to_bool(r)
         info["cplx"] = cplx
         if(VERBOSE):
@@ -137,8 +137,8 @@ def parse_header(p, VERBOSE=False):
         sys.exit(1)
 
     # EXTRACT WHERE CURRENT SEGMENT STARTS
-    if(pmt.dict_has_key(p, pmt.string_to_symbol("strt"))):
-        r = pmt.dict_ref(p, pmt.string_to_symbol("strt"), dump)
+    if(pmt.dict_has_key(p, pmt.intern_symbol("strt"))):
+        r = pmt.dict_ref(p, pmt.intern_symbol("strt"), dump)
         seg_start = pmt.to_uint64(r)
         info["hdr_len"] = seg_start
         info["extra_len"] = seg_start - HEADER_LENGTH
@@ -153,8 +153,8 @@ def parse_header(p, VERBOSE=False):
         sys.exit(1)
 
     # EXTRACT SIZE OF DATA
-    if(pmt.dict_has_key(p, pmt.string_to_symbol("bytes"))):
-        r = pmt.dict_ref(p, pmt.string_to_symbol("bytes"), dump)
+    if(pmt.dict_has_key(p, pmt.intern_symbol("bytes"))):
+        r = pmt.dict_ref(p, pmt.intern_symbol("bytes"), dump)
         nbytes = pmt.to_uint64(r)
 
         nitems = nbytes / dsize
@@ -181,13 +181,13 @@ def parse_extra_dict(p, info, VERBOSE=False):
         sys.exit(1)
 
     items = pmt.dict_items(p)
-    nitems = pmt.length(items)
-    for i in range(nitems):
-        item = pmt.nth(i, items)
+    while pmt.is_pair(items):
+        item = pmt.car(items)
         key = pmt.symbol_to_string(pmt.car(item))
         val = pmt.cdr(item)
         info[key] = val
         if(VERBOSE):
             print("{0}: {1}".format(key, val))
+        items = pmt.cdr(items)
 
     return info
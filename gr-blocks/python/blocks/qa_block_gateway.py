@@ -8,11 +8,14 @@
 #
 #
 
+import ctypes
+
 import numpy
 
 import pmt
 
 from gnuradio import gr, gr_unittest, blocks
+from gnuradio.gr import gateway
 
 
 class non_sync_block(gr.basic_block):
@@ -213,6 +216,23 @@ class vector_to_stream(gr.interp_block):
         return len(output_items[0])
 
 
+class batched_copy(gr.sync_block):
+    def __init__(self, min_items, alignment):
+        gr.sync_block.__init__(
+            self,
+            name="batched_copy",
+            in_sig=[numpy.float32],
+            out_sig=[numpy.float32],
+        )
+        self.set_min_batch(min_items, alignment)
+        self.call_sizes = []
+
+    def work(self, input_items, output_items):
+        self.call_sizes.append(len(output_items[0]))
+        output_items[0][:] = input_items[0]
+        return len(output_items[0])
+
+
 class test_block_gateway(gr_unittest.TestCase):
 
     def test_add_f32(self):
@@ -309,6 +329,110 @@ class test_block_gateway(gr_unittest.TestCase):
         tb.run()
         self.assertEqual(len(sinks[0].data()), 2 * len(sinks[1].data()))
 
+    def test_min_batch(self):
+        tb = gr.top_block()
+        data = list(range(4096))
+        src = blocks.vector_source_f(data, False)
+        # Hand the batching block small chunks
+        chunker = blocks.copy(gr.sizeof_float)
+        chunker.set_max_noutput_items(16)
+        batched = batched_copy(256, 64)
+        sink = blocks.vector_sink_f()
+        tb.connect(src, chunker, batched, sink)
+        tb.run()
+        self.assertEqual(sink.data(), data)
+        self.assertEqual(batched.min_batch(), 256)
+        for n in batched.call_sizes:
+            self.assertGreaterEqual(n, 256)
+            self.assertEqual(n % 64, 0)
+
+    def test_min_batch_tail(self):
+        tb = gr.top_block()
+        # 16 full batches and a partial one, which still has to come out
+        data = list(range(4096 + 192))
+        src = blocks.vector_source_f(data, False)
+        chunker = blocks.copy(gr.sizeof_float)
+        chunker.set_max_noutput_items(16)
+        batched = batched_copy(256, 64)
+        sink = blocks.vector_sink_f()
+        tb.connect(src, chunker, batched, sink)
+        tb.run()
+        self.assertEqual(sink.data(), data)
+        for n in batched.call_sizes[:-1]:
+            self.assertGreaterEqual(n, 256)
+        self.assertEqual(batched.call_sizes[-1] % 64, 0)
+
+    def test_ndarray_view_cache(self):
+        buf = (ctypes.c_float * 64)(*range(64))
+        addr = ctypes.addressof(buf)
+        dtype = numpy.dtype(numpy.float32)
+        cache = gateway.ndarray_view_cache()
+
+        first = cache.view(0, addr, dtype, 16)
+        self.assertEqual(list(first), list(range(16)))
+        # Same pointer and length: the very same view comes back
+        self.assertIs(cache.view(0, addr, dtype, 16), first)
+        # Adjacent window grows the span, contained windows are slices
+        self.assertEqual(list(cache.view(0, addr + 64, dtype, 16)),
+                         list(range(16, 32)))
+        self.assertEqual(list(cache.view(0, addr + 32, dtype, 8)),
+                         list(range(8, 16)))
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 2)
+
+        # Views write through to the underlying buffer
+        cache.view(1, addr, numpy.dtype((numpy.float32, 2)), 4)[0, 1] = -1
+        self.assertEqual(buf[1], -1)
+
+    def test_profiling(self):
+        tb = gr.top_block()
+        data = list(range(4096))
+        src = blocks.vector_source_f(data, False)
+        chunker = blocks.copy(gr.sizeof_float)
+        chunker.set_max_noutput_items(64)
+        copy = batched_copy(0, 1)
+        sink = blocks.vector_sink_f()
+        tb.connect(src, chunker, copy, sink)
+        self.assertIsNone(copy.profile())
+        copy.enable_profiling(history=8)
+        tb.run()
+        self.assertEqual(sink.data(), data)
+
+        profile = copy.profile()
+        summary = profile.summary()
+        self.assertEqual(summary["calls"], len(copy.call_sizes))
+        self.assertEqual(summary["items_in"], len(data))
+        self.assertEqual(summary["items_out"], len(data))
+        self.assertGreater(summary["total_time"], 0)
+        edges, counts = profile.histogram()
+        self.assertEqual(len(edges), len(counts))
+        self.assertEqual(counts.sum(), summary["calls"])
+        history = profile.history()
+        self.assertEqual(len(history), min(8, summary["calls"]))
+        self.assertEqual(history["items_out"].sum(),
+                         sum(copy.call_sizes[-len(history):]))
+        self.assertAlmostEqual(copy.profile_counter("avg_items_out"),
+                               len(data) / summary["calls"])
+
+        # Disabling restores the plain work path
+        copy.disable_profiling()
+        self.assertNotIn("handle_general_work", copy.__dict__)
+
+    def test_work_profile(self):
+        profile = gateway.work_profile(history=2, nbins=4)
+        profile.record(0.0, 0.5e-6, 10, 10)
+        profile.record(1.0, 3e-6, 20, 10)
+        profile.record(2.0, 1.0, 30, 0)
+        self.assertEqual(profile.calls, 3)
+        self.assertEqual(profile.items_in, 60)
+        self.assertEqual(profile.items_out, 20)
+        self.assertEqual(profile.max_time, 1.0)
+        self.assertEqual(list(profile.histogram()[1]), [1, 0, 1, 1])
+        self.assertEqual(list(profile.history()["time"]), [1.0, 2.0])
+        profile.reset()
+        self.assertEqual(profile.summary()["calls"], 0)
+        self.assertEqual(len(profile.history()), 0)
+
 
 if __name__ == '__main__':
     gr_unittest.run(test_block_gateway)
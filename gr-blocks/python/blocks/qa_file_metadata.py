@@ -190,6 +190,53 @@ class test_file_metadata(gr_unittest.TestCase):
         os.remove(outfile)
         os.remove(outfile_hdr)
 
+    def test_003_reader(self):
+        N = 1000
+        samp_rate = 200000
+        outfile = "test_out_reader.dat"
+        data = sig_source_c(samp_rate, 1000, 1, N)
+
+        for detached in (False, True):
+            src = blocks.vector_source_c(data)
+            # 300 items per segment -> 4 headers
+            fsnk = blocks.file_meta_sink(gr.sizeof_gr_complex, outfile,
+                                         samp_rate, 1,
+                                         blocks.GR_FILE_FLOAT, True,
+                                         300, pmt.make_dict(), detached)
+            fsnk.set_unbuffered(True)
+            tb = gr.top_block()
+            tb.connect(src, fsnk)
+            tb.run()
+            fsnk.close()
+
+            for cached in (False, True):
+                reader = blocks.file_meta_reader(outfile, detached)
+                self.assertEqual(os.path.exists(outfile + ".idx.npz"), True)
+                self.assertEqual(len(reader), N)
+                self.assertEqual(len(reader.segments), 4)
+                self.assertEqual(list(reader.segments['start_item']),
+                                 [0, 300, 600, 900])
+                self.assertEqual(reader.segments[0]['rx_rate'], samp_rate)
+                self.assertComplexTuplesAlmostEqual(reader[:], data, 5)
+                self.assertComplexTuplesAlmostEqual(reader[250:650],
+                                                    data[250:650], 5)
+                self.assertEqual(reader.index_at(reader.time_of(450)), 450)
+                self.assertComplexTuplesAlmostEqual(
+                    reader.read_time(reader.time_of(10), reader.time_of(20)),
+                    data[10:20], 5)
+
+            # the stamp has a fixed order, not that of a set of file names
+            stamp = []
+            for name in [outfile] + ([outfile + ".hdr"] if detached else []):
+                st = os.stat(name)
+                stamp += [st.st_size, st.st_mtime_ns]
+            self.assertEqual(list(reader._stamp()[2:]), stamp)
+
+            os.remove(outfile)
+            os.remove(outfile + ".idx.npz")
+            if detached:
+                os.remove(outfile + ".hdr")
+
 
 if __name__ == '__main__':
     gr_unittest.run(test_file_metadata)
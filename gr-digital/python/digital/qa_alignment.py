@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import random
+
+import numpy as np
+
+from gnuradio import gr_unittest
+from gnuradio.digital.utils import alignment
+
+
+def compare_reference(d1, d2, offset, indices):
+    correct = total = 0
+    for i in indices:
+        if i < len(d1) and 0 <= i - offset < len(d2):
+            correct += d1[i] == d2[i - offset]
+            total += 1
+    return correct, total
+
+
+class test_alignment(gr_unittest.TestCase):
+
+    def test_001_correlate_methods(self):
+        rng = np.random.RandomState(7)
+        for nsymbols in (2, 4):
+            d1 = rng.randint(0, nsymbols, 300)
+            d2 = rng.randint(0, nsymbols, 250)
+            indices = sorted(set(rng.randint(0, 300, 80)))
+            offsets = np.arange(-60, 60)
+            methods = ["fft", "direct"]
+            if nsymbols == 2:
+                methods.append("packed")
+            expected = [compare_reference(d1, d2, o, indices)
+                        for o in offsets]
+            for method in methods:
+                matches, compared = alignment.correlate_sequences(
+                    d1, d2, offsets, indices, method)
+                self.assertEqual(list(zip(matches, compared)), expected)
+
+    def test_002_align(self):
+        rndm = random.Random()
+        rndm.seed(1234)
+        ran_seq = [rndm.randint(0, 1) for i in range(0, 2000)]
+        offset_seq = [0] * 20 + ran_seq
+        err_seq = [rndm.randint(0, 1) if rndm.randint(0, 4) == 4 else bit
+                   for bit in offset_seq]
+        for d2 in (offset_seq, err_seq):
+            correct, overlap, offset, indices = alignment.align_sequences(
+                ran_seq, d2, seed=1)
+            result = alignment.align_sequences_xcorr(
+                ran_seq, d2, seed=1)
+            self.assertEqual(result[2], offset)
+            self.assertEqual(result[3], indices)
+            self.assertAlmostEqual(result[0], correct, 2)
+        self.assertEqual(
+            alignment.align_sequences_xcorr(
+                ran_seq, offset_seq, indices=list(range(2020)))[:3],
+            (1.0, 2000, -20))
+
+    def test_003_align_symbols(self):
+        # symbol streams like those of the constellation receiver tests
+        rndm = random.Random()
+        rndm.seed(99)
+        for arity in (4, 8, 64):
+            ref = [rndm.randint(0, arity - 1) for i in range(0, 1500)]
+            rx = [rndm.randint(0, arity - 1) for i in range(0, 7)] + ref
+            rx = [rndm.randint(0, arity - 1) if rndm.randint(0, 9) == 0 else s
+                  for s in rx]
+            expected = alignment.align_sequences(ref, rx, seed=5)
+            result = alignment.align_sequences_xcorr(ref, rx, seed=5)
+            self.assertEqual(result[2], expected[2])
+            self.assertEqual(result[2], -7)
+            self.assertEqual(result[3], expected[3])
+            self.assertAlmostEqual(result[0], expected[0], 2)
+
+    def test_004_streaming(self):
+        rng = np.random.RandomState(3)
+        ref = rng.randint(0, 2, 12000)
+        # 37 junk bits, then 5 bits lost at 6000 and 2% bit errors
+        rx = np.concatenate((rng.randint(0, 2, 37), ref[:6000], ref[6005:]))
+        rx[rng.rand(len(rx)) < 0.02] ^= 1
+        aligner = alignment.sequence_aligner(max_offset=100)
+        for k in range(0, len(ref), 500):
+            aligner.process(ref[k:k + 500], rx[k:k + 500])
+        self.assertTrue(aligner.locked)
+        self.assertEqual(aligner.offset, -32)
+        self.assertEqual(aligner.locks, 2)
+        self.assertGreater(aligner.fraction_correct(), 0.95)
+        self.assertGreater(aligner.compared, 11000)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(test_alignment)
@@ -9,8 +9,11 @@
 #
 
 
+import os
 import random
 import math
+import shutil
+import tempfile
 from cmath import exp, pi, log, sqrt
 import numpy
 
@@ -378,6 +381,91 @@ class test_constellation(gr_unittest.TestCase):
         self.assertFloatTuplesAlmostEqual(y_python_raw_calc, y_python_table, 0)
         self.assertFloatTuplesAlmostEqual(y_cpp_raw_calc, y_cpp_table, 0)
 
+    def test_soft_table_matches_scalar(self):
+        prec = 4
+        constel, code = digital.qam_16_0()
+        table = digital.soft_dec_table(constel, code, prec, 0.5)
+
+        npts = 2**prec
+        xrng = numpy.linspace(min(numpy.real(constel)),
+                              max(numpy.real(constel)), npts)
+        yrng = numpy.linspace(min(numpy.imag(constel)),
+                              max(numpy.imag(constel)), npts)
+        expected = [digital.calc_soft_dec(complex(x, y), constel, code, 0.5)
+                    for y in yrng for x in xrng]
+        self.assertEqual(table, [[float(d) for d in e] for e in expected])
+
+        # Vectorized and per-point generators build the same tables
+        Es = 1.5
+        gen_table = digital.soft_dec_table_generator(digital.sd_psk_4_0,
+                                                     prec, Es)
+        expected = [digital.sd_psk_4_0(complex(x, y), Es)
+                    for y in numpy.linspace(-Es * numpy.sqrt(2.0) / 2.0,
+                                            Es * numpy.sqrt(2.0) / 2.0, npts)
+                    for x in numpy.linspace(-Es * numpy.sqrt(2.0) / 2.0,
+                                            Es * numpy.sqrt(2.0) / 2.0, npts)]
+        self.assertEqual(gen_table, [[float(d) for d in e] for e in expected])
+        self.assertEqual(
+            len(digital.soft_dec_table_generator(digital.sd_qam_16_0, prec)),
+            npts**2)
+
+        # A constant soft decision is not broadcast over the grid, the
+        # generator is called per point instead
+        def mixed(x, Es):
+            return [x.real, 1.0]
+        mixed_table = digital.soft_dec_table_generator(mixed, prec, Es)
+        self.assertEqual(len(mixed_table), npts**2)
+        self.assertEqual(mixed_table[-1], [Es * numpy.sqrt(2.0) / 2.0, 1.0])
+
+    def test_soft_batch_matches_scalar(self):
+        prec = 6
+        constel, code = digital.qam_16_0()
+        Es = max(abs(p) for p in constel)
+        table = digital.soft_dec_table(constel, code, prec, 0.7)
+
+        random.seed(0)
+        samples = [complex(random.gauss(0, Es), random.gauss(0, Es))
+                   for _ in range(1000)]
+        # Out-of-range and NaN samples get clamped to the table edges
+        samples += [10 * Es * (1 + 1j), -10 * Es * (1 + 1j),
+                    complex(float('nan'), 0.1), complex(0.1, float('nan'))]
+
+        expected = numpy.array(
+            [digital.calc_soft_dec_from_table(s, table, prec, Es)
+             for s in samples], dtype=numpy.float32)
+        for t in (table, numpy.asarray(table, dtype=numpy.float32)):
+            batch = digital.calc_soft_dec_from_table_batch(samples, t,
+                                                           prec, Es)
+            self.assertEqual(batch.dtype, numpy.float32)
+            self.assertEqual(batch.shape, (len(samples), 4))
+            self.assertTrue(numpy.array_equal(batch, expected))
+
+        samples = samples[:-4]
+        expected = numpy.array(
+            [digital.calc_soft_dec(s, constel, code, 0.7) for s in samples],
+            dtype=numpy.float32)
+        batch = digital.calc_soft_dec_batch(samples, constel, code, 0.7)
+        self.assertEqual(batch.shape, (len(samples), 4))
+        self.assertTrue(numpy.array_equal(batch, expected))
+
+    def test_soft_table_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            constel, code = digital.qam_16_0()
+            table = digital.soft_dec_table(constel, code, 5, 1,
+                                           cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            cached = digital.soft_dec_table(constel, code, 5, 1,
+                                            cache_dir=cache_dir)
+            self.assertEqual(cached, table)
+            # Any change in the key builds (and stores) a new table
+            digital.soft_dec_table(constel, code, 5, 2, cache_dir=cache_dir)
+            digital.soft_dec_table(constel, code[::-1], 5, 1,
+                                   cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 3)
+        finally:
+            shutil.rmtree(cache_dir)
+
 
 class mod_demod(gr.hier_block2):
     def __init__(self, constellation, differential, rotation):
@@ -9,8 +9,109 @@
 #
 
 
+import hashlib
+import os
+import tempfile
+
 import numpy
 
+# Default location of the on-disk LUT cache, see soft_dec_table
+LUT_CACHE_DIR = os.path.expanduser('~/.cache/gnuradio/soft_dec_lut')
+_LUT_CACHE_VERSION = 1
+
+
+def _lut_grid(xrng, yrng):
+    """
+    Complex sample grid in LUT order: x varies fastest, starting at the
+    bottom left. Real and imaginary parts are set directly so that the
+    points are exactly complex(x, y).
+    """
+    grid = numpy.empty((len(yrng), len(xrng)), dtype=numpy.complex128)
+    grid.real = xrng[numpy.newaxis, :]
+    grid.imag = yrng[:, numpy.newaxis]
+    return grid.ravel()
+
+
+def _soft_dec_matrix(samples, constel, symbols, npwr):
+    """
+    calc_soft_dec for a 1-D array of samples at once; returns an
+    (nsamples, k) float64 array.
+
+    The per-bit probabilities are accumulated over the constellation
+    points in the same order as calc_soft_dec does, so both give
+    identical results.
+    """
+    samples = numpy.asarray(samples, dtype=numpy.complex128)
+    M = len(constel)
+    k = int(numpy.log2(M))
+    zeros = [0] * k
+    ones = [0] * k
+    for i in range(M):
+        # hypot rather than numpy.abs, which may differ from Python's
+        # abs(complex) in the last bit
+        diff = samples - constel[i]
+        d = numpy.exp(-numpy.hypot(diff.real, diff.imag) / npwr)
+        for j in range(k):
+            if (symbols[i] >> j) & 1:
+                ones[j] = ones[j] + d
+            else:
+                zeros[j] = zeros[j] + d
+
+    s = numpy.empty((len(samples), k), dtype=numpy.float64)
+    with numpy.errstate(divide='ignore'):
+        for i in range(k):
+            s[:, k - 1 - i] = numpy.log(ones[i]) - numpy.log(zeros[i])
+    return s
+
+
+def _lut_cache_file(cache_dir, constel, symbols, prec, npwr):
+    key = hashlib.sha1()
+    key.update(b'soft_dec_table v%d' % _LUT_CACHE_VERSION)
+    key.update(numpy.asarray(constel, dtype=numpy.complex128).tobytes())
+    key.update(numpy.asarray(symbols, dtype=numpy.int64).tobytes())
+    key.update(repr((int(prec), float(npwr))).encode())
+    return os.path.join(cache_dir, key.hexdigest() + '.npy')
+
+
+def _load_lut(filename):
+    try:
+        return numpy.load(filename, allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+
+
+def _store_lut(filename, table):
+    # Write to a temporary file first, so that concurrent readers never
+    # see a partial table.
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename),
+                                   suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            numpy.save(f, table, allow_pickle=False)
+        os.replace(tmp, filename)
+    except OSError:
+        pass  # caching is best effort
+
+
+def _vectorized_table(soft_dec_gen, grid, Es):
+    """
+    Call soft_dec_gen once with the whole grid. Returns None unless that
+    works and gives a list with one value per grid point for every soft
+    decision.
+    """
+    try:
+        decs = soft_dec_gen(grid, Es)
+    except (TypeError, ValueError):
+        return None  # needs scalar samples
+    if not isinstance(decs, (list, tuple)):
+        return None
+    decs = [numpy.asarray(d) for d in decs]
+    if not decs or any(d.shape != grid.shape or d.dtype.kind not in 'iuf'
+                       for d in decs):
+        return None
+    return numpy.column_stack(decs).tolist()
+
 
 def soft_dec_table_generator(soft_dec_gen, prec, Es=1):
     '''
@@ -68,6 +169,13 @@ def soft_dec_table_generator(soft_dec_gen, prec, Es=1):
     | normalized so the outside points sit on +/-1, etc.) but still
     | calculate the soft decisions as we would given the full
     | constellation.
+    |
+    | The generator is first called once with the whole grid as a
+    | numpy array. If it returns a list holding one array of soft
+    | decisions per bit, each with one value per grid point, that is the
+    | table. If it raises a TypeError or ValueError instead (e.g.,
+    | because it branches on the sample) or returns anything else, it is
+    | called point by point.
 
     '''
 
@@ -76,16 +184,19 @@ def soft_dec_table_generator(soft_dec_gen, prec, Es=1):
     yrng = numpy.linspace(-maxd, maxd, npts)
     xrng = numpy.linspace(-maxd, maxd, npts)
 
+    grid = _lut_grid(xrng, yrng)
+    table = _vectorized_table(soft_dec_gen, grid, Es)
+    if table is not None:
+        return table
+
     table = []
-    for y in yrng:
-        for x in xrng:
-            pt = complex(x, y)
-            decs = soft_dec_gen(pt, Es)
-            table.append(decs)
+    for pt in grid.tolist():
+        decs = soft_dec_gen(pt, Es)
+        table.append(decs)
     return table
 
 
-def soft_dec_table(constel, symbols, prec, npwr=1):
+def soft_dec_table(constel, symbols, prec, npwr=1, cache_dir=None):
     '''
     Similar in nature to soft_dec_table_generator above. Instead, this
     takes in the constellation and symbol points along with the noise
@@ -99,11 +210,23 @@ def soft_dec_table(constel, symbols, prec, npwr=1):
     samples and the constellations must be working on the same
     magnitudes.
 
-    Because this uses the calc_soft_dec function, it can be quite
-    a bit more expensive to generate the LUT, though it should be
-    one-time work.
+    The LUT is computed for the whole grid at once and gives the same
+    values as calling calc_soft_dec for every point.
+
+    Building large LUTs still takes a moment, so they can be cached on
+    disk: pass cache_dir (or True for LUT_CACHE_DIR) to reuse a table
+    previously built for the same constellation points, symbol mapping,
+    precision and noise power.
     '''
 
+    if cache_dir is True:
+        cache_dir = LUT_CACHE_DIR
+    if cache_dir:
+        cache_file = _lut_cache_file(cache_dir, constel, symbols, prec, npwr)
+        table = _load_lut(cache_file)
+        if table is not None:
+            return table.tolist()
+
     re_min = min(numpy.array(constel).real)
     im_min = min(numpy.array(constel).imag)
     re_max = max(numpy.array(constel).real)
@@ -113,14 +236,10 @@ def soft_dec_table(constel, symbols, prec, npwr=1):
     yrng = numpy.linspace(im_min, im_max, npts)
     xrng = numpy.linspace(re_min, re_max, npts)
 
-    table = []
-
-    for y in yrng:
-        for x in xrng:
-            pt = complex(x, y)
-            decs = calc_soft_dec(pt, constel, symbols, npwr)
-            table.append(decs)
-    return table
+    table = _soft_dec_matrix(_lut_grid(xrng, yrng), constel, symbols, npwr)
+    if cache_dir:
+        _store_lut(cache_file, table)
+    return table.tolist()
 
 
 def calc_soft_dec_from_table(sample, table, prec, Es=1.0):
@@ -223,6 +342,68 @@ def calc_soft_dec(sample, constel, symbols, npwr=1):
     return s
 
 
+def calc_soft_dec_from_table_batch(samples, table, prec, Es=1.0):
+    '''
+    Array version of calc_soft_dec_from_table: looks up the soft
+    decisions for every sample of an array at once.
+
+    samples: array-like of complex samples.
+
+    table: the LUT, as returned by soft_dec_table or
+    soft_dec_table_generator. When doing many lookups in the same
+    table, pass it as a float32 numpy array (numpy.asarray(table,
+    numpy.float32)) to avoid converting it on every call.
+
+    prec: the precision used when generating the LUT.
+
+    Es: the energy per symbol, see calc_soft_dec_from_table.
+
+    Returns an (N, bits_per_symbol) float32 array whose rows are the
+    values calc_soft_dec_from_table returns for the samples.
+    '''
+    table = numpy.asarray(table, dtype=numpy.float32)
+    samples = numpy.asarray(samples, dtype=numpy.complex128).ravel()
+
+    lut_scale = 2.0**prec
+    maxd = Es * numpy.sqrt(2.0) / 2.0
+    scale = (lut_scale) / (2.0 * maxd)
+
+    alpha = 0.99  # to keep index within bounds
+    lo = -alpha * maxd
+    hi = alpha * maxd
+
+    def to_index(x):
+        # Same clamping as min(hi, max(lo, x)), including sending NaN to lo
+        x = numpy.where(x > lo, x, lo)
+        x = numpy.where(x < hi, x, hi)
+        return ((maxd + x) * scale).astype(numpy.int64)
+
+    lut_size = int(lut_scale)
+    index = to_index(samples.real) + lut_size * to_index(samples.imag)
+
+    # Wrap indices outside of the table back by whole rows
+    max_index = lut_size * lut_size
+    over = index >= max_index
+    index[over] -= lut_size * ((index[over] - max_index) // lut_size + 1)
+    under = index < 0
+    index[under] += lut_size * ((-index[under] - 1) // lut_size + 1)
+
+    return table[index]
+
+
+def calc_soft_dec_batch(samples, constel, symbols, npwr=1):
+    '''
+    Array version of calc_soft_dec: calculates the soft decisions for
+    every sample of an array at once.
+
+    Returns an (N, bits_per_symbol) float32 array whose rows are the
+    values calc_soft_dec returns for the samples.
+    '''
+    samples = numpy.asarray(samples, dtype=numpy.complex128).ravel()
+    return _soft_dec_matrix(samples, constel, symbols,
+                            npwr).astype(numpy.float32)
+
+
 def show_table(table):
     prec = int(numpy.sqrt(len(table)))
     nbits = len(table[0])
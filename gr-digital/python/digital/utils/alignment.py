@@ -10,6 +10,10 @@
 """
 This module contains functions for aligning sequences.
 
+align_sequences checks one offset after the other in Python;
+align_sequences_xcorr checks all of them at once by cross-correlation and
+sequence_aligner keeps the alignment across consecutive chunks.
+
 >>> import random
 >>> rndm = random.Random()
 >>> rndm.seed(1234)
@@ -32,6 +36,8 @@ This module contains functions for aligning sequences.
 
 import random
 
+import numpy
+
 # DEFAULT PARAMETERS
 # If the fraction of matching bits between two sequences is greater than
 # this the sequences are assumed to be aligned.
@@ -127,6 +133,327 @@ def align_sequences(d1, d2,
     return max_frac_correct, best_compared, best_offset, indices
 
 
+# Sequences with more distinct symbols than this are not correlated
+# symbol by symbol with FFTs but compared directly.
+_max_fft_symbols = 16
+
+# 8-bit popcount table for the bit-packed comparison, where numpy has no
+# bitwise_count (before 2.0)
+_popcount8 = numpy.array([bin(i).count("1") for i in range(256)],
+                         dtype=numpy.int64)
+
+
+def _popcount(words):
+    if hasattr(numpy, "bitwise_count"):
+        return int(numpy.bitwise_count(words).sum())
+    return int(_popcount8[words.view(numpy.uint8)].sum())
+
+
+def _offset_order(len1, len2, max_offset):
+    """
+    The offsets align_sequences checks, in the same order: 0, -1, 1, -2,
+    2, ...
+    """
+    pos = numpy.arange(0, min(len1, max_offset))
+    neg = -numpy.arange(1, max(min(len2, max_offset), 1))
+    n = min(len(pos), len(neg))
+    offsets = numpy.empty(2 * n, dtype=numpy.int64)
+    offsets[0::2] = pos[:n]
+    offsets[1::2] = neg[:n]
+    return offsets
+
+
+def _compared_counts(mask, len2, offsets):
+    # entries i of the mask with 0 <= i - offset < len2
+    cum = numpy.concatenate(([0], numpy.cumsum(mask, dtype=numpy.int64)))
+    lo = numpy.clip(offsets, 0, len(mask))
+    hi = numpy.clip(len2 + offsets, 0, len(mask))
+    return numpy.where(hi > lo, cum[hi] - cum[lo], 0)
+
+
+def _xcorr_fft(x, y, offsets):
+    # sum_i x[i] * y[i - offset] for every offset
+    nfft = 1 << (len(x) + len(y)).bit_length()
+    c = numpy.fft.irfft(numpy.fft.rfft(x, nfft) *
+                        numpy.conj(numpy.fft.rfft(y, nfft)), nfft)
+    return numpy.rint(c[offsets % nfft]).astype(numpy.int64)
+
+
+def _matches_fft(d1, d2, mask, offsets):
+    symbols = numpy.unique(d1[mask])
+    if len(symbols) <= 2 and numpy.all(numpy.isin(d2, symbols)):
+        # One correlation of +-1 sequences gives matches - mismatches
+        ref = symbols[-1]
+        x = numpy.where(d1 == ref, 1.0, -1.0) * mask
+        y = numpy.where(d2 == ref, 1.0, -1.0)
+        compared = _compared_counts(mask, len(d2), offsets)
+        return (compared + _xcorr_fft(x, y, offsets)) // 2
+    matches = numpy.zeros(len(offsets), dtype=numpy.int64)
+    for symbol in symbols:
+        matches += _xcorr_fft((d1 == symbol) & mask, d2 == symbol, offsets)
+    return matches
+
+
+def _matches_direct(d1, d2, mask, offsets):
+    matches = numpy.zeros(len(offsets), dtype=numpy.int64)
+    for k, offset in enumerate(offsets):
+        lo = max(offset, 0)
+        hi = min(len(d1), len(d2) + offset)
+        if hi > lo:
+            matches[k] = numpy.count_nonzero(
+                (d1[lo:hi] == d2[lo - offset:hi - offset]) & mask[lo:hi])
+    return matches
+
+
+def _matches_packed(d1, d2, mask, offsets):
+    # d2 and its extent are padded so that every offset is a slice, and
+    # packed at all 8 bit phases so that every slice starts on a byte.
+    nbytes = 8 * -(-len(d1) // 64)
+    left = max(int(offsets.max()), 0)
+    right = max(len(d1) - len(d2) - int(offsets.min()), 0) + 8 * nbytes + 8
+    padded = numpy.zeros(left + len(d2) + right, dtype=bool)
+    extent = padded.copy()
+    padded[left:left + len(d2)] = d2 != 0
+    extent[left:left + len(d2)] = True
+    phases = [(numpy.packbits(padded[p:]), numpy.packbits(extent[p:]))
+              for p in range(8)]
+
+    def words(bits):
+        packed = numpy.zeros(nbytes, dtype=numpy.uint8)
+        packed[:-(-len(bits) // 8)] = numpy.packbits(bits)
+        return packed.view(numpy.uint64)
+
+    a = words(d1 != 0)
+    m = words(mask)
+    matches = numpy.zeros(len(offsets), dtype=numpy.int64)
+    for k, offset in enumerate(offsets):
+        start = left - offset
+        b, e = phases[start % 8]
+        first = start // 8
+        b = b[first:first + nbytes].view(numpy.uint64)
+        e = e[first:first + nbytes].view(numpy.uint64)
+        matches[k] = _popcount(~(a ^ b) & m & e)
+    return matches
+
+
+def correlate_sequences(d1, d2, offsets, indices=None, method="auto"):
+    """
+    Vectorized compare_sequences for many offsets at once. Returns arrays
+    with the number of matching and of compared entries for each offset.
+    Only entries i with 0 <= i - offset < len(d2) are compared.
+    d1 & d2 -- sequences
+    offsets -- offsets of d2 relative to d1
+    indices -- the indices of d1 to use for the comparison (default all)
+    method -- "fft" (cross-correlation per symbol), "packed" (bit-packed
+              XOR and popcount, binary sequences only), "direct" or "auto"
+    """
+    d1 = numpy.asarray(d1)
+    d2 = numpy.asarray(d2)
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+    mask = numpy.zeros(len(d1), dtype=bool)
+    if indices is None:
+        mask[:] = True
+    else:
+        indices = numpy.asarray(indices, dtype=numpy.int64)
+        mask[indices[indices < len(d1)]] = True
+    compared = _compared_counts(mask, len(d2), offsets)
+    if len(offsets) == 0 or len(d1) == 0 or len(d2) == 0:
+        return numpy.zeros(len(offsets), dtype=numpy.int64), compared
+
+    if method == "auto":
+        # rough relative costs: an FFT correlation grows with n, every
+        # offset costs a fixed overhead plus a pass over the data.
+        binary = (numpy.all((d1 == 0) | (d1 == 1)) and
+                  numpy.all((d2 == 0) | (d2 == 1)))
+        n = len(d1) + len(d2)
+        if binary and len(offsets) * (80 + n // 5000) < n:
+            method = "packed"
+        elif len(offsets) * (20 + n // 300) < n:
+            method = "direct"
+        elif binary or len(numpy.unique(d1[mask])) <= _max_fft_symbols:
+            method = "fft"
+        else:
+            method = "direct"
+
+    if method == "fft":
+        matches = _matches_fft(d1, d2, mask, offsets)
+    elif method == "packed":
+        matches = _matches_packed(d1, d2, mask, offsets)
+    elif method == "direct":
+        matches = _matches_direct(d1, d2, mask, offsets)
+    else:
+        raise ValueError("Unknown method {0!r}".format(method))
+    return matches, compared
+
+
+def _best_offset(offsets, matches, compared, correct_cutoff):
+    # The offset align_sequences ends up with: the first one above the
+    # cutoff, else the first one with the best fraction.
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        frac = numpy.where(compared > 0, matches / compared, 0.0)
+    if len(frac) == 0 or frac.max() <= 0:
+        return 0, None, None, None
+    above = numpy.flatnonzero(frac > correct_cutoff)
+    k = above[0] if len(above) else numpy.argmax(frac)
+    return (float(frac[k]), int(compared[k]), int(offsets[k]),
+            int(matches[k]))
+
+
+def align_sequences_xcorr(d1, d2,
+                          num_samples=def_num_samples,
+                          max_offset=def_max_offset,
+                          correct_cutoff=def_correct_cutoff,
+                          seed=None,
+                          indices=None,
+                          method="auto"):
+    """
+    Cross-correlation based align_sequences: all offsets are checked at
+    once with FFTs, or for binary data with bit-packed XOR/popcount
+    comparisons. Takes the same arguments and returns the same tuple
+    (fraction correct, entries compared, offset, indices).
+    Unlike compare_sequences, entries of d1 that d2 does not overlap at a
+    positive offset are not compared against the end of d2.
+    method -- see correlate_sequences
+    """
+    max_overlap = max(len(d1), len(d2))
+    if indices is None:
+        indices = random_sample(max_overlap, num_samples, seed)
+    offsets = _offset_order(len(d1), len(d2), max_offset)
+    matches, compared = correlate_sequences(d1, d2, offsets, indices, method)
+    frac, best_compared, best_offset, _ = _best_offset(
+        offsets, matches, compared, correct_cutoff)
+    return frac, best_compared, best_offset, indices
+
+
+class sequence_aligner(object):
+    """
+    Streaming alignment of a received sequence to a reference.
+
+    Feed consecutive chunks of both sequences to process(). Until the
+    aligner is locked, the buffered data is searched for the offset (as
+    in align_sequences_xcorr, over all buffered entries). Once locked, new
+    entries are compared directly at that offset; if the fraction correct
+    of a processed stretch drops below loss_cutoff the lock is dropped and
+    the offset searched again from there.
+
+    max_offset -- the maximum offset that is checked
+    correct_cutoff -- fraction correct needed to lock
+    loss_cutoff -- fraction correct below which the lock is lost
+    min_compared -- entries that have to be compared to lock, or to lose
+                    the lock
+    history -- the most entries of each sequence kept while searching
+    """
+
+    def __init__(self, max_offset=def_max_offset,
+                 correct_cutoff=def_correct_cutoff, loss_cutoff=0.6,
+                 min_compared=100, history=None, method="auto"):
+        self.max_offset = max_offset
+        self.correct_cutoff = correct_cutoff
+        self.loss_cutoff = loss_cutoff
+        self.min_compared = min_compared
+        if history is None:
+            history = 2 * max_offset + 4 * min_compared
+        self.history = history
+        self.method = method
+        self.reset()
+
+    def reset(self):
+        self.offset = None
+        self.correct = 0
+        self.compared = 0
+        self.locks = 0
+        self._d1 = numpy.zeros(0, dtype=int)
+        self._d2 = numpy.zeros(0, dtype=int)
+        self._base1 = 0  # absolute index of _d1[0]
+        self._base2 = 0
+        self._stretch = [0, 0]  # correct, compared since the last check
+
+    @property
+    def locked(self):
+        return self.offset is not None
+
+    def fraction_correct(self):
+        if self.compared == 0:
+            return 0.0
+        return 1.0 * self.correct / self.compared
+
+    def _trim(self, keep1, keep2):
+        drop1 = max(0, min(keep1 - self._base1, len(self._d1)))
+        drop2 = max(0, min(keep2 - self._base2, len(self._d2)))
+        self._d1 = self._d1[drop1:]
+        self._d2 = self._d2[drop2:]
+        self._base1 += drop1
+        self._base2 += drop2
+
+    def _acquire(self):
+        offsets = _offset_order(len(self._d1), len(self._d2),
+                                self.max_offset)
+        matches, compared = correlate_sequences(
+            self._d1, self._d2, offsets, method=self.method)
+        compared = numpy.where(compared >= self.min_compared, compared, 0)
+        frac, n, offset, correct = _best_offset(
+            offsets, matches, compared, self.correct_cutoff)
+        if n is None or frac <= self.correct_cutoff:
+            self._trim(self._base1 + len(self._d1) - self.history,
+                       self._base2 + len(self._d2) - self.history)
+            return 0, 0
+        self.offset = self._base1 - self._base2 + offset
+        self.locks += 1
+        self._stretch = [0, 0]
+        # everything the search compared is accounted for
+        end = min(self._base1 + len(self._d1),
+                  self._base2 + len(self._d2) + self.offset)
+        self._trim(end, end - self.offset)
+        return correct, n
+
+    def _track(self):
+        start = max(self._base1, self._base2 + self.offset)
+        end = min(self._base1 + len(self._d1),
+                  self._base2 + len(self._d2) + self.offset)
+        if end <= start:
+            return 0, 0
+        a = self._d1[start - self._base1:end - self._base1]
+        b = self._d2[start - self.offset - self._base2:
+                     end - self.offset - self._base2]
+        correct = int(numpy.count_nonzero(a == b))
+        compared = end - start
+        self._stretch[0] += correct
+        self._stretch[1] += compared
+        if self._stretch[1] >= self.min_compared:
+            lost = self._stretch[0] < self.loss_cutoff * self._stretch[1]
+            self._stretch = [0, 0]
+            if lost:
+                # search again, starting with the stretch that failed
+                self.offset = None
+                return 0, 0
+        self._trim(end, end - self.offset)
+        return correct, compared
+
+    def process(self, d1, d2):
+        """
+        Add the next chunks of the reference (d1) and received (d2)
+        sequences. Returns the number of matching and compared entries
+        counted in this call (entries are counted once locked).
+        """
+        self._d1 = numpy.concatenate((self._d1, numpy.asarray(d1)))
+        self._d2 = numpy.concatenate((self._d2, numpy.asarray(d2)))
+        correct = compared = 0
+        while True:
+            if self.locked:
+                c, n = self._track()
+            else:
+                c, n = self._acquire()
+                if not self.locked:
+                    break
+            correct += c
+            compared += n
+            if self.locked and n == 0:
+                break
+        self.correct += correct
+        self.compared += compared
+        return correct, compared
+
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod()
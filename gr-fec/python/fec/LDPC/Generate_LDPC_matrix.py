@@ -13,7 +13,7 @@ from .Generate_LDPC_matrix_functions import (
     LDPC_matrix,
     get_best_matrix,
     get_full_rank_H_matrix,
-    linalg,
+    gf2_rank,
     write_alist_file,
 )
 
@@ -62,7 +62,7 @@ n = bestH.shape[1]
 k = n - bestH.shape[0]
 print("Parity check matrix properties:")
 print("\tSize :", bestH.shape)
-print("\tRank :", linalg.matrix_rank(bestH))
+print("\tRank :", gf2_rank(bestH))
 print("\tRate : %.3f" % ((k * 1.0) / n))
 print("\tn    :", n, " (codeword length)")
 print("\tk    :", k, " (info word length)")
@@ -13,9 +13,10 @@ import string
 import sys
 
 import numpy as np
-from numpy.linalg import inv, det
 from numpy.random import shuffle, randint
 
+from .gf2 import GF2Matrix, as_gf2, gf2_inv, gf2_rank
+
 
 # 0 gives no debug output, 1 gives a little, 2 gives a lot
 # verbose = 1 #######################################################
@@ -31,7 +32,7 @@ def read_alist_file(filename):
     with open(filename, 'r') as myfile:
         data = myfile.readlines()
         numCols, numRows = parse_alist_header(data[0])
-        H = zeros((numRows, numCols))
+        H = np.zeros((numRows, numCols))
         # The locations of 1s starts in the 5th line of the file
         for lineNumber in np.arange(4, 4 + numCols):
             indices = data[lineNumber].split()
@@ -54,56 +55,37 @@ def write_alist_file(filename, H, verbose=0):
     This function writes an alist file for the parity check
     matrix. The format of alist files is described at:
     http://www.inference.phy.cam.ac.uk/mackay/codes/alist.html
+
+    H may be a numpy array or a GF2Matrix.
     """
-    with open(filename, 'w') as myfile:
+    H = as_gf2(H)
+    numRows, numCols = H.shape
+    rowSupports = H.row_supports()
+    colSupports = H.transpose().row_supports()
+    rowWeights = [len(support) for support in rowSupports]
+    colWeights = [len(support) for support in colSupports]
+
+    def weights_line(weights):
+        return ''.join(str(w) + ' ' for w in weights) + '\n'
 
-        numRows = H.shape[0]
-        numCols = H.shape[1]
-
-        tempstring = repr(numCols) + ' ' + repr(numRows) + '\n'
-        myfile.write(tempstring)
-
-        tempstring1 = ''
-        tempstring2 = ''
-        maxRowWeight = 0
-        for rowNum in np.arange(numRows):
-            nonzeros = array(H[rowNum, :].nonzero())
-            rowWeight = nonzeros.shape[1]
-            if rowWeight > maxRowWeight:
-                maxRowWeight = rowWeight
-            tempstring1 = tempstring1 + repr(rowWeight) + ' '
-            for tempArray in nonzeros:
-                for index in tempArray:
-                    tempstring2 = tempstring2 + repr(index + 1) + ' '
-            tempstring2 = tempstring2 + '\n'
-        tempstring1 = tempstring1 + '\n'
-
-        tempstring3 = ''
-        tempstring4 = ''
-        maxColWeight = 0
-        for colNum in np.arange(numCols):
-            nonzeros = array(H[:, colNum].nonzero())
-            colWeight = nonzeros.shape[1]
-            if colWeight > maxColWeight:
-                maxColWeight = colWeight
-            tempstring3 = tempstring3 + repr(colWeight) + ' '
-            for tempArray in nonzeros:
-                for index in tempArray:
-                    tempstring4 = tempstring4 + repr(index + 1) + ' '
-            tempstring4 = tempstring4 + '\n'
-        tempstring3 = tempstring3 + '\n'
-
-        tempstring = repr(maxColWeight) + ' ' + repr(maxRowWeight) + '\n'
+    def indices_lines(supports):
+        return ''.join(
+            ''.join(str(index + 1) + ' ' for index in support) + '\n'
+            for support in supports)
+
+    with open(filename, 'w') as myfile:
+        myfile.write(str(numCols) + ' ' + str(numRows) + '\n')
         # write out max column and row weights
-        myfile.write(tempstring)
+        myfile.write(str(max(colWeights, default=0)) + ' ' +
+                     str(max(rowWeights, default=0)) + '\n')
         # write out all of the column weights
-        myfile.write(tempstring3)
+        myfile.write(weights_line(colWeights))
         # write out all of the row weights
-        myfile.write(tempstring1)
+        myfile.write(weights_line(rowWeights))
         # write out the nonzero indices for each column
-        myfile.write(tempstring4)
+        myfile.write(indices_lines(colSupports))
         # write out the nonzero indices for each row
-        myfile.write(tempstring2)
+        myfile.write(indices_lines(rowSupports))
 
 
 class LDPC_matrix(object):
@@ -112,18 +94,18 @@ class LDPC_matrix(object):
     def __init__(self, alist_filename=None,
                  n_p_q=None,
                  H_matrix=None):
-        if (alist_filename != None):
+        if (alist_filename is not None):
             self.H = read_alist_file(alist_filename)
-        elif (n_p_q != None):
+        elif (n_p_q is not None):
             self.H = self.regular_LDPC_code_contructor(n_p_q)
-        elif (H_matrix != None):
+        elif (H_matrix is not None):
             self.H = H_matrix
         else:
             print('Error: provide either an alist filename, ', end='')
             print('parameters for constructing regular LDPC parity, ', end='')
             print('check matrix, or a numpy array.')
 
-        self.rank = linalg.matrix_rank(self.H)
+        self.rank = gf2_rank(self.H)
         self.numRows = self.H.shape[0]
         self.n = self.H.shape[1]
         self.k = self.n - self.numRows
@@ -157,9 +139,9 @@ class LDPC_matrix(object):
             return
 
         # First submatrix first:
-        m = (n * p) / q  # number of rows in H matrix
-        submatrix1 = zeros((m / p, n))
-        for row in np.arange(m / p):
+        m = (n * p) // q  # number of rows in H matrix
+        submatrix1 = np.zeros((m // p, n))
+        for row in np.arange(m // p):
             range1 = row * q
             range2 = (row + 1) * q
             submatrix1[row, range1:range2] = 1
@@ -169,14 +151,14 @@ class LDPC_matrix(object):
         submatrixNum = 2
         newColumnOrder = np.arange(n)
         while submatrixNum <= p:
-            submatrix = zeros((m / p, n))
+            submatrix = np.zeros((m // p, n))
             shuffle(newColumnOrder)
 
             for columnNum in np.arange(n):
                 submatrix[:, columnNum] = \
                     submatrix1[:, newColumnOrder[columnNum]]
 
-            H = vstack((H, submatrix))
+            H = np.vstack((H, submatrix))
             submatrixNum = submatrixNum + 1
 
         # Double check the row weight and column weights.
@@ -185,18 +167,14 @@ class LDPC_matrix(object):
         cols = size[1]
 
         # Check the row weights.
-        for rowNum in np.arange(rows):
-            nonzeros = array(H[rowNum, :].nonzero())
-            if nonzeros.shape[1] != q:
-                print('Row', rowNum, 'has incorrect weight!')
-                return
+        for rowNum in np.flatnonzero(np.count_nonzero(H, axis=1) != q):
+            print('Row', rowNum, 'has incorrect weight!')
+            return
 
         # Check the column weights
-        for columnNum in np.arange(cols):
-            nonzeros = array(H[:, columnNum].nonzero())
-            if nonzeros.shape[1] != p:
-                print('Row', columnNum, 'has incorrect weight!')
-                return
+        for columnNum in np.flatnonzero(np.count_nonzero(H, axis=0) != p):
+            print('Row', columnNum, 'has incorrect weight!')
+            return
 
         return H
 
@@ -212,8 +190,9 @@ def greedy_upper_triangulation(H, verbose=0):
 
     # Per email from Dr. Urbanke, author of this textbook, this
     # algorithm requires H to be full rank
-    if linalg.matrix_rank(H_t) != H_t.shape[0]:
-        print('Rank of H:', linalg.matrix_rank(tempArray))
+    rank = gf2_rank(H_t)
+    if rank != H_t.shape[0]:
+        print('Rank of H:', rank)
         print('H has', H_t.shape[0], 'rows')
         print('Error: H must be full rank.')
         return
@@ -225,27 +204,16 @@ def greedy_upper_triangulation(H, verbose=0):
 
     while t != (n - k - g):
         H_residual = H_t[t:n - k - g, t:n]
-        size = H_residual.shape
-        numRows = size[0]
-        numCols = size[1]
-
-        minResidualDegrees = zeros((1, numCols), dtype=int)
 
-        for colNum in np.arange(numCols):
-            nonZeroElements = array(H_residual[:, colNum].nonzero())
-            minResidualDegrees[0, colNum] = nonZeroElements.shape[1]
+        residualDegrees = np.count_nonzero(H_residual, axis=0)
 
         # Find the minimum nonzero residual degree
-        nonZeroElementIndices = minResidualDegrees.nonzero()
-        nonZeroElements = minResidualDegrees[nonZeroElementIndices[0],
-                                             nonZeroElementIndices[1]]
-        minimumResidualDegree = nonZeroElements.min()
+        minimumResidualDegree = residualDegrees[residualDegrees > 0].min()
 
         # Get indices of all of the columns in H_t that have degree
         # equal to the min positive residual degree, then pick a
         # random column c.
-        indices = (minResidualDegrees == minimumResidualDegree) \
-            .nonzero()[1]
+        indices = np.flatnonzero(residualDegrees == minimumResidualDegree)
         indices = indices + t
         if indices.shape[0] == 1:
             columnC = indices[0]
@@ -253,24 +221,17 @@ def greedy_upper_triangulation(H, verbose=0):
             randomIndex = randint(0, indices.shape[0], (1, 1))[0][0]
             columnC = indices[randomIndex]
 
-        Htemp = H_t.copy()
-
         if minimumResidualDegree == 1:
             # This is the 'extend' case
             rowThatContainsNonZero = H_residual[:, columnC - t].nonzero()[0][0]
 
             # Swap column c with column t. (Book says t+1 but we
             # index from 0, not 1.)
-            Htemp[:, columnC] = H_t[:, t]
-            Htemp[:, t] = H_t[:, columnC]
-            H_t = Htemp.copy()
-            Htemp = H_t.copy()
+            H_t[:, [columnC, t]] = H_t[:, [t, columnC]]
             # Swap row r with row t. (Book says t+1 but we index from
             # 0, not 1.)
-            Htemp[rowThatContainsNonZero + t, :] = H_t[t, :]
-            Htemp[t, :] = H_t[rowThatContainsNonZero + t, :]
-            H_t = Htemp.copy()
-            Htemp = H_t.copy()
+            H_t[[rowThatContainsNonZero + t, t], :] = \
+                H_t[[t, rowThatContainsNonZero + t], :]
         else:
             # This is the 'choose' case.
             rowsThatContainNonZeros = H_residual[:, columnC - t] \
@@ -278,18 +239,12 @@ def greedy_upper_triangulation(H, verbose=0):
 
             # Swap column c with column t. (Book says t+1 but we
             # index from 0, not 1.)
-            Htemp[:, columnC] = H_t[:, t]
-            Htemp[:, t] = H_t[:, columnC]
-            H_t = Htemp.copy()
-            Htemp = H_t.copy()
+            H_t[:, [columnC, t]] = H_t[:, [t, columnC]]
 
             # Swap row r1 with row t
             r1 = rowsThatContainNonZeros[0]
-            Htemp[r1 + t, :] = H_t[t, :]
-            Htemp[t, :] = H_t[r1 + t, :]
+            H_t[[r1 + t, t], :] = H_t[[t, r1 + t], :]
             numRowsLeft = rowsThatContainNonZeros.shape[0] - 1
-            H_t = Htemp.copy()
-            Htemp = H_t.copy()
 
             # Move the other rows that contain nonZero entries to the
             # bottom of the matrix. We can't just swap them,
@@ -298,21 +253,10 @@ def greedy_upper_triangulation(H, verbose=0):
             for index in np.arange(1, numRowsLeft + 1):
                 rowInH_residual = rowsThatContainNonZeros[index]
                 rowInH_t = rowInH_residual + t - index + 1
-                m = n - k
                 # Move the row with the nonzero element to the
-                # bottom; don't update H_t.
-                Htemp[m - 1, :] = H_t[rowInH_t, :]
-                # Now rotate the bottom rows up.
-                sub_index = 1
-                while sub_index < (m - rowInH_t):
-                    Htemp[m - sub_index - 1, :] = H_t[m - sub_index, :]
-                    sub_index = sub_index + 1
-                H_t = Htemp.copy()
-                Htemp = H_t.copy()
-
-            # Save temp H as new H_t.
-            H_t = Htemp.copy()
-            Htemp = H_t.copy()
+                # bottom and rotate the bottom rows up.
+                H_t[rowInH_t:] = np.roll(H_t[rowInH_t:], -1, axis=0)
+
             g = g + (minimumResidualDegree - 1)
 
         t = t + 1
@@ -329,15 +273,12 @@ def greedy_upper_triangulation(H, verbose=0):
     C = H_t[t:t + g, t:t + g]
     D = H_t[t:t + g, t + g:n]
 
-    invTmod2array = inv_mod2(T)
-    temp1 = dot(E, invTmod2array) % 2
-    temp2 = dot(temp1, A) % 2
-    phi = (C - temp2) % 2
+    phi = compute_phi(T, E, A, C)
     if phi.any():
         try:
             # Try to take the inverse of phi.
             invPhi = inv_mod2(phi)
-        except linalg.linalg.LinAlgError:
+        except np.linalg.LinAlgError:
             # Phi is singular
             if verbose > 1:
                 print('Initial phi is singular')
@@ -371,39 +312,22 @@ def greedy_upper_triangulation(H, verbose=0):
     while iterationCount < maxIterations:
         if verbose > 1:
             print('iterationCount:', iterationCount)
-        tempH = H_t.copy()
-
         shuffle(columnsToShuffle)
         shuffle(rowsToShuffle)
-        index = 0
-        for newDestinationColumnNumber in np.arange(t, n):
-            oldColumnNumber = columnsToShuffle[index]
-            tempH[:, newDestinationColumnNumber] = \
-                H_t[:, oldColumnNumber]
-            index += 1
-
-        tempH2 = tempH.copy()
-        index = 0
-        for newDesinationRowNumber in np.arange(t, t + g):
-            oldRowNumber = rowsToShuffle[index]
-            tempH[newDesinationRowNumber, :] = tempH2[oldRowNumber, :]
-            index += 1
+        H_t[:, t:n] = H_t[:, columnsToShuffle]
+        H_t[t:t + g, :] = H_t[rowsToShuffle, :]
 
         # Now test this new H matrix.
-        H_t = tempH.copy()
         T = H_t[0:t, 0:t]
         E = H_t[t:t + g, 0:t]
         A = H_t[0:t, t:t + g]
         C = H_t[t:t + g, t:t + g]
-        invTmod2array = inv_mod2(T)
-        temp1 = dot(E, invTmod2array) % 2
-        temp2 = dot(temp1, A) % 2
-        phi = (C - temp2) % 2
+        phi = compute_phi(T, E, A, C)
         if phi.any():
             try:
                 # Try to take the inverse of phi.
                 invPhi = inv_mod2(phi)
-            except linalg.linalg.LinAlgError:
+            except np.linalg.LinAlgError:
                 # Phi is singular
                 if verbose > 1:
                     print('Phi is still singular')
@@ -427,53 +351,25 @@ def greedy_upper_triangulation(H, verbose=0):
 
 def inv_mod2(squareMatrix, verbose=0):
     """
-    Calculates the mod 2 inverse of a matrix.
+    Calculates the mod 2 inverse of a matrix. Raises
+    numpy.linalg.LinAlgError if the matrix is singular over GF(2).
     """
-    A = squareMatrix.copy()
-    t = A.shape[0]
-
-    # Special case for one element array [1]
-    if A.size == 1 and A[0] == 1:
-        return array([1])
-
-    Ainverse = inv(A)
-    B = det(A) * Ainverse
-    C = B % 2
-
-    # Encountered lots of rounding errors with this function.
-    # Previously tried floor, C.astype(int), and casting with (int)
-    # and none of that works correctly, so doing it the tedious way.
-
-    test = dot(A, C) % 2
-    tempTest = zeros_like(test)
-    for colNum in np.arange(test.shape[1]):
-        for rowNum in np.arange(test.shape[0]):
-            value = test[rowNum, colNum]
-            if (abs(1 - value)) < 0.01:
-                # this is a 1
-                tempTest[rowNum, colNum] = 1
-            elif (abs(2 - value)) < 0.01:
-                # there shouldn't be any 2s after B % 2, but I'm
-                # seeing them!
-                tempTest[rowNum, colNum] = 0
-            elif (abs(0 - value)) < 0.01:
-                # this is a 0
-                tempTest[rowNum, colNum] = 0
-            else:
-                if verbose > 1:
-                    print('In inv_mod2. Rounding error on this', )
-                    print('value? Mod 2 has already been done.', )
-                    print('value:', value)
-
-    test = tempTest.copy()
-
-    if (test - eye(t, t) % 2).any():
+    try:
+        return gf2_inv(squareMatrix)
+    except np.linalg.LinAlgError:
         if verbose:
             print('Error in inv_mod2: did not find inverse.')
-            # TODO is this the most appropriate error to raise?
-        raise linalg.linalg.LinAlgError
-    else:
-        return C
+        raise
+
+
+def compute_phi(T, E, A, C):
+    """
+    Calculates phi = -E T^-1 A + C (mod 2), the matrix that has to be
+    nonsingular for Richardson-Urbanke encoding.
+    """
+    ETinv = as_gf2(E).dot(as_gf2(inv_mod2(T)))
+    phi = ETinv.dot(as_gf2(A)).to_dense(C.dtype)
+    return (C - phi) % 2
 
 
 def swap_columns(a, b, arrayIn):
@@ -514,75 +410,21 @@ def get_full_rank_H_matrix(H, verbose=False):
     remove them. The updated matrix will be returned.
     """
     tempArray = H.copy()
-    if linalg.matrix_rank(tempArray) == tempArray.shape[0]:
+    if gf2_rank(tempArray) == tempArray.shape[0]:
         if verbose:
             print('Returning H; it is already full rank.')
         return tempArray
 
-    numRows = tempArray.shape[0]
-    numColumns = tempArray.shape[1]
-    limit = numRows
-    rank = 0
-    i = 0
-
-    # Create an array to save the column permutations.
-    columnOrder = np.arange(numColumns).reshape(1, numColumns)
-
-    # Create an array to save the row permutations. We just need
-    # this to know which dependent rows to delete.
-    rowOrder = np.arange(numRows).reshape(numRows, 1)
+    # Reduce a copy to find the dependent rows and the column
+    # permutations; H itself is only reordered.
+    reduced, rank, rowOrder, columnOrder = \
+        GF2Matrix.from_dense(tempArray).systematic_form()
+    if verbose:
+        print('In get_full_rank_H_matrix; rank:', rank)
 
-    while i < limit:
-        if verbose:
-            print('In get_full_rank_H_matrix; i:', i)
-            # Flag indicating that the row contains a non-zero entry
-        found = False
-        for j in np.arange(i, numColumns):
-            if tempArray[i, j] == 1:
-                # Encountered a non-zero entry at (i, j)
-                found = True
-                # Increment rank by 1
-                rank = rank + 1
-                # Make the entry at (i,i) be 1
-                tempArray = swap_columns(j, i, tempArray)
-                # Keep track of the column swapping
-                columnOrder = swap_columns(j, i, columnOrder)
-                break
-        if found == True:
-            for k in np.arange(0, numRows):
-                if k == i:
-                    continue
-                # Checking for 1's
-                if tempArray[k, i] == 1:
-                    # Add row i to row k
-                    tempArray[k, :] = tempArray[k, :] + tempArray[i, :]
-                    # Addition is mod2
-                    tempArray = tempArray.copy() % 2
-                    # All the entries above & below (i, i) are now 0
-            i = i + 1
-        if found == False:
-            # Push the row of 0s to the bottom, and move the bottom
-            # rows up (sort of a rotation thing).
-            tempArray = move_row_to_bottom(i, tempArray)
-            # Decrease limit since we just found a row of 0s
-            limit -= 1
-            # Keep track of row swapping
-            rowOrder = move_row_to_bottom(i, rowOrder)
-
-    # Don't need the dependent rows
-    finalRowOrder = rowOrder[0:i]
-
-    # Reorder H, per the permutations taken above .
-    # First, put rows in order, omitting the dependent rows.
-    newNumberOfRowsForH = finalRowOrder.shape[0]
-    newH = zeros((newNumberOfRowsForH, numColumns))
-    for index in np.arange(newNumberOfRowsForH):
-        newH[index, :] = H[finalRowOrder[index], :]
-
-    # Next, put the columns in order.
-    tempHarray = newH.copy()
-    for index in np.arange(numColumns):
-        newH[:, index] = tempHarray[:, columnOrder[0, index]]
+    # Reorder H, per the permutations taken above, omitting the
+    # dependent rows.
+    newH = H[rowOrder[0:rank]][:, columnOrder]
 
     if verbose:
         print('original H.shape:', H.shape)
@@ -645,45 +487,9 @@ def getSystematicGmatrix(GenMatrix):
     generator matrix format. Use the function getSystematicGmatrixFromH
     for that purpose.
     """
-    tempArray = GenMatrix.copy()
-    numRows = tempArray.shape[0]
-    numColumns = tempArray.shape[1]
-    limit = numRows
-    rank = 0
-    i = 0
-    while i < limit:
-        # Flag indicating that the row contains a non-zero entry
-        found = False
-        for j in np.arange(i, numColumns):
-            if tempArray[i, j] == 1:
-                # Encountered a non-zero entry at (i, j)
-                found = True
-                # Increment rank by 1
-                rank = rank + 1
-                # make the entry at (i,i) be 1
-                tempArray = swap_columns(j, i, tempArray)
-                break
-        if found == True:
-            for k in np.arange(0, numRows):
-                if k == i:
-                    continue
-                # Checking for 1's
-                if tempArray[k, i] == 1:
-                    # add row i to row k
-                    tempArray[k, :] = tempArray[k, :] + tempArray[i, :]
-                    # Addition is mod2
-                    tempArray = tempArray.copy() % 2
-                    # All the entries above & below (i, i) are now 0
-            i = i + 1
-        if found == False:
-            # push the row of 0s to the bottom, and move the bottom
-            # rows up (sort of a rotation thing)
-            tempArray = move_row_to_bottom(i, tempArray)
-            # decrease limit since we just found a row of 0s
-            limit -= 1
-            # the rows below i are the dependent rows, which we discard
-    G = tempArray[0:i, :]
-    return G
+    reduced, rank, rowOrder, columnOrder = \
+        GF2Matrix.from_dense(GenMatrix).systematic_form()
+    return reduced.to_dense(GenMatrix.dtype)
 
 
 def getSystematicGmatrixFromH(H, verbose=False):
@@ -709,12 +515,12 @@ def getSystematicGmatrixFromH(H, verbose=False):
     k = n - H.shape[0]
     I_temp = tempArray[:, 0:(n - k)]
     m = tempArray[:, (n - k):n]
-    newH = concatenate((m, I_temp), axis=1)
+    newH = np.concatenate((m, I_temp), axis=1)
 
     # Now the submatrix m is the transpose of the parity submatrix,
     # i.e. H is in the form H = [P'|I]. So G is just [I|P]
     k = m.shape[1]
-    G = concatenate((identity(k), m.T), axis=1)
+    G = np.concatenate((np.identity(k), m.T), axis=1)
     if verbose:
         print('returning G with size: ', G.shape)
     return G
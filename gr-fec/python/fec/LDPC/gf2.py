@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+"""
+Linear algebra over GF(2) on bit-packed matrices.
+
+Each row is stored as a run of uint64 words, column j being bit j % 64 of
+word j // 64. Adding two rows is one XOR per 64 columns, so Gaussian
+elimination on parity check matrices with thousands of columns stays fast
+and, unlike going through floating point inv()/det(), exact.
+"""
+
+import numpy as np
+
+WORD_BITS = 64
+
+
+class GF2Matrix(object):
+    """
+    Binary matrix with bit-packed rows.
+
+    Args:
+        words: (rows, words per row) uint64 array of packed rows
+        ncols: number of columns
+    """
+
+    def __init__(self, words, ncols):
+        self.words = words
+        self.ncols = ncols
+
+    @classmethod
+    def from_dense(cls, a):
+        """
+        Pack a 2-D array; nonzero entries (after mod 2) are ones.
+        """
+        a = np.asarray(a)
+        if a.ndim != 2:
+            raise ValueError("expected a 2-D array, got shape {0}".format(
+                a.shape))
+        nrows, ncols = a.shape
+        nwords = max(1, -(-ncols // WORD_BITS))
+        bits = np.zeros((nrows, nwords * WORD_BITS), dtype=np.uint8)
+        bits[:, :ncols] = (a % 2) != 0
+        packed = np.packbits(bits, axis=1, bitorder='little')
+        words = packed.view('<u8').astype(np.uint64, copy=False)
+        return cls(np.ascontiguousarray(words), ncols)
+
+    @classmethod
+    def identity(cls, n):
+        return cls.from_dense(np.eye(n, dtype=np.uint8))
+
+    @property
+    def shape(self):
+        return self.words.shape[0], self.ncols
+
+    def copy(self):
+        return GF2Matrix(self.words.copy(), self.ncols)
+
+    def to_dense(self, dtype=int):
+        packed = self.words.astype('<u8', copy=False).view(np.uint8)
+        bits = np.unpackbits(packed, axis=1, count=self.ncols,
+                             bitorder='little')
+        return bits.astype(dtype, copy=False)
+
+    def row_bits(self, i):
+        """
+        Row i as a 0/1 uint8 array.
+        """
+        packed = self.words[i].astype('<u8', copy=False).view(np.uint8)
+        return np.unpackbits(packed, count=self.ncols, bitorder='little')
+
+    def column(self, j):
+        """
+        Column j as a boolean array.
+        """
+        word = self.words[:, j // WORD_BITS]
+        return ((word >> np.uint64(j % WORD_BITS)) & np.uint64(1)).astype(bool)
+
+    def row_supports(self):
+        """
+        List of the column indices of the ones in each row.
+        """
+        rows, cols = np.nonzero(self.to_dense(np.uint8))
+        return np.split(cols, np.cumsum(np.bincount(
+            rows, minlength=self.shape[0]))[:-1])
+
+    def transpose(self):
+        return GF2Matrix.from_dense(self.to_dense(np.uint8).T)
+
+    def hstack(self, other):
+        return GF2Matrix.from_dense(np.hstack(
+            (self.to_dense(np.uint8), other.to_dense(np.uint8))))
+
+    def select_columns(self, columns):
+        return GF2Matrix.from_dense(self.to_dense(np.uint8)[:, columns])
+
+    def swap_rows(self, a, b):
+        self.words[[a, b]] = self.words[[b, a]]
+
+    def swap_columns(self, a, b):
+        col_a = self.column(a)
+        col_b = self.column(b)
+        flip = col_a != col_b
+        for j in (a, b):
+            self.words[flip, j // WORD_BITS] ^= np.uint64(1) << np.uint64(
+                j % WORD_BITS)
+
+    def add_row(self, targets, source):
+        """
+        Add (XOR) row source to the rows selected by targets (an index or
+        boolean array). Only the words spanned by the ones of the source
+        row are touched, which is where sparse rows save the work.
+        """
+        src = self.words[source]
+        nonzero = np.flatnonzero(src)
+        if nonzero.size == 0:
+            return
+        lo, hi = nonzero[0], nonzero[-1] + 1
+        if isinstance(targets, np.ndarray) and targets.dtype == bool:
+            targets = np.flatnonzero(targets)
+        self.words[targets, lo:hi] ^= src[lo:hi]
+
+    def eliminate(self, ncols=None):
+        """
+        Gauss-Jordan elimination in place, over the first ncols columns
+        (all by default). Every pivot column ends up with a single one, the
+        pivot rows are moved to the top in column order.
+
+        Returns the pivot columns.
+        """
+        if ncols is None:
+            ncols = self.ncols
+        nrows = self.shape[0]
+        pivots = []
+        row = 0
+        for col in range(ncols):
+            if row == nrows:
+                break
+            column = self.column(col)
+            candidates = np.flatnonzero(column[row:])
+            if candidates.size == 0:
+                continue
+            pivot = row + candidates[0]
+            if pivot != row:
+                self.swap_rows(row, pivot)
+                column[[row, pivot]] = column[[pivot, row]]
+            column[row] = False
+            # The pivot row is zero left of col, start at its word.
+            word = col // WORD_BITS
+            targets = np.flatnonzero(column)
+            if targets.size:
+                self.words[targets, word:] ^= self.words[row, word:]
+            pivots.append(col)
+            row += 1
+        return pivots
+
+    def rank(self):
+        return len(self.copy().eliminate())
+
+    def inverse(self):
+        """
+        Inverse of a square matrix. Raises numpy.linalg.LinAlgError if the
+        matrix is singular.
+        """
+        n, m = self.shape
+        if n != m:
+            raise np.linalg.LinAlgError(
+                "GF(2) inverse of a non-square {0}x{1} matrix".format(n, m))
+        augmented = self.hstack(GF2Matrix.identity(n))
+        if len(augmented.eliminate(n)) != n:
+            raise np.linalg.LinAlgError("matrix is singular over GF(2)")
+        return augmented.select_columns(np.arange(n, 2 * n))
+
+    def dot(self, other):
+        """
+        Matrix product over GF(2).
+        """
+        a = self.to_dense(np.uint8)
+        result = GF2Matrix(
+            np.zeros((a.shape[0], other.words.shape[1]), dtype=np.uint64),
+            other.ncols)
+        for i in range(a.shape[1]):
+            rows = np.flatnonzero(a[:, i])
+            if rows.size:
+                result.words[rows] ^= other.words[i]
+        return result
+
+    def systematic_form(self):
+        """
+        Bring the matrix to [I | P] form with column swaps, the way the
+        LDPC matrix helpers have always done it: row i is reduced with the
+        first one at or right of column i, rows reduced to zero are rotated
+        to the bottom.
+
+        Returns (reduced, rank, row_order, column_order): reduced holds the
+        rank independent rows in [I | P] form, row_order and column_order
+        are the permutations applied to the original matrix.
+        """
+        work = self.copy()
+        nrows, ncols = self.shape
+        column_order = np.arange(ncols)
+        row_order = list(range(nrows))
+        limit = nrows
+        i = 0
+        while i < limit:
+            row = row_order[i]
+            bits = work.row_bits(row)[column_order[i:]]
+            found = np.flatnonzero(bits)
+            if found.size == 0:
+                # row of zeros, a dependent row
+                row_order.append(row_order.pop(i))
+                limit -= 1
+                continue
+            j = i + found[0]
+            column_order[[i, j]] = column_order[[j, i]]
+            targets = work.column(column_order[i])
+            targets[row] = False
+            work.add_row(targets, row)
+            i += 1
+        row_order = np.array(row_order, dtype=int)
+        reduced = GF2Matrix.from_dense(
+            work.to_dense(np.uint8)[row_order[:i]][:, column_order])
+        return reduced, i, row_order, column_order
+
+
+def as_gf2(a):
+    if isinstance(a, GF2Matrix):
+        return a
+    return GF2Matrix.from_dense(a)
+
+
+def gf2_rank(a):
+    """
+    Rank of a binary matrix over GF(2).
+    """
+    return as_gf2(a).rank()
+
+
+def gf2_inv(a):
+    """
+    Inverse of a square binary matrix over GF(2), as an array of the same
+    dtype. Raises numpy.linalg.LinAlgError if it does not exist.
+    """
+    dtype = a.dtype if isinstance(a, np.ndarray) else int
+    return as_gf2(a).inverse().to_dense(dtype)
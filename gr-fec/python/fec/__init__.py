@@ -21,6 +21,7 @@ except ImportError:
     from .fec_python import *
 
 from .bercurve_generator import bercurve_generator
+from .ber_sweep import ber_sweep, ber_curve, ber_point
 from .fec_test import fec_test
 from .extended_tagged_decoder import extended_tagged_decoder
 from .extended_tagged_encoder import extended_tagged_encoder
@@ -28,6 +29,7 @@ from .extended_async_encoder import extended_async_encoder
 from .capillary_threaded_encoder import capillary_threaded_encoder
 from .capillary_threaded_decoder import capillary_threaded_decoder
 from .threaded_decoder import threaded_decoder
+from .balanced_threaded_decoder import balanced_threaded_decoder
 from .threaded_encoder import threaded_encoder
 from .extended_decoder import extended_decoder
 from .extended_encoder import extended_encoder
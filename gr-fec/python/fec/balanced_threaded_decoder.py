@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import collections
+import threading
+import time
+
+import numpy
+
+from gnuradio import gr
+from . import fec_python as fec
+
+
+def _item_type(item_size):
+    if item_size == 1:
+        return numpy.uint8
+    return (numpy.uint8, item_size)
+
+
+class _frame_scheduler(object):
+    """
+    Bookkeeping shared by the dispatcher and the reorder block: which
+    decoder got which frame, how many frames each decoder has in flight
+    and how long it was busy.
+    """
+
+    def __init__(self, nworkers, max_outstanding, window):
+        self.nworkers = nworkers
+        self.max_outstanding = max_outstanding
+        self.window = window
+        self.cond = threading.Condition()
+        self.reset()
+
+    def reset(self):
+        with self.cond:
+            self.next_seq = 0
+            self.next_emit = 0
+            self.owner = {}
+            self.seqs = [collections.deque() for _ in range(self.nworkers)]
+            self.outstanding = [0] * self.nworkers
+            self.frames = [0] * self.nworkers
+            self.busy_time = [0.0] * self.nworkers
+            self.busy_since = [None] * self.nworkers
+            self.start_time = time.monotonic()
+            self._rotate = 0
+
+    def _pick(self, allowed):
+        if self.next_seq - self.next_emit >= self.window:
+            return None
+        best = None
+        for i in range(self.nworkers):
+            w = (self._rotate + i) % self.nworkers
+            if not allowed[w] or self.outstanding[w] >= self.max_outstanding:
+                continue
+            if best is None or self.outstanding[w] < self.outstanding[best]:
+                best = w
+        return best
+
+    def acquire(self, allowed, timeout):
+        """
+        Assign the next frame to the least loaded decoder among the allowed
+        ones, waiting up to timeout seconds for one to become available.
+        Returns the decoder index or None.
+        """
+        with self.cond:
+            w = self._pick(allowed)
+            if w is None and timeout:
+                self.cond.wait(timeout)
+                w = self._pick(allowed)
+            if w is None:
+                return None
+            seq = self.next_seq
+            self.next_seq += 1
+            self.owner[seq] = w
+            self.seqs[w].append(seq)
+            if self.outstanding[w] == 0:
+                self.busy_since[w] = time.monotonic()
+            self.outstanding[w] += 1
+            self._rotate = (w + 1) % self.nworkers
+            return w
+
+    def complete(self, w):
+        """
+        A decoded frame arrived from decoder w; returns its sequence
+        number.
+        """
+        with self.cond:
+            if not self.seqs[w]:
+                raise RuntimeError(
+                    "balanced_threaded_decoder: decoder {0} produced a frame "
+                    "it was never given".format(w))
+            seq = self.seqs[w].popleft()
+            del self.owner[seq]
+            self.outstanding[w] -= 1
+            self.frames[w] += 1
+            if self.outstanding[w] == 0:
+                self.busy_time[w] += time.monotonic() - self.busy_since[w]
+                self.busy_since[w] = None
+            self.cond.notify_all()
+            return seq
+
+    def emitted(self, nframes):
+        with self.cond:
+            self.next_emit += nframes
+            self.cond.notify_all()
+
+    def next_owner(self):
+        """
+        Decoder the next frame to output is waiting for, None if it is not
+        in flight.
+        """
+        with self.cond:
+            return self.owner.get(self.next_emit)
+
+    def stats(self):
+        with self.cond:
+            now = time.monotonic()
+            elapsed = max(now - self.start_time, 1e-9)
+            stats = []
+            for w in range(self.nworkers):
+                busy = self.busy_time[w]
+                if self.busy_since[w] is not None:
+                    busy += now - self.busy_since[w]
+                stats.append({
+                    'frames': self.frames[w],
+                    'outstanding': self.outstanding[w],
+                    'busy_time': busy,
+                    'utilization': busy / elapsed,
+                })
+            return stats
+
+
+class _frame_dispatcher(gr.basic_block):
+    """
+    Hands whole frames from the input to whichever decoder is free.
+    """
+
+    def __init__(self, scheduler, item_size, frame_size, max_outstanding,
+                 wait=0.002):
+        nworkers = scheduler.nworkers
+        gr.basic_block.__init__(
+            self, name="balanced_frame_dispatcher",
+            in_sig=[_item_type(item_size)],
+            out_sig=[_item_type(item_size)] * nworkers)
+        self.scheduler = scheduler
+        self.frame_size = frame_size
+        self.wait = wait
+        self.set_output_multiple(frame_size)
+        # A decoder never has more than max_outstanding frames queued, so
+        # with this much room no output ever blocks the others.
+        for i in range(nworkers):
+            self.set_min_output_buffer(i, (max_outstanding + 2) * frame_size)
+
+    def start(self):
+        self.scheduler.reset()
+        return True
+
+    def general_work(self, input_items, output_items):
+        F = self.frame_size
+        inp = input_items[0]
+        room = len(output_items[0]) // F
+        nframes = len(inp) // F
+        counts = [0] * len(output_items)
+        sent = 0
+        while sent < nframes:
+            allowed = [c < room for c in counts]
+            # Only block while nothing could be handed out in this call.
+            # Nothing wakes this block up when a decoder frees up, so
+            # returning 0 right away would spin; the wait is kept short
+            # so that it doesn't hold up stopping the flowgraph.
+            w = self.scheduler.acquire(allowed, 0 if sent else self.wait)
+            if w is None:
+                break
+            k = counts[w]
+            output_items[w][k * F:(k + 1) * F] = inp[sent * F:(sent + 1) * F]
+            counts[w] += 1
+            sent += 1
+
+        for w, count in enumerate(counts):
+            if count:
+                self.produce(w, count * F)
+        self.consume(0, sent * F)
+        return gr.WORK_CALLED_PRODUCE
+
+
+class _frame_reorder(gr.basic_block):
+    """
+    Collects the decoded frames from all decoders and outputs them in the
+    order they were dispatched.
+    """
+
+    def __init__(self, scheduler, decoders, item_size, frame_size):
+        gr.basic_block.__init__(
+            self, name="balanced_frame_reorder",
+            in_sig=[_item_type(item_size)] * scheduler.nworkers,
+            out_sig=[_item_type(item_size)])
+        self.scheduler = scheduler
+        self.decoders = decoders
+        self.frame_size = frame_size
+        self.pending = {}
+        self.max_pending = 0
+        self.set_output_multiple(frame_size)
+
+    def start(self):
+        self.pending = {}
+        self.max_pending = 0
+        return True
+
+    def forecast(self, noutput_items, ninputs):
+        required = [0] * ninputs
+        if self.scheduler.next_emit in self.pending:
+            return required
+        for i, decoder in enumerate(self.decoders):
+            available = decoder.nitems_written(0) - self.nitems_read(i)
+            if available >= self.frame_size:
+                # something to collect, even if it's not the next frame
+                return required
+        # Wait for the decoder holding the next frame. With no frame in
+        # flight, any input will do: once that one is done, so are all.
+        w = self.scheduler.next_owner()
+        required[w if w is not None else 0] = self.frame_size
+        return required
+
+    def general_work(self, input_items, output_items):
+        F = self.frame_size
+        scheduler = self.scheduler
+        for w, inp in enumerate(input_items):
+            nframes = len(inp) // F
+            for k in range(nframes):
+                self.pending[scheduler.complete(w)] = inp[k * F:(k + 1) * F].copy()
+            if nframes:
+                self.consume(w, nframes * F)
+        self.max_pending = max(self.max_pending, len(self.pending))
+
+        out = output_items[0]
+        room = len(out) // F
+        seq = scheduler.next_emit
+        n = 0
+        while n < room and seq + n in self.pending:
+            out[n * F:(n + 1) * F] = self.pending.pop(seq + n)
+            n += 1
+        if n:
+            scheduler.emitted(n)
+            self.produce(0, n * F)
+        return gr.WORK_CALLED_PRODUCE
+
+
+class balanced_threaded_decoder(gr.hier_block2):
+    """
+    Runs a list of decoders in parallel, giving every frame to whichever
+    decoder is free instead of splitting the frames round-robin.
+
+    Slow frames (e.g. LDPC decodes needing many iterations) only hold up
+    the decoder working on them; the others keep decoding, and a reorder
+    buffer restores the frame order at the output. Any number of decoders
+    works.
+
+    Args:
+        decoder_list_0: list of generic_decoder objects, one per thread
+        input_size: input item size in bytes
+        output_size: output item size in bytes
+        max_outstanding: frames queued per decoder, 2 keeps every decoder
+                         busy while its next frame is handed over
+        window: frames that may be dispatched but not yet output; bounds
+                the reorder buffer, defaults to 4 per decoder
+    """
+
+    def __init__(self, decoder_list_0, input_size, output_size,
+                 max_outstanding=2, window=None):
+        gr.hier_block2.__init__(
+            self, "Balanced Threaded Decoder",
+            gr.io_signature(1, 1, input_size * 1),
+            gr.io_signature(1, 1, output_size * 1))
+
+        self.decoder_list_0 = decoder_list_0
+        nworkers = len(decoder_list_0)
+        if nworkers < 1:
+            raise ValueError(
+                "fec.balanced_threaded_decoder: need at least one decoder")
+        if window is None:
+            window = 4 * nworkers
+        if window < nworkers:
+            raise ValueError(
+                "fec.balanced_threaded_decoder: window must be at least the "
+                "number of decoders")
+
+        self.scheduler = _frame_scheduler(nworkers, max_outstanding, window)
+        self.generic_decoders_0 = [
+            fec.decoder(d, input_size, output_size) for d in decoder_list_0]
+        self.dispatcher = _frame_dispatcher(
+            self.scheduler, input_size,
+            fec.get_decoder_input_size(decoder_list_0[0]), max_outstanding)
+        self.reorder = _frame_reorder(
+            self.scheduler, self.generic_decoders_0, output_size,
+            fec.get_decoder_output_size(decoder_list_0[0]))
+
+        self.connect((self, 0), (self.dispatcher, 0))
+        for i, decoder in enumerate(self.generic_decoders_0):
+            self.connect((self.dispatcher, i), (decoder, 0))
+            self.connect((decoder, 0), (self.reorder, i))
+        self.connect((self.reorder, 0), (self, 0))
+
+    def worker_stats(self):
+        """
+        Per decoder statistics since the flowgraph started: a list of
+        dicts with the decoded 'frames', the frames 'outstanding', the
+        'busy_time' in seconds the decoder had frames to work on and its
+        'utilization', the busy fraction of the run time.
+        """
+        return self.scheduler.stats()
+
+    def reorder_depth(self):
+        """
+        Most frames held back in the reorder buffer at once.
+        """
+        return self.reorder.max_pending
+
+    def get_decoder_list_0(self):
+        return self.decoder_list_0
+
+    def set_decoder_list_0(self, decoder_list_0):
+        self.decoder_list_0 = decoder_list_0
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+"""
+BER sweeps with one worker process per CPU.
+
+Unlike bercurve_generator, which runs all Es/N0 points in one flowgraph,
+ber_sweep simulates every point in chunks of independent fec_test runs.
+The chunks are handed out to a process pool, and each point stops on its
+own once enough errors have been counted, its confidence interval is
+narrow enough or max_bits have been simulated. A status is streamed back
+for every finished chunk:
+
+    def make_encoder():
+        return fec.cc_encoder_make(2048, 7, 2, [79, -109])
+
+    def make_decoder():
+        return fec.cc_decoder.make(2048, 7, 2, [79, -109])
+
+    points = [ber_point(esno, make_encoder, make_decoder)
+              for esno in numpy.arange(0.0, 4.0, 0.5)]
+    for status in ber_sweep(points, target_errors=200):
+        if status.done:
+            print(status)
+
+The encoder and decoder factories are called in the worker processes.
+With the fork start method (the default on Linux) any callable works,
+otherwise they have to be picklable, e.g. module level functions.
+"""
+
+import copy
+import math
+import multiprocessing
+import queue
+import time
+
+import numpy
+
+
+class ber_point(object):
+    """
+    One point of a BER sweep.
+
+    Args:
+        esno: Es/N0 in dB
+        encoder_factory: callable returning a generic_encoder (or a list
+                         of them, see extended_encoder)
+        decoder_factory: callable returning a generic_decoder (or a list)
+        threading: threading mode of the extended encoder/decoder
+        puncpat: puncture pattern
+        label: name of the point in the results, defaults to the Es/N0
+    """
+
+    def __init__(self, esno, encoder_factory, decoder_factory,
+                 threading=None, puncpat='11', label=None):
+        self.esno = esno
+        self.encoder_factory = encoder_factory
+        self.decoder_factory = decoder_factory
+        self.threading = threading
+        self.puncpat = puncpat
+        self.label = label if label is not None else "{0} dB".format(esno)
+
+
+def fec_test_runner(point, nbits, seed):
+    """
+    Simulate nbits (rounded up to bytes) random bits through a fec_test
+    flowgraph for point; returns (bits compared, bit errors).
+    """
+    from gnuradio import gr, blocks
+    from .fec_test import fec_test
+
+    rng = numpy.random.RandomState(seed)
+    data = rng.randint(0, 256, -(-nbits // 8))
+
+    tb = gr.top_block()
+    src = blocks.vector_source_b(data.tolist(), False)
+    test = fec_test(generic_encoder=point.encoder_factory(),
+                    generic_decoder=point.decoder_factory(),
+                    esno=point.esno, threading=point.threading,
+                    puncpat=point.puncpat, seed=seed)
+    decoded = blocks.vector_sink_b()
+    reference = blocks.vector_sink_b()
+    tb.connect(src, test)
+    tb.connect((test, 0), decoded)
+    tb.connect((test, 1), reference)
+    tb.run()
+
+    rx = numpy.array(decoded.data(), dtype=numpy.uint8)
+    tx = numpy.array(reference.data(), dtype=numpy.uint8)
+    n = min(len(rx), len(tx))
+    errors = int(numpy.unpackbits(rx[:n] ^ tx[:n]).sum())
+    return 8 * n, errors
+
+
+def _normal_quantile(confidence):
+    # two-sided z value, e.g. 1.96 for 0.95, by bisection of erf
+    lo, hi = 0.0, 10.0
+    for _ in range(60):
+        mid = 0.5 * (lo + hi)
+        if math.erf(mid / math.sqrt(2.0)) < confidence:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+
+class ber_status(object):
+    """
+    Progress of one point of a sweep.
+
+    Attributes:
+        index: position of the point in the list handed to ber_sweep
+        point: the ber_point
+        bits, errors: totals over all chunks so far
+        chunks: number of finished chunks
+        worker_time: seconds the workers spent on the point
+        elapsed: seconds since the first chunk of the point was scheduled
+        done: no more chunks will be run for the point
+        stop_reason: 'errors', 'confidence' or 'max_bits' once done
+    """
+
+    def __init__(self, index, point, z):
+        self.index = index
+        self.point = point
+        self.bits = 0
+        self.errors = 0
+        self.chunks = 0
+        self.worker_time = 0.0
+        self.elapsed = 0.0
+        self.done = False
+        self.stop_reason = None
+        self._z = z
+        self._start = None
+
+    @property
+    def ber(self):
+        if self.bits == 0:
+            return float('nan')
+        return self.errors / self.bits
+
+    @property
+    def throughput(self):
+        """
+        Simulated bits per second of worker time.
+        """
+        if self.worker_time == 0.0:
+            return 0.0
+        return self.bits / self.worker_time
+
+    def confidence_interval(self):
+        """
+        Wilson score interval of the BER at the sweep's confidence level.
+        """
+        if self.bits == 0:
+            return 0.0, 1.0
+        n = float(self.bits)
+        p = self.errors / n
+        z2 = self._z * self._z
+        center = (p + z2 / (2 * n)) / (1 + z2 / n)
+        half = (self._z / (1 + z2 / n)) * math.sqrt(
+            p * (1 - p) / n + z2 / (4 * n * n))
+        return max(0.0, center - half), min(1.0, center + half)
+
+    def _update(self, bits, errors, seconds):
+        self.bits += bits
+        self.errors += errors
+        self.worker_time += seconds
+        self.chunks += 1
+        self.elapsed = time.time() - self._start
+
+    def __repr__(self):
+        low, high = self.confidence_interval()
+        return ("<ber_status {0}: BER {1:.3e} [{2:.3e}, {3:.3e}] "
+                "{4} errors in {5} bits, {6:.3g} bit/s{7}>").format(
+                    self.point.label, self.ber, low, high, self.errors,
+                    self.bits, self.throughput,
+                    ", done ({0})".format(self.stop_reason) if self.done
+                    else "")
+
+
+# state of the worker processes, see _init_worker
+_worker_points = None
+_worker_runner = None
+
+
+def _init_worker(points, runner):
+    global _worker_points, _worker_runner
+    _worker_points = points
+    _worker_runner = runner
+
+
+def _run_chunk(index, nbits, seed):
+    start = time.time()
+    bits, errors = _worker_runner(_worker_points[index], nbits, seed)
+    return index, bits, errors, time.time() - start
+
+
+def ber_sweep(points, processes=None, chunk_bits=100000, target_errors=100,
+              rel_precision=None, confidence=0.95, max_bits=10 ** 8,
+              min_errors=10, seed=0, runner=fec_test_runner):
+    """
+    Run a BER sweep; generator yielding a ber_status snapshot after each
+    chunk. The last status of every point has done set.
+
+    A point stops once it has target_errors errors, once the half width of
+    its confidence interval is below rel_precision times the BER (only
+    checked from min_errors errors on) or after max_bits bits.
+
+    Args:
+        points: list of ber_point
+        processes: number of worker processes, defaults to the number of
+                   CPUs; 0 runs everything in the calling process
+        chunk_bits: bits per simulation run
+        target_errors: stop after this many bit errors (None: never)
+        rel_precision: stop once the confidence interval is this narrow
+                       relative to the BER (None: never)
+        confidence: confidence level of the interval
+        max_bits: stop after this many bits
+        min_errors: errors needed before rel_precision is checked
+        seed: base seed, every chunk gets its own seed derived from it
+        runner: callable(point, nbits, seed) returning (bits, errors) for
+                one chunk, by default fec_test_runner
+    """
+    z = _normal_quantile(confidence)
+    states = [ber_status(i, point, z) for i, point in enumerate(points)]
+    if not states:
+        return
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    chunk_seed = [seed * 1000003]
+
+    def stop_reason(state):
+        if target_errors is not None and state.errors >= target_errors:
+            return 'errors'
+        if (rel_precision is not None and state.errors >= min_errors):
+            low, high = state.confidence_interval()
+            if (high - low) / 2 <= rel_precision * state.ber:
+                return 'confidence'
+        if state.bits >= max_bits:
+            return 'max_bits'
+        return None
+
+    def next_chunk(state):
+        if state._start is None:
+            state._start = time.time()
+        chunk_seed[0] += 1
+        return state.index, chunk_bits, chunk_seed[0]
+
+    def finish(state, bits, errors, seconds):
+        state._update(bits, errors, seconds)
+        reason = stop_reason(state)
+        if reason is not None:
+            state.done = True
+            state.stop_reason = reason
+        return copy.copy(state)
+
+    if processes == 0:
+        _init_worker(points, runner)
+        try:
+            for state in states:
+                while not state.done:
+                    index, bits, errors, seconds = _run_chunk(
+                        *next_chunk(state))
+                    yield finish(state, bits, errors, seconds)
+        finally:
+            _init_worker(None, None)
+        return
+
+    results = queue.Queue()
+    pool = multiprocessing.Pool(processes, _init_worker, (points, runner))
+    in_flight = [0] * len(states)
+    try:
+        # Keep every worker busy: points that have not stopped yet share
+        # the slots, as many chunks in flight as there are processes.
+        def schedule():
+            active = [s for s in states if not s.done]
+            while active and sum(in_flight) < processes:
+                state = min(active, key=lambda s: in_flight[s.index])
+                in_flight[state.index] += 1
+                pool.apply_async(_run_chunk, next_chunk(state),
+                                 callback=results.put,
+                                 error_callback=results.put)
+
+        schedule()
+        while sum(in_flight):
+            result = results.get()
+            if isinstance(result, BaseException):
+                raise result
+            index, bits, errors, seconds = result
+            in_flight[index] -= 1
+            state = states[index]
+            if state.done:
+                # chunk still in flight when the point stopped; its slot
+                # goes to the points still running
+                schedule()
+                continue
+            yield finish(state, bits, errors, seconds)
+            schedule()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def ber_curve(points, **kwargs):
+    """
+    Run a sweep to the end; returns the final ber_status of every point,
+    in the order of points. Takes the keyword arguments of ber_sweep.
+    """
+    final = {}
+    for status in ber_sweep(points, **kwargs):
+        if status.done:
+            final[status.index] = status
+    return [final[i] for i in range(len(points))]
@@ -16,6 +16,7 @@ from . import fec_python as fec
 from .bitflip import read_bitlist
 from .threaded_decoder import threaded_decoder
 from .capillary_threaded_decoder import capillary_threaded_decoder
+from .balanced_threaded_decoder import balanced_threaded_decoder
 
 
 class extended_decoder(gr.hier_block2):
@@ -189,6 +190,15 @@ class extended_decoder(gr.hier_block2):
                 )
             )
 
+        elif threading == "balanced":
+            self.blocks.append(
+                balanced_threaded_decoder(
+                    decoder_obj_list,
+                    fec.get_decoder_input_item_size(decoder_obj_list[0]),
+                    fec.get_decoder_output_item_size(decoder_obj_list[0]),
+                )
+            )
+
         else:
             self.blocks.append(
                 fec.decoder(
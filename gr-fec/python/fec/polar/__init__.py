@@ -18,7 +18,8 @@ CHANNEL_TYPE_AWGN = 'AWGN'
 CHANNEL_TYPE_BEC = 'BEC'
 
 
-def get_z_params(is_prototype, channel, block_size, design_snr, mu):
+def get_z_params(is_prototype, channel, block_size, design_snr, mu,
+                 snr_tolerance=0.0, processes=None):
     print('POLAR code channel construction called with parameters channel={0}, blocksize={1}, design SNR={2}, mu={3}'.format(
         channel, block_size, design_snr, mu))
     if not (channel == 'AWGN' or channel == 'BEC'):
@@ -33,18 +34,21 @@ def get_z_params(is_prototype, channel, block_size, design_snr, mu):
     if not mu > 0:
         raise ValueError("mu={0} < 1. MUST be > 1!".format(mu))
     if not is_prototype and channel == 'AWGN':
-        z_params = cc.load_z_parameters(block_size, design_snr, mu)
-        print('Read Z-parameter file: {0}'.format(cc.default_dir() +
-              cc.generate_filename(block_size, design_snr, mu)))
+        z_params = cc.load_z_parameters(block_size, design_snr, mu,
+                                        snr_tolerance, processes)
+        print('Read Z-parameter file: {0}'.format(cc.z_parameters_file(
+            block_size, design_snr, mu, snr_tolerance)))
         return z_params
     return bhattacharyya_bounds(design_snr, block_size)
 
 
-def load_frozen_bits_info(is_prototype, channel, block_size, num_info_bits, design_snr, mu):
+def load_frozen_bits_info(is_prototype, channel, block_size, num_info_bits, design_snr, mu,
+                          snr_tolerance=0.0, processes=None):
     num_frozen_bits = block_size - num_info_bits
     if not mu > 0:
         mu = 2
-    z_params = get_z_params(is_prototype, channel, block_size, design_snr, mu)
+    z_params = get_z_params(is_prototype, channel, block_size, design_snr, mu,
+                            snr_tolerance, processes)
     data_set = {
         'positions': cc.get_frozen_bit_indices_from_z_parameters(z_params, num_frozen_bits),
         'values': [0, ] * num_frozen_bits,
@@ -16,17 +16,21 @@ from .channel_construction_bec import calculate_bec_channel_capacities
 from .channel_construction_bec import design_snr_to_bec_eta
 from .channel_construction_bec import bhattacharyya_bounds
 import numpy as np
+import os
+import re
 
 try:
     from .channel_construction_awgn import tal_vardy_tpm_algorithm
 except ImportError:
     print("SciPy missing. Overwrite Tal-Vardy algorithm with BEC approximation")
 
-    def tal_vardy_tpm_algorithm(block_size, design_snr, mu):
+    def tal_vardy_tpm_algorithm(block_size, design_snr, mu, processes=None):
         return bhattacharyya_bounds(design_snr, block_size)
 
 
 Z_PARAM_FIRST_HEADER_LINE = "Bhattacharyya parameters (Z-parameters) for a polar code"
+Z_PARAM_FILENAME_PATTERN = re.compile(
+    r"^polar_code_z_parameters_N(\d+)_SNR(.+)_MU(\d+)\.polar$")
 
 
 def get_frozen_bit_indices_from_capacities(chan_caps, nfrozen):
@@ -76,8 +80,6 @@ def generate_filename(block_size, design_snr, mu):
 
 def default_dir():
     dir_def = "~/.gnuradio/polar/"
-    import os
-
     path = os.path.expanduser(dir_def)
 
     try:
@@ -102,14 +104,59 @@ def save_z_parameters(
     np.savetxt(path + filename, z_params, header=header)
 
 
-def load_z_parameters(block_size, design_snr, mu):
+def z_parameters_index(path=None):
+    """
+    Return (block_size, design_snr, mu, filename) for every Z-parameter
+    file in the cache directory, sorted. The parameters are taken from
+    the file names, so no file needs to be opened.
+    """
+    path = default_dir() if path is None else path
+    index = []
+    for filename in os.listdir(path):
+        match = Z_PARAM_FILENAME_PATTERN.match(filename)
+        if match is None:
+            continue
+        try:
+            snr = float(match.group(2))
+        except ValueError:
+            continue
+        index.append((int(match.group(1)), snr, int(match.group(3)),
+                      os.path.join(path, filename)))
+    return sorted(index)
+
+
+def z_parameters_file(block_size, design_snr, mu, snr_tolerance=0.0):
+    """
+    Return the cache file to use for the given construction parameters:
+    the one with exactly these parameters if it exists, otherwise the one
+    with the same block size and mu whose design SNR is nearest to
+    design_snr, but at most snr_tolerance dB away. If there is none, the
+    file name for exactly these parameters (not existing yet) is returned.
+    """
     path = default_dir()
-    filename = generate_filename(block_size, design_snr, mu)
-    full_file = path + filename
-    import os
-
+    full_file = path + generate_filename(block_size, design_snr, mu)
+    if os.path.isfile(full_file) or not snr_tolerance > 0.0:
+        return full_file
+    candidates = [(abs(snr - design_snr), filename)
+                  for n, snr, m, filename in z_parameters_index(path)
+                  if n == block_size and m == mu and
+                  abs(snr - design_snr) <= snr_tolerance]
+    if candidates:
+        return min(candidates)[1]
+    return full_file
+
+
+def load_z_parameters(block_size, design_snr, mu, snr_tolerance=0.0,
+                      processes=None):
+    """
+    Load cached Z-parameters, see z_parameters_file, or construct and
+    cache them if there are none. The construction may use processes
+    worker processes, see tal_vardy_tpm_algorithm.
+    """
+    full_file = z_parameters_file(block_size, design_snr, mu, snr_tolerance)
     if not os.path.isfile(full_file):
-        z_params = tal_vardy_tpm_algorithm(block_size, design_snr, mu)
+        z_params = tal_vardy_tpm_algorithm(block_size, design_snr, mu,
+                                           processes=processes)
         save_z_parameters(z_params, block_size, design_snr, mu)
     z_params = np.loadtxt(full_file)
     return z_params
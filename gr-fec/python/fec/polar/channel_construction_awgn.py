@@ -126,7 +126,7 @@ def quantize_to_size(tpm, mu):
                         1] = calculate_delta_I(tpm[0, d - 1], tpm[1, d - 1], ap, bp)
         if d < delta_i_vec.size - 1:
             delta_i_vec[d +
-                        1] = calculate_delta_I(ap, bp, tpm[0, d + 1], tpm[1, d + 1])
+                        1] = calculate_delta_I(ap, bp, tpm[0, d + 2], tpm[1, d + 2])
         delta_i_vec = np.delete(delta_i_vec, d)
         tpm = np.delete(tpm, d, axis=1)
         tpm[0, d] = ap
@@ -140,11 +140,22 @@ def upper_bound_z_params(z, block_size, design_snr):
     return z
 
 
-def tal_vardy_tpm_algorithm(block_size, design_snr, mu):
+def tal_vardy_tpm_algorithm(block_size, design_snr, mu, processes=None):
+    """
+    Tal-Vardy channel construction, see [1].
+
+    All synthetic channels of one recursion level are polarized together
+    with numpy, see polarize_channels. With processes > 1, levels with
+    enough channels are split across a pool of that many worker
+    processes.
+    """
     mu = mu // 2  # make sure algorithm uses only as many bins as specified.
     block_power = power_of_2_int(block_size)
-    channels = np.zeros((block_size, 2, mu))
-    channels[0] = discretize_awgn(mu, design_snr) * 2
+    tpm = discretize_awgn(mu, design_snr) * 2
+    a = np.zeros((block_size, mu))
+    b = np.zeros((block_size, mu))
+    a[0] = tpm[0]
+    b[0] = tpm[1]
 
     print("Constructing polar code with Tal-Vardy algorithm")
     print(
@@ -152,29 +163,226 @@ def tal_vardy_tpm_algorithm(block_size, design_snr, mu):
             block_size, design_snr, 2 * mu
         )
     )
-    show_progress_bar(0, block_size)
-    for j in range(0, block_power):
-        u = 2 ** j
-        for t in range(u):
-            show_progress_bar(u + t, block_size)
-            # print("(u={0}, t={1}) = {2}".format(u, t, u + t))
-            ch1 = upper_convolve(channels[t], mu)
-            ch2 = lower_convolve(channels[t], mu)
-            channels[t] = quantize_to_size(ch1, mu)
-            channels[u + t] = quantize_to_size(ch2, mu)
-
-    z = np.zeros(block_size)
-    for i in range(block_size):
-        z[i] = bhattacharyya_parameter(channels[i])
+    pool = None
+    if processes is not None and processes > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(processes)
+    try:
+        show_progress_bar(1, block_size)
+        for j in range(0, block_power):
+            u = 2 ** j
+            if pool is None or u < 2 * _MIN_CHANNELS_PER_TASK:
+                upper, lower = polarize_channels(a[:u], b[:u], mu)
+            else:
+                nchunks = min(processes, u // _MIN_CHANNELS_PER_TASK)
+                bounds = np.linspace(0, u, nchunks + 1).astype(int)
+                chunks = pool.map(
+                    _polarize_channels_task,
+                    [(a[lo:hi], b[lo:hi], mu)
+                     for lo, hi in zip(bounds[:-1], bounds[1:])])
+                results = list(chunks)
+                upper = tuple(np.concatenate([r[0][k] for r in results])
+                              for k in range(2))
+                lower = tuple(np.concatenate([r[1][k] for r in results])
+                              for k in range(2))
+            a[:u], b[:u] = upper
+            a[u:2 * u], b[u:2 * u] = lower
+            show_progress_bar(2 * u, block_size)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    z = np.sum(np.sqrt(a * b), axis=1)  # bhattacharyya_parameter per channel
 
     z = z[bit_reverse_vector(np.arange(block_size), block_power)]
     z = upper_bound_z_params(z, block_size, design_snr)
-    show_progress_bar(block_size, block_size)
     print("")
     print("channel construction DONE")
     return z
 
 
+# Don't hand out less work than this to a worker process, below that the
+# overhead of shipping the channels dominates.
+_MIN_CHANNELS_PER_TASK = 64
+
+
+def _polarize_channels_task(args):
+    return polarize_channels(*args)
+
+
+def polarize_channels(a, b, mu):
+    """
+    One polarization step for many channels at once.
+
+    a, b hold the transition probabilities W(y|0) and W(y|1) of one
+    channel per row, as tpm[0] and tpm[1] do for upper_convolve and
+    lower_convolve. Returns the upper and lower channels, each as an
+    (a, b) tuple of arrays with mu columns per channel; this is the
+    vectorized equivalent of quantize_to_size(upper_convolve(tpm, mu), mu)
+    and quantize_to_size(lower_convolve(tpm, mu), mu) for every row.
+    """
+    upper = quantize_channels(*merge_equal_lrs(*upper_convolve_channels(a, b),
+                                               np.sum(a, axis=1) +
+                                               np.sum(b, axis=1)), mu)
+    lower = quantize_channels(*merge_equal_lrs(*lower_convolve_channels(a, b),
+                                               np.sum(a, axis=1) +
+                                               np.sum(b, axis=1)), mu)
+    return upper, lower
+
+
+def _ordered(q0, q1):
+    return np.maximum(q0, q1), np.minimum(q0, q1)
+
+
+def upper_convolve_channels(a, b):
+    """
+    upper_convolve for every row of a, b; output columns are in the same
+    order as upper_convolve produces them.
+    """
+    i, j = np.triu_indices(a.shape[1])
+    ai, aj, bi, bj = a[:, i], a[:, j], b[:, i], b[:, j]
+    q0 = ai * aj + bi * bj
+    q1 = ai * bj + bi * aj
+    diag = i == j
+    q0[:, diag] = (a ** 2 + b ** 2) / 2
+    q1[:, diag] = a * b
+    return _ordered(q0, q1)
+
+
+def lower_convolve_channels(a, b):
+    """
+    lower_convolve for every row of a, b; output columns are in the same
+    order as lower_convolve produces them.
+    """
+    i, j = np.triu_indices(a.shape[1])
+    ai, aj, bi, bj = a[:, i], a[:, j], b[:, i], b[:, j]
+    n, npairs = ai.shape
+    q0 = np.empty((n, 2 * npairs))
+    q1 = np.empty((n, 2 * npairs))
+    q0[:, 0::2], q1[:, 0::2] = _ordered(ai * aj, bi * bj)
+    q0[:, 1::2], q1[:, 1::2] = _ordered(ai * bj, bi * aj)
+    diag = np.flatnonzero(i == j) * 2
+    q0[:, diag], q1[:, diag] = _ordered((a ** 2) / 2, (b ** 2) / 2)
+    return q0, q1
+
+
+def merge_equal_lrs(q0, q1, total):
+    """
+    merge_lr_based followed by normalize_q for every row: columns with
+    equal likelihood ratios are merged, the result is sorted by
+    likelihood ratio and rescaled so that each row sums to total again.
+    Columns without any probability mass are dropped.
+
+    Returns (a, b, counts) where the rows of a and b are padded with
+    zeros and counts holds the number of valid columns per row.
+    """
+    n, ncols = q0.shape
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lrs = q0 / q1
+    lrs[(q0 + q1) == 0] = np.nan  # sorted last, never equal to anything
+    order = np.argsort(lrs, axis=1, kind="stable")
+    rows = np.arange(n)[:, np.newaxis]
+    lrs = lrs[rows, order]
+    q0 = q0[rows, order]
+    q1 = q1[rows, order]
+
+    starts = np.ones((n, ncols), dtype=bool)
+    starts[:, 1:] = lrs[:, 1:] != lrs[:, :-1]
+    flat_starts = np.flatnonzero(starts)
+    sum0 = np.add.reduceat(q0.ravel(), flat_starts)
+    sum1 = np.add.reduceat(q1.ravel(), flat_starts)
+
+    valid = starts & ~np.isnan(lrs)
+    counts = np.sum(valid, axis=1)
+    group = np.cumsum(starts, axis=1) - 1
+    keep = valid.ravel()[flat_starts]
+    out_rows = np.repeat(np.arange(n), np.sum(starts, axis=1))[keep]
+    out_cols = group.ravel()[flat_starts][keep]
+
+    width = max(int(np.max(counts)), 1) if n else 1
+    a = np.zeros((n, width))
+    b = np.zeros((n, width))
+    a[out_rows, out_cols] = sum0[keep]
+    b[out_rows, out_cols] = sum1[keep]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = total / (np.sum(a, axis=1) + np.sum(b, axis=1))
+    factor[~np.isfinite(factor)] = 0.0
+    return a * factor[:, np.newaxis], b * factor[:, np.newaxis], counts
+
+
+def _xlog2x(x, scale=1.0):
+    # x * log2(x * scale), continued with 0 at x = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(x > 0, x * np.log2(x * scale), 0.0)
+
+
+def _capacity_delta(a, b, at, bt):
+    # capacity_delta_callable, but without NaNs for empty columns
+    def c(a, b):
+        return -1.0 * _xlog2x(a + b, 0.5) + _xlog2x(a) + _xlog2x(b)
+    return c(a, b) + c(at, bt) - c(a + at, b + bt)
+
+
+def quantize_channels(a, b, counts, mu):
+    """
+    quantize_to_size for every row of a, b: greedily merge the pair of
+    neighbouring columns that loses the least capacity until mu columns
+    are left. Rows with counts[i] <= mu are left alone. Returns (a, b),
+    each with exactly mu columns (padded with zeros if needed).
+
+    All rows are merged in lock-step. Merged-away columns are unlinked
+    from a doubly linked list of neighbours rather than deleted, so each
+    step only touches a handful of elements per row besides the argmin.
+    """
+    n, width = a.shape
+    a = a.copy()
+    b = b.copy()
+    nsteps = np.maximum(counts - mu, 0)
+    if width > 1:
+        delta = _capacity_delta(a[:, :-1], b[:, :-1], a[:, 1:], b[:, 1:])
+        cols = np.arange(width - 1)
+        delta[cols[np.newaxis, :] >= (counts[:, np.newaxis] - 1)] = np.inf
+    else:
+        delta = np.full((n, 0), np.inf)
+    nxt = np.tile(np.arange(1, width + 1), (n, 1))
+    prv = np.tile(np.arange(-1, width - 1), (n, 1))
+    alive = np.arange(width)[np.newaxis, :] < counts[:, np.newaxis]
+
+    for step in range(int(np.max(nsteps)) if n else 0):
+        rows = np.flatnonzero(nsteps > step)
+        d = np.argmin(delta[rows], axis=1)
+        nx = nxt[rows, d]
+        p = prv[rows, d]
+        a[rows, nx] = a[rows, d] + a[rows, nx]
+        b[rows, nx] = b[rows, d] + b[rows, nx]
+        alive[rows, d] = False
+        delta[rows, d] = np.inf
+
+        has_prev = p >= 0
+        rp, pp, nxp = rows[has_prev], p[has_prev], nx[has_prev]
+        delta[rp, pp] = _capacity_delta(a[rp, pp], b[rp, pp],
+                                        a[rp, nxp], b[rp, nxp])
+        nxt[rp, pp] = nxp
+        prv[rows, nx] = p
+
+        nn = nxt[rows, nx]
+        has_next = nn < counts[rows]
+        rn, nxn, nnn = rows[has_next], nx[has_next], nn[has_next]
+        delta[rn, nxn] = _capacity_delta(a[rn, nxn], b[rn, nxn],
+                                         a[rn, nnn], b[rn, nnn])
+
+    # Compact the surviving columns of every row to the front
+    order = np.argsort(~alive, axis=1, kind="stable")[:, :mu]
+    rows = np.arange(n)[:, np.newaxis]
+    keep = alive[rows, order]
+    a_out = np.zeros((n, mu))
+    b_out = np.zeros((n, mu))
+    a_out[:, :order.shape[1]] = np.where(keep, a[rows, order], 0.0)
+    b_out[:, :order.shape[1]] = np.where(keep, b[rows, order], 0.0)
+    return a_out, b_out
+
+
 def merge_lr_based(q, mu):
     lrs = q[0] / q[1]
     vals, indices, inv_indices = np.unique(
@@ -185,9 +393,7 @@ def merge_lr_based(q, mu):
         return q
     for i in range(len(indices)):
         merge_pos = np.where(inv_indices == i)[0]
-        sum_items = q[:, merge_pos]
-        if merge_pos.size > 1:
-            sum_items = np.sum(q[:, merge_pos], axis=1)
+        sum_items = np.sum(q[:, merge_pos], axis=1)
         temp[0, i] = sum_items[0]
         temp[1, i] = sum_items[1]
     return temp
@@ -198,7 +404,7 @@ def upper_convolve(tpm, mu):
     idx = -1
     for i in range(mu):
         idx += 1
-        q[0, idx] = (tpm[0 / i] ** 2 + tpm[1, i] ** 2, 2)
+        q[0, idx] = (tpm[0, i] ** 2 + tpm[1, i] ** 2) / 2
         q[1, idx] = tpm[0, i] * tpm[1, i]
         for j in range(i + 1, mu):
             idx += 1
@@ -219,8 +425,8 @@ def lower_convolve(tpm, mu):
     idx = -1
     for i in range(0, mu):
         idx += 1
-        q[0, idx] = (tpm[0 / i] ** 2, 2)
-        q[1, idx] = (tpm[1 / i] ** 2, 2)
+        q[0, idx] = (tpm[0, i] ** 2) / 2
+        q[1, idx] = (tpm[1, i] ** 2) / 2
         if q[0, idx] < q[1, idx]:
             q[0, idx], q[1, idx] = swap_values(q[0, idx], q[1, idx])
         idx += 1
@@ -12,7 +12,6 @@ from .common import PolarCommon
 
 # for dev
 from .encoder import PolarEncoder
-from matplotlib import pyplot as plt
 
 
 class PolarDecoder(PolarCommon):
@@ -25,6 +24,12 @@ class PolarDecoder(PolarCommon):
                     self.error_probability / (1 - self.error_probability))
         self.llrs = np.log(self.lrs)
 
+        # frozen bit value per position, -1 for information bits
+        self._frozen_values = np.full(self.N, -1, dtype=np.int8)
+        self._frozen_values[self.frozen_bit_position] = self.frozenbits
+        self._info_bit_count = np.concatenate(
+            ((0,), np.cumsum(self._frozen_values < 0)))
+
     def _llr_bit(self, bit):
         return self.llrs[bit]
 
@@ -138,7 +143,7 @@ class PolarDecoder(PolarCommon):
         return graph, u
 
     def _lr_sc_decoder_efficient(self, y):
-        graph = np.full((self.N, self.power + 1), np.NaN, dtype=float)
+        graph = np.full((self.N, self.power + 1), np.nan, dtype=float)
         for i in range(self.N):
             graph[i][self.power] = self._llr_bit(y[i])
         decode_order = self._vector_bit_reversed(np.arange(self.N), self.power)
@@ -184,18 +189,94 @@ class PolarDecoder(PolarCommon):
         graph[bf_entry_row][stage] = self._llr_odd(la, lb)
         return graph
 
+    def _transform_frames(self, u):
+        # polar transform of each row without bit reversal, i.e. the partial
+        # sums a subtree of the SC decoder feeds back.
+        x = u.copy()
+        n = x.shape[1]
+        step = n // 2
+        while step > 0:
+            x = x.reshape((x.shape[0], -1, 2, step))
+            x[:, :, 0] ^= x[:, :, 1]
+            step //= 2
+        return x.reshape((-1, n))
+
+    def _sc_node(self, llrs, offset, u):
+        # one subtree of the SC decoder. llrs holds one row per frame for the
+        # subtree's bits offset...offset + n. Decoded bits go to u, the
+        # subtree's partial sums are returned.
+        n = llrs.shape[1]
+        if self._info_bit_count[offset + n] == self._info_bit_count[offset]:
+            bits = np.broadcast_to(
+                self._frozen_values[offset:offset + n], llrs.shape)
+            u[:, offset:offset + n] = bits
+            return self._transform_frames(bits)
+        if n == 1:
+            u[:, offset] = llrs[:, 0] < 0.0
+            return u[:, offset:offset + 1]
+
+        half = n // 2
+        la = llrs[:, :half]
+        lb = llrs[:, half:]
+        upper = self._sc_node(self._llr_odd(la, lb), offset, u)
+        # _llr_even vectorized, the last decoded bits select the sign of la
+        lower = self._sc_node(np.where(upper, -la, la) + lb, offset + half, u)
+        return np.concatenate((upper ^ lower, lower), axis=1)
+
+    def _sc_decoder_vectorized(self, llrs):
+        # SC decoder working on a (frames, N) LLR matrix. Stage by stage, all
+        # frames are updated at once with the same min-sum f/g functions as
+        # the per bit decoders, so the results are bit-exact with these.
+        llrs = np.asarray(llrs, dtype=float)
+        if llrs.ndim != 2 or llrs.shape[1] != self.N:
+            raise ValueError(
+                "LLRs must have the shape (frames, {0})!".format(self.N))
+        u = np.empty(llrs.shape, dtype=np.int8)
+        # the encoder bit-reverses before the butterflies, undo on the LLRs.
+        self._sc_node(llrs[:, self.bit_reverse_positions], 0, u)
+        return u.astype(int)
+
     def decode(self, data, is_packed=False):
         if not len(data) == self.N:
             raise ValueError(
                 "len(data)={0} is not equal to n={1}!".format(len(data), self.N))
         if is_packed:
             data = np.unpackbits(data)
-        data = self._lr_sc_decoder_efficient(data)
+        data = self._sc_decoder_vectorized(self.llrs[np.newaxis, data])[0]
         data = self._extract_info_bits(data)
         if is_packed:
             data = np.packbits(data)
         return data
 
+    def decode_batch(self, data, is_packed=False):
+        """
+        Decode a 2-D array of hard decision frames, one frame per row.
+
+        Returns the information bits with one row per frame.
+        """
+        data = np.asarray(data)
+        if is_packed:
+            data = np.unpackbits(data, axis=-1)
+        if not data.ndim == 2 or not data.shape[1] == self.N:
+            raise ValueError(
+                "data.shape={0} is not (frames, n={1})!".format(data.shape, self.N))
+        data = self._sc_decoder_vectorized(self.llrs[data])
+        data = data[:, self.info_bit_position]
+        if is_packed:
+            data = np.packbits(data, axis=-1)
+        return data
+
+    def decode_llrs(self, llrs):
+        """
+        Decode soft input, a frame or a 2-D array of frames (one per row) of
+        LLRs. Positive values favor a 0 bit.
+        """
+        llrs = np.asarray(llrs, dtype=float)
+        if llrs.ndim == 1:
+            return self.decode_llrs(llrs[np.newaxis])[0]
+        data = self._sc_decoder_vectorized(llrs)
+        return data[:, self.info_bit_position]
+
     def _extract_info_bits_reversed(self, y):
         info_bit_positions_reversed = self._vector_bit_reversed(
             self.info_bit_position, self.power)
@@ -206,7 +287,7 @@ class PolarDecoder(PolarCommon):
             raise ValueError(
                 "len(data)={0} is not equal to n={1}!".format(len(data), self.N))
         # data = self._reverse_bits(data)
-        data = self._lr_sc_decoder_efficient(data)
+        data = self._sc_decoder_vectorized(self.llrs[np.newaxis, data])[0]
         data = self._encode_natural_order(data)
         data = self._extract_info_bits_reversed(data)
         return data
@@ -242,7 +323,7 @@ def test_reverse_enc_dec():
     print((bits == rx).all())
 
 
-def compare_decoder_impls():
+def compare_decoder_impls(ntests=100):
     print('\nthis is decoder test')
     n = 8
     k = 4
@@ -257,9 +338,22 @@ def compare_decoder_impls():
     print('encoded:', encoded)
     rx_st = decoder._lr_sc_decoder(encoded)
     rx_eff = decoder._lr_sc_decoder_efficient(encoded)
-    print('standard :', rx_st)
-    print('efficient:', rx_eff)
-    print((rx_st == rx_eff).all())
+    rx_vec = decoder._sc_decoder_vectorized(decoder.llrs[np.newaxis, encoded])[0]
+    print('standard  :', rx_st)
+    print('efficient :', rx_eff)
+    print('vectorized:', rx_vec)
+    print((rx_st == rx_eff).all() and (rx_eff == rx_vec).all())
+
+    # now with channel errors, all frames of a batch at once.
+    tx = np.array([encoder.encode(np.random.randint(2, size=k))
+                   for i in range(ntests)])
+    rx = tx ^ (np.random.uniform(size=tx.shape) < 0.1)
+    rx_eff = np.array([decoder._lr_sc_decoder_efficient(frame)
+                       for frame in rx])
+    rx_vec = decoder._sc_decoder_vectorized(decoder.llrs[rx])
+    print('bit-exact on {0} noisy frames: {1}'.format(
+        ntests, (rx_eff == rx_vec).all()))
+    return (rx_eff == rx_vec).all()
 
 
 def main():
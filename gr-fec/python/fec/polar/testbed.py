@@ -99,16 +99,18 @@ def test_1024_rate_1_code():
 
     channel_counter = np.zeros(k)
     possible_indices = np.arange(n, dtype=int)
+    bits = np.random.randint(2, size=(ntests, k))
+    rx = np.empty((ntests, n), dtype=int)
     for i in range(ntests):
-        bits = np.random.randint(2, size=k)
-        tx = encoder.encode(bits)
+        tx = encoder.encode(bits[i])
         np.random.shuffle(possible_indices)
         tx[possible_indices[0:num_transitions]] = (
             tx[possible_indices[0:num_transitions]] + 1
         ) % 2
-        rx = tx
-        recv = decoder.decode(rx)
-        channel_counter += bits == recv
+        rx[i] = tx
+    # decode all frames at once
+    recv = decoder.decode_batch(rx)
+    channel_counter += np.sum(bits == recv, axis=0)
 
     print(channel_counter)
     print(np.min(channel_counter), np.max(channel_counter))
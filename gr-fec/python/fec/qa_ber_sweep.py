@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import math
+
+import numpy
+
+from gnuradio import gr_unittest
+from gnuradio.fec.ber_sweep import ber_point, ber_sweep, ber_curve
+
+
+def uncoded_bpsk_runner(point, nbits, seed):
+    # numpy stand-in for a fec_test flowgraph without coding
+    rng = numpy.random.RandomState(seed)
+    sigma = math.sqrt((10.0 ** (-point.esno / 10.0)) / 2.0)
+    rx = 1.0 + sigma * rng.standard_normal(nbits)
+    return nbits, int(numpy.count_nonzero(rx < 0.0))
+
+
+def uncoded_bpsk_ber(esno):
+    return 0.5 * math.erfc(math.sqrt(10.0 ** (esno / 10.0)))
+
+
+def failing_runner(point, nbits, seed):
+    raise ValueError("decoder exploded")
+
+
+class test_ber_sweep(gr_unittest.TestCase):
+
+    def make_points(self, esnos):
+        return [ber_point(esno, None, None) for esno in esnos]
+
+    def test_001_early_stopping(self):
+        points = self.make_points((0.0, 4.0, 8.0))
+        updates = list(ber_sweep(points, processes=0, chunk_bits=20000,
+                                 target_errors=200, max_bits=200000,
+                                 runner=uncoded_bpsk_runner))
+        final = [s for s in updates if s.done]
+        self.assertEqual([s.index for s in final], [0, 1, 2])
+        self.assertEqual([s.stop_reason for s in final],
+                         ['errors', 'errors', 'max_bits'])
+        # 0 dB has plenty of errors in the first chunk
+        self.assertEqual(final[0].chunks, 1)
+        self.assertEqual(final[2].bits, 200000)
+        # streamed snapshots are not updated afterwards
+        self.assertEqual(updates[1].chunks, 1)
+        for s in final[:2]:
+            low, high = s.confidence_interval()
+            self.assertTrue(low < uncoded_bpsk_ber(s.point.esno) < high)
+            self.assertGreater(s.throughput, 0)
+
+    def test_002_confidence_stop(self):
+        result = ber_curve(self.make_points((2.0,)), processes=0,
+                           chunk_bits=10000, target_errors=None,
+                           rel_precision=0.1, runner=uncoded_bpsk_runner)[0]
+        self.assertEqual(result.stop_reason, 'confidence')
+        low, high = result.confidence_interval()
+        self.assertLessEqual((high - low) / 2, 0.1 * result.ber)
+
+    def test_003_process_pool(self):
+        esnos = (0.0, 2.0, 4.0, 6.0)
+        results = ber_curve(self.make_points(esnos), processes=2,
+                            chunk_bits=50000, target_errors=100,
+                            max_bits=10 ** 6, runner=uncoded_bpsk_runner)
+        self.assertEqual([r.point.esno for r in results], list(esnos))
+        bers = [r.ber for r in results]
+        self.assertEqual(bers, sorted(bers, reverse=True))
+        for r in results:
+            self.assertTrue(r.done)
+            self.assertTrue(r.errors >= 100 or r.bits >= 10 ** 6)
+
+        with self.assertRaises(ValueError):
+            ber_curve(self.make_points(esnos), processes=2,
+                      runner=failing_runner)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(test_ber_sweep)
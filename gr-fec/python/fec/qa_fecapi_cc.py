@@ -191,6 +191,57 @@ class test_fecapi_cc(gr_unittest.TestCase):
 
         self.assertEqual(data_in, data_out)
 
+    def test_parallelism1_06(self):
+        frame_size = 30
+        k = 7
+        rate = 2
+        polys = [109, 79]
+        mode = fec.CC_TAILBITING
+        enc = list(map((lambda a: fec.cc_encoder_make(
+            frame_size * 8, k, rate, polys, mode=mode)), list(range(0, 4))))
+        dec = list(map((lambda a: fec.cc_decoder.make(
+            frame_size * 8, k, rate, polys, mode=mode)), list(range(0, 4))))
+        threading = 'balanced'
+        self.test = _qa_helper(4 * frame_size, enc, dec, threading)
+        self.tb.connect(self.test)
+        self.tb.run()
+
+        data_out = self.test.snk_output.data()
+        data_in = self.test.snk_input.data()
+
+        # the input is a whole number of frames, every one comes out
+        self.assertEqual(len(data_in) % (frame_size * 8), 0)
+        self.assertEqual(data_in, data_out)
+
+    def test_parallelism1_07(self):
+        # any number of decoders, not just powers of two
+        frame_size = 30
+        k = 7
+        rate = 2
+        polys = [109, 79]
+        mode = fec.CC_TAILBITING
+        enc = list(map((lambda a: fec.cc_encoder_make(
+            frame_size * 8, k, rate, polys, mode=mode)), list(range(0, 3))))
+        dec = list(map((lambda a: fec.cc_decoder.make(
+            frame_size * 8, k, rate, polys, mode=mode)), list(range(0, 3))))
+        threading = 'balanced'
+        self.test = _qa_helper(5 * frame_size, enc, dec, threading)
+        self.tb.connect(self.test)
+        self.tb.run()
+
+        data_out = self.test.snk_output.data()
+        data_in = self.test.snk_input.data()
+
+        # the input is a whole number of frames, every one comes out
+        self.assertEqual(len(data_in) % (frame_size * 8), 0)
+        self.assertEqual(data_in, data_out)
+        balanced = [b for b in self.test.ext_decoder.blocks
+                    if isinstance(b, fec.balanced_threaded_decoder)]
+        stats = balanced[0].worker_stats()
+        self.assertEqual(len(stats), 3)
+        self.assertEqual(sum(s['frames'] for s in stats),
+                         len(data_out) // (frame_size * 8))
+
 
 if __name__ == '__main__':
     gr_unittest.run(test_fecapi_cc)
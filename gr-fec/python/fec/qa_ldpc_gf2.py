@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import os
+import tempfile
+
+import numpy as np
+
+from gnuradio import gr_unittest
+from gnuradio.fec import LDPC
+from gnuradio.fec.LDPC.gf2 import GF2Matrix, gf2_inv, gf2_rank
+
+
+class test_ldpc_gf2(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(7)
+
+    def random_matrix(self, shape, density=0.5):
+        return (self.rng.uniform(size=shape) < density).astype(int)
+
+    def test_001_pack_roundtrip(self):
+        for shape in ((1, 1), (3, 64), (5, 65), (7, 200)):
+            a = self.random_matrix(shape)
+            m = GF2Matrix.from_dense(a)
+            self.assertEqual(m.shape, shape)
+            self.assertTrue((m.to_dense() == a).all())
+            self.assertTrue((m.column(shape[1] - 1) == a[:, -1]).all())
+            self.assertTrue((m.transpose().to_dense() == a.T).all())
+
+    def test_002_rank_and_inverse(self):
+        for n in (1, 16, 64, 100):
+            a = self.random_matrix((n, n))
+            try:
+                inv = gf2_inv(a)
+            except np.linalg.LinAlgError:
+                self.assertLess(gf2_rank(a), n)
+            else:
+                self.assertEqual(gf2_rank(a), n)
+                self.assertTrue((a.dot(inv) % 2 == np.eye(n)).all())
+
+        # duplicated and summed rows do not add to the rank
+        a = self.random_matrix((20, 90))
+        a = np.vstack((a, a[:3], (a[3] + a[4]) % 2))
+        self.assertEqual(gf2_rank(a), gf2_rank(a[:20]))
+        self.assertRaises(np.linalg.LinAlgError, gf2_inv, a[:20, :20] * 0)
+        self.assertRaises(np.linalg.LinAlgError, LDPC.inv_mod2,
+                          np.ones((2, 2)))
+
+    def test_003_systematic_generator(self):
+        np.random.seed(3)
+        H = LDPC.LDPC_matrix(n_p_q=[60, 3, 5]).H
+        H = LDPC.get_full_rank_H_matrix(H)
+        self.assertEqual(gf2_rank(H), H.shape[0])
+
+        G = LDPC.getSystematicGmatrixFromH(H)
+        k = G.shape[0]
+        self.assertTrue((G[:, :k] == np.eye(k)).all())
+        # The codewords are orthogonal to the reduced H = [I | m], with
+        # its columns rotated to [m | I] like G
+        reduced = LDPC.getSystematicGmatrix(H)
+        r = reduced.shape[0]
+        self.assertEqual(r + k, H.shape[1])
+        self.assertTrue((G.dot(np.hstack(
+            (reduced[:, r:], reduced[:, :r])).T) % 2 == 0).all())
+
+    def test_004_alist_roundtrip(self):
+        H = self.random_matrix((12, 30), 0.2)
+        H[3] = 0
+        fd, filename = tempfile.mkstemp(suffix='.alist')
+        os.close(fd)
+        try:
+            LDPC.write_alist_file(filename, H)
+            self.assertTrue((LDPC.read_alist_file(filename) == H).all())
+            with open(filename) as f:
+                lines = f.readlines()
+            self.assertEqual(lines[0].split(), ['30', '12'])
+            self.assertEqual(lines[4].split(), [
+                str(i + 1) for i in np.flatnonzero(H[:, 0])])
+
+            packed = filename + '.packed'
+            LDPC.write_alist_file(packed, GF2Matrix.from_dense(H))
+            with open(packed) as f:
+                self.assertEqual(f.readlines(), lines)
+            os.remove(packed)
+        finally:
+            os.remove(filename)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(test_ldpc_gf2)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from gnuradio import gr_unittest
+from gnuradio.fec.polar import channel_construction as cc
+
+try:
+    from gnuradio.fec.polar import channel_construction_awgn as awgn
+except ImportError:
+    awgn = None  # SciPy missing
+
+
+def quiet(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+class test_polar_channel_construction(gr_unittest.TestCase):
+
+    @unittest.skipIf(awgn is None, "SciPy not available")
+    def test_001_polarize_matches_scalar(self):
+        mu = 8
+        tpm = awgn.discretize_awgn(mu, 0.5) * 2
+        rng = np.random.RandomState(42)
+        channels = [tpm] + [tpm * rng.uniform(0.5, 1.5, tpm.shape)
+                            for _ in range(5)]
+        a = np.array([c[0] for c in channels])
+        b = np.array([c[1] for c in channels])
+
+        upper, lower = awgn.polarize_channels(a, b, mu)
+        for i, c in enumerate(channels):
+            ref_upper = awgn.quantize_to_size(awgn.upper_convolve(c, mu), mu)
+            ref_lower = awgn.quantize_to_size(awgn.lower_convolve(c, mu), mu)
+            self.assertFloatTuplesAlmostEqual(
+                np.concatenate(ref_upper), np.concatenate(
+                    (upper[0][i], upper[1][i])), 12)
+            self.assertFloatTuplesAlmostEqual(
+                np.concatenate(ref_lower), np.concatenate(
+                    (lower[0][i], lower[1][i])), 12)
+
+    @unittest.skipIf(awgn is None, "SciPy not available")
+    def test_002_tal_vardy(self):
+        block_size = 256
+        z = quiet(awgn.tal_vardy_tpm_algorithm, block_size, 0.0, 16)
+        self.assertEqual(z.shape, (block_size,))
+        self.assertTrue(np.all((z >= 0) & (z <= 1)))
+        # Never worse than the Bhattacharyya bounds
+        bounds = cc.bhattacharyya_bounds(0.0, block_size)
+        self.assertTrue(np.all(z <= bounds))
+        # The pool splits the last levels, results are the same
+        z_pool = quiet(awgn.tal_vardy_tpm_algorithm, block_size, 0.0, 16,
+                       processes=2)
+        self.assertFloatTuplesAlmostEqual(z, z_pool, 12)
+
+    def test_003_cache_index(self):
+        cache_dir = tempfile.mkdtemp() + os.sep
+        try:
+            with mock.patch.object(cc, "default_dir", lambda: cache_dir):
+                z = quiet(cc.load_z_parameters, 32, 1.0, 8)
+                cc.save_z_parameters(z + 1, 32, 2.0, 8)
+                cc.save_z_parameters(z + 2, 64, 1.1, 8)
+                with open(os.path.join(cache_dir, "unrelated.txt"), "w"):
+                    pass
+
+                index = cc.z_parameters_index()
+                self.assertEqual([entry[:3] for entry in index],
+                                 [(32, 1.0, 8), (32, 2.0, 8), (64, 1.1, 8)])
+
+                # Nearest design SNR within the tolerance is reused
+                self.assertFloatTuplesAlmostEqual(
+                    cc.load_z_parameters(32, 1.8, 8, snr_tolerance=0.5),
+                    z + 1, 12)
+                self.assertFloatTuplesAlmostEqual(
+                    cc.load_z_parameters(32, 1.4, 8, snr_tolerance=0.5),
+                    z, 12)
+                # Otherwise a new construction gets cached
+                quiet(cc.load_z_parameters, 32, 3.0, 8, snr_tolerance=0.5)
+                self.assertEqual(len(cc.z_parameters_index()), 4)
+        finally:
+            shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(test_polar_channel_construction)
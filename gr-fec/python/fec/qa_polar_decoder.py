@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import numpy as np
+
+from gnuradio import gr_unittest
+from gnuradio.fec.polar.encoder import PolarEncoder
+from gnuradio.fec.polar.decoder import PolarDecoder
+from gnuradio.fec.polar import channel_construction as cc
+
+
+class test_polar_decoder(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(42)
+
+    def make_code(self, block_size, num_info_bits, random_frozen=False):
+        frozen_bit_positions = cc.get_frozen_bit_indices_from_z_parameters(
+            cc.bhattacharyya_bounds(0.0, block_size),
+            block_size - num_info_bits)
+        frozen_bit_values = np.zeros(block_size - num_info_bits, dtype=int)
+        if random_frozen:
+            frozen_bit_values = self.rng.randint(
+                2, size=block_size - num_info_bits)
+        encoder = PolarEncoder(block_size, num_info_bits,
+                               frozen_bit_positions, frozen_bit_values)
+        decoder = PolarDecoder(block_size, num_info_bits,
+                               frozen_bit_positions, frozen_bit_values)
+        return encoder, decoder
+
+    def encode_frames(self, encoder, num_frames):
+        bits = self.rng.randint(2, size=(num_frames, encoder.K))
+        return bits, np.array([encoder.encode(b) for b in bits])
+
+    def test_001_batch_matches_reference(self):
+        for block_size, num_info_bits in ((8, 4), (32, 12), (128, 64)):
+            for random_frozen in (False, True):
+                encoder, decoder = self.make_code(
+                    block_size, num_info_bits, random_frozen)
+                bits, tx = self.encode_frames(encoder, 20)
+                rx = tx ^ (self.rng.uniform(size=tx.shape) < 0.08)
+
+                ref = np.array([decoder._lr_sc_decoder_efficient(frame)
+                                for frame in rx])
+                self.assertTrue(
+                    (decoder._sc_decoder_vectorized(decoder.llrs[rx]) == ref).all())
+                self.assertTrue((decoder.decode_batch(tx) == bits).all())
+
+    def test_002_decode_interfaces(self):
+        encoder, decoder = self.make_code(64, 32)
+        bits, tx = self.encode_frames(encoder, 4)
+        self.assertTrue((decoder.decode(tx[0]) == bits[0]).all())
+        self.assertTrue((decoder.decode_llrs(2.0 - 4.0 * tx) == bits).all())
+        self.assertTrue((decoder.decode_llrs(2.0 - 4.0 * tx[1]) == bits[1]).all())
+
+        packed = decoder.decode_batch(np.packbits(tx, axis=1), is_packed=True)
+        self.assertTrue((packed == np.packbits(bits, axis=1)).all())
+        self.assertRaises(ValueError, decoder.decode_batch, tx[:, :32])
+
+    def test_003_systematic(self):
+        encoder, decoder = self.make_code(64, 32)
+        for i in range(10):
+            bits = self.rng.randint(2, size=32)
+            y = encoder.encode_systematic(bits)
+            self.assertTrue((decoder.decode_systematic(y) == bits).all())
+
+
+if __name__ == '__main__':
+    gr_unittest.run(test_polar_decoder)
@@ -25,6 +25,7 @@ from .filterbank import *
 from .freq_xlating_fft_filter import *
 from . import pfb
 from . import optfir
+from . import tap_cache
 
 # Pull this into the filter module
 from .file_taps_loader import file_taps_loader
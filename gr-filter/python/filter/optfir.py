@@ -19,10 +19,12 @@ and Barrie W. Jervis, Adison-Wesley, 1993.  ISBN 0-201-54413-X.
 import math
 import cmath
 from . import filter_python as filter
+from .tap_cache import cached_taps
 
 # ----------------------------------------------------------------
 
 
+@cached_taps('optfir.low_pass')
 def low_pass(gain, Fs, freq1, freq2, passband_ripple_db, stopband_atten_db,
              nextra_taps=2):
     """
@@ -47,6 +49,7 @@ def low_pass(gain, Fs, freq1, freq2, passband_ripple_db, stopband_atten_db,
     return taps
 
 
+@cached_taps('optfir.band_pass')
 def band_pass(gain, Fs, freq_sb1, freq_pb1, freq_pb2, freq_sb2,
               passband_ripple_db, stopband_atten_db,
               nextra_taps=2):
@@ -76,6 +79,7 @@ def band_pass(gain, Fs, freq_sb1, freq_pb1, freq_pb2, freq_sb2,
     return taps
 
 
+@cached_taps('optfir.complex_band_pass')
 def complex_band_pass(gain, Fs, freq_sb1, freq_pb1, freq_pb2, freq_sb2,
                       passband_ripple_db, stopband_atten_db,
                       nextra_taps=2):
@@ -105,6 +109,7 @@ def complex_band_pass(gain, Fs, freq_sb1, freq_pb1, freq_pb2, freq_sb2,
     return taps
 
 
+@cached_taps('optfir.complex_band_reject')
 def complex_band_reject(gain, Fs, freq_pb1, freq_sb1, freq_sb2, freq_pb2,
                         passband_ripple_db, stopband_atten_db,
                         nextra_taps=2):
@@ -134,6 +139,7 @@ def complex_band_reject(gain, Fs, freq_pb1, freq_sb1, freq_sb2, freq_pb2,
     return taps
 
 
+@cached_taps('optfir.band_reject')
 def band_reject(gain, Fs, freq_pb1, freq_sb1, freq_sb2, freq_pb2,
                 passband_ripple_db, stopband_atten_db,
                 nextra_taps=2):
@@ -167,6 +173,7 @@ def band_reject(gain, Fs, freq_pb1, freq_sb1, freq_sb2, freq_pb2,
     return taps
 
 
+@cached_taps('optfir.high_pass')
 def high_pass(gain, Fs, freq1, freq2, passband_ripple_db, stopband_atten_db,
               nextra_taps=2):
     """
@@ -195,6 +202,50 @@ def high_pass(gain, Fs, freq1, freq2, passband_ripple_db, stopband_atten_db,
     taps = filter.pm_remez(n + nextra_taps, fo, ao, w, "bandpass")
     return taps
 
+
+def search_ripple(design, start=0.1, stop=1.0, step=0.01):
+    """
+    Finds the smallest pass band ripple on the grid start, start+step, ...
+    (below stop) for which design(ripple) converges, by bisection: a design
+    that converges keeps converging as the ripple grows.
+
+    Args:
+        design: function of the ripple in dB returning taps, raising
+                RuntimeError when the design does not converge
+        start: ripple to try first (in dB)
+        stop: ripple the search gives up at (in dB)
+        step: resolution of the search (in dB)
+
+    Returns (taps, ripple); raises RuntimeError when no ripple works.
+    """
+    npoints = max(1, int(math.ceil((stop - start) / step - 1e-9)))
+
+    def ripple(k):
+        return round(start + k * step, 10)
+
+    def attempt(k):
+        try:
+            return design(ripple(k))
+        except RuntimeError:
+            return None
+
+    taps = attempt(0)
+    if taps is not None:
+        return taps, ripple(0)
+    good, good_taps = npoints - 1, attempt(npoints - 1)
+    if npoints == 1 or good_taps is None:
+        raise RuntimeError("optfir could not generate an appropriate filter.")
+    bad = 0
+    while good - bad > 1:
+        mid = (bad + good) // 2
+        taps = attempt(mid)
+        if taps is None:
+            bad = mid
+        else:
+            good, good_taps = mid, taps
+    return good_taps, ripple(good)
+
+
 # ----------------------------------------------------------------
 
 
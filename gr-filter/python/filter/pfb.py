@@ -15,6 +15,18 @@ from gnuradio import gr, fft, blocks
 
 from . import optfir
 from . import filter_python as filter, fft
+from .tap_cache import cached_taps
+
+
+def _low_pass_taps(gain, nfilts, bw, tb, atten, ripple):
+    # optfir.low_pass with the smallest ripple from ripple on that converges.
+    # Only the final design is cached, by the create_taps calling this.
+    taps, used = optfir.search_ripple(
+        lambda r: optfir.low_pass.uncached(gain, nfilts, bw, bw + tb, r,
+                                           atten), ripple)
+    if used != ripple:
+        print("Warning: set ripple to %.4f dB. If this is a problem, adjust the attenuation or create your own filter taps." % (used))
+    return taps
 
 
 class channelizer_ccf(gr.hier_block2):
@@ -61,23 +73,12 @@ class channelizer_ccf(gr.hier_block2):
         self.pfb.declare_sample_delay(delay)
 
     @staticmethod
+    @cached_taps('pfb.channelizer_ccf')
     def create_taps(numchans, atten=100):
         # Create a filter that covers the full bandwidth of the input signal
         bw = 0.4
         tb = 0.2
-        ripple = 0.1
-        while True:
-            try:
-                taps = optfir.low_pass(1, numchans, bw, bw + tb, ripple, atten)
-                return taps
-            except RuntimeError:
-                ripple += 0.01
-                print("Warning: set ripple to %.4f dB. If this is a problem, adjust the attenuation or create your own filter taps." % (ripple))
-
-                # Build in an exit strategy; if we've come this far, it ain't working.
-                if(ripple >= 1.0):
-                    raise RuntimeError(
-                        "optfir could not generate an appropriate filter.")
+        return _low_pass_taps(1, numchans, bw, tb, atten, 0.1)
 
 
 class interpolator_ccf(gr.hier_block2):
@@ -115,24 +116,12 @@ class interpolator_ccf(gr.hier_block2):
         self.pfb.declare_sample_delay(delay)
 
     @staticmethod
+    @cached_taps('pfb.interpolator_ccf')
     def create_taps(interp, atten):
         # Create a filter that covers the full bandwidth of the input signal
         bw = 0.4
         tb = 0.2
-        ripple = 0.99
-        while True:
-            try:
-                taps = optfir.low_pass(
-                    interp, interp, bw, bw + tb, ripple, atten)
-                return taps
-            except RuntimeError:
-                ripple += 0.01
-                print("Warning: set ripple to %.4f dB. If this is a problem, adjust the attenuation or create your own filter taps." % (ripple))
-
-                # Build in an exit strategy; if we've come this far, it ain't working.
-                if(ripple >= 1.0):
-                    raise RuntimeError(
-                        "optfir could not generate an appropriate filter.")
+        return _low_pass_taps(interp, interp, bw, tb, atten, 0.99)
 
 
 class decimator_ccf(gr.hier_block2):
@@ -178,23 +167,12 @@ class decimator_ccf(gr.hier_block2):
         self.pfb.declare_sample_delay(delay)
 
     @staticmethod
+    @cached_taps('pfb.decimator_ccf')
     def create_taps(decim, atten=100):
         # Create a filter that covers the full bandwidth of the input signal
         bw = 0.4
         tb = 0.2
-        ripple = 0.1
-        while True:
-            try:
-                taps = optfir.low_pass(1, decim, bw, bw + tb, ripple, atten)
-                return taps
-            except RuntimeError:
-                ripple += 0.01
-                print("Warning: set ripple to %.4f dB. If this is a problem, adjust the attenuation or create your own filter taps." % (ripple))
-
-                # Build in an exit strategy; if we've come this far, it ain't working.
-                if(ripple >= 1.0):
-                    raise RuntimeError(
-                        "optfir could not generate an appropriate filter.")
+        return _low_pass_taps(1, decim, bw, tb, atten, 0.1)
 
 
 class arb_resampler_ccf(gr.hier_block2):
@@ -239,6 +217,7 @@ class arb_resampler_ccf(gr.hier_block2):
         self.pfb.declare_sample_delay(delay)
 
     @staticmethod
+    @cached_taps('pfb.arb_resampler_ccf')
     def create_taps(rate, flt_size=32, atten=100):
         # Create a filter that covers the full bandwidth of the output signal
 
@@ -252,7 +231,6 @@ class arb_resampler_ccf(gr.hier_block2):
             halfband = 0.5 * rate
             bw = percent * halfband
             tb = (percent / 2.0) * halfband
-            ripple = 0.1
 
             # As we drop the bw factor, the optfir filter has a harder time converging;
             # using the firdes method here for better results.
@@ -262,23 +240,7 @@ class arb_resampler_ccf(gr.hier_block2):
             halfband = 0.5
             bw = percent * halfband
             tb = (percent / 2.0) * halfband
-            ripple = 0.1
-            taps = None
-
-            while True:
-                try:
-                    taps = optfir.low_pass(
-                        flt_size, flt_size, bw, bw + tb, ripple, atten)
-                    return taps
-                except RuntimeError:
-                    ripple += 0.01
-                    print(
-                        "Warning: set ripple to %.4f dB. If this is a problem, adjust the attenuation or create your own filter taps." % (ripple))
-
-                    # Build in an exit strategy; if we've come this far, it ain't working.
-                    if(ripple >= 1.0):
-                        raise RuntimeError(
-                            "optfir could not generate an appropriate filter.")
+            return _low_pass_taps(flt_size, flt_size, bw, tb, atten, 0.1)
 
 
 class arb_resampler_fff(gr.hier_block2):
@@ -323,6 +285,7 @@ class arb_resampler_fff(gr.hier_block2):
         self.pfb.declare_sample_delay(delay)
 
     @staticmethod
+    @cached_taps('pfb.arb_resampler_fff')
     def create_taps(rate, flt_size=32, atten=100):
         # Create a filter that covers the full bandwidth of the input signal
 
@@ -336,7 +299,6 @@ class arb_resampler_fff(gr.hier_block2):
             halfband = 0.5 * rate
             bw = percent * halfband
             tb = (percent / 2.0) * halfband
-            ripple = 0.1
 
             # As we drop the bw factor, the optfir filter has a harder time converging;
             # using the firdes method here for better results.
@@ -346,22 +308,7 @@ class arb_resampler_fff(gr.hier_block2):
             halfband = 0.5
             bw = percent * halfband
             tb = (percent / 2.0) * halfband
-            ripple = 0.1
-
-            while True:
-                try:
-                    taps = optfir.low_pass(
-                        flt_size, flt_size, bw, bw + tb, ripple, atten)
-                    return taps
-                except RuntimeError:
-                    ripple += 0.01
-                    print(
-                        "Warning: set ripple to %.4f dB. If this is a problem, adjust the attenuation or create your own filter taps." % (ripple))
-
-                    # Build in an exit strategy; if we've come this far, it ain't working.
-                    if(ripple >= 1.0):
-                        raise RuntimeError(
-                            "optfir could not generate an appropriate filter.")
+            return _low_pass_taps(flt_size, flt_size, bw, tb, atten, 0.1)
 
 
 class arb_resampler_ccc(gr.hier_block2):
@@ -406,24 +353,12 @@ class arb_resampler_ccc(gr.hier_block2):
         self.pfb.declare_sample_delay(delay)
 
     @staticmethod
+    @cached_taps('pfb.arb_resampler_ccc')
     def create_taps(rate, flt_size=32, atten=100):
         # Create a filter that covers the full bandwidth of the input signal
         bw = 0.4
         tb = 0.2
-        ripple = 0.1
-        while True:
-            try:
-                taps = optfir.low_pass(
-                    flt_size, flt_size, bw, bw + tb, ripple, atten)
-                return taps
-            except RuntimeError:
-                ripple += 0.01
-                print("Warning: set ripple to %.4f dB. If this is a problem, adjust the attenuation or create your own filter taps." % (ripple))
-
-                # Build in an exit strategy; if we've come this far, it ain't working.
-                if(ripple >= 1.0):
-                    raise RuntimeError(
-                        "optfir could not generate an appropriate filter.")
+        return _low_pass_taps(flt_size, flt_size, bw, tb, atten, 0.1)
 
 
 class channelizer_hier_ccf(gr.hier_block2):
@@ -511,5 +446,6 @@ class channelizer_hier_ccf(gr.hier_block2):
             self.connect((self.v2ss, i), (self, i))
 
     @staticmethod
+    @cached_taps('pfb.channelizer_hier_ccf')
     def create_taps(n_chans, atten=100, bw=1.0, tb=0.2, ripple=0.1):
-        return optfir.low_pass(1, n_chans, bw, bw + tb, ripple, atten)
+        return optfir.low_pass.uncached(1, n_chans, bw, bw + tb, ripple, atten)
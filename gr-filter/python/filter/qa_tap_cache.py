@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import shutil
+import tempfile
+
+from gnuradio import gr_unittest
+from gnuradio.filter import optfir, tap_cache
+
+
+class test_tap_cache(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_001_lru(self):
+        cache = tap_cache.tap_cache(maxsize=2)
+        calls = []
+
+        def design(name):
+            calls.append(name)
+            return [1.0, 2.0]
+
+        for name in ("a", "b", "a", "c", "b"):
+            taps = cache.lookup(name, lambda: design(name))
+            self.assertEqual(taps, [1.0, 2.0])
+        # "b" was evicted by "c", "a" was used last before that
+        self.assertEqual(calls, ["a", "b", "c", "b"])
+        self.assertEqual(cache.stats(), {'hits': 1, 'disk_hits': 0,
+                                         'misses': 4, 'size': 2})
+
+    def test_002_disk(self):
+        taps = [0.5, -0.25, 0.125]
+        ctaps = [1 + 2j, -0.5j]
+        cache = tap_cache.tap_cache(directory=self.dir)
+        cache.lookup("real", lambda: taps)
+        cache.lookup("complex", lambda: ctaps)
+
+        # A new process starts with an empty memory cache
+        cache = tap_cache.tap_cache(directory=self.dir)
+        self.assertEqual(cache.lookup("real", lambda: 1 / 0), taps)
+        self.assertEqual(cache.lookup("complex", lambda: 1 / 0), ctaps)
+        self.assertEqual(cache.lookup("real", lambda: 1 / 0), taps)
+        self.assertEqual(cache.stats()['disk_hits'], 2)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+        cache.clear(disk=True)
+        self.assertEqual(cache.lookup("real", lambda: [1.0]), [1.0])
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_003_decorator(self):
+        cache = tap_cache.tap_cache()
+        calls = []
+
+        @tap_cache.cached_taps("test.design", cache)
+        def design(ntaps, gain=1.0):
+            calls.append(ntaps)
+            return [gain] * ntaps
+
+        self.assertEqual(design(3), [1.0] * 3)
+        self.assertEqual(design(3, gain=1.0), [1.0] * 3)
+        self.assertEqual(design(ntaps=3), [1.0] * 3)
+        self.assertEqual(design(3, 2.0), [2.0] * 3)
+        self.assertEqual(calls, [3, 3])
+        # The cache hands out copies
+        design(3).append(0)
+        self.assertEqual(design(3), [1.0] * 3)
+
+    def test_004_search_ripple(self):
+        tried = []
+
+        def design(ripple):
+            tried.append(ripple)
+            if ripple < 0.57:
+                raise RuntimeError("no convergence")
+            return [ripple]
+
+        taps, ripple = optfir.search_ripple(design, 0.1)
+        self.assertAlmostEqual(ripple, 0.57)
+        self.assertEqual(taps, [ripple])
+        self.assertLess(len(tried), 10)
+
+        def never(ripple):
+            raise RuntimeError("no convergence")
+        self.assertRaises(RuntimeError, optfir.search_ripple, never, 0.1)
+        self.assertRaises(RuntimeError, optfir.search_ripple, never, 0.99)
+
+    def test_005_optfir(self):
+        # a private cache, the default one may have a store from
+        # GR_FILTER_TAP_CACHE
+        cache = tap_cache.tap_cache()
+        self.addCleanup(setattr, tap_cache, 'default_cache',
+                        tap_cache.default_cache)
+        tap_cache.default_cache = cache
+        taps = optfir.low_pass(1, 8, 0.4, 0.6, 0.1, 60)
+        again = optfir.low_pass(1, 8, 0.4, 0.6, 0.1, 60, nextra_taps=2)
+        self.assertFloatTuplesAlmostEqual(taps, again)
+        self.assertFloatTuplesAlmostEqual(
+            taps, optfir.low_pass.uncached(1, 8, 0.4, 0.6, 0.1, 60))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+
+if __name__ == '__main__':
+    gr_unittest.run(test_tap_cache)
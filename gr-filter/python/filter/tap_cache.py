@@ -0,0 +1,198 @@
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+'''
+Memoization of filter tap designs.
+
+Designing taps (optfir's Remez designs in particular) can take seconds for
+large filters, and the same designs are repeated every time a flowgraph is
+built. The designs in optfir and pfb go through a tap_cache keyed by the
+design function and its arguments: an in-process LRU and, optionally, a
+directory of JSON files that survives restarts.
+
+The on-disk store is off by default. Enable it by setting the
+GR_FILTER_TAP_CACHE environment variable to a directory, or with
+default_cache.set_directory(). firdes designs can be cached with
+tap_cache.firdes, e.g. tap_cache.firdes.low_pass_2(...).
+'''
+
+import collections
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+
+
+class tap_cache(object):
+    '''
+    LRU cache of filter taps with an optional on-disk store.
+
+    Args:
+        maxsize: number of designs kept in memory
+        directory: directory of the on-disk store, None to disable it
+    '''
+
+    def __init__(self, maxsize=256, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.enabled = True
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def set_directory(self, directory):
+        self.directory = directory
+
+    def stats(self):
+        '''
+        Counters of the cache: 'hits' (in memory), 'disk_hits', 'misses'
+        (designs computed) and the number of designs in memory, 'size'.
+        '''
+        with self._lock:
+            return {'hits': self.hits, 'disk_hits': self.disk_hits,
+                    'misses': self.misses, 'size': len(self._entries)}
+
+    def clear(self, disk=False):
+        '''
+        Forget all designs and reset the counters; with disk=True the
+        files of the on-disk store are removed as well.
+        '''
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if disk and self.directory and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith('.taps.json'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.taps.json')
+
+    def _load(self, key):
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('key') != key:
+            return None
+        if 'imag' in entry:
+            return tuple(complex(re, im)
+                         for re, im in zip(entry['real'], entry['imag']))
+        return tuple(entry['real'])
+
+    def _store(self, key, taps):
+        entry = {'key': key}
+        if any(isinstance(t, complex) for t in taps):
+            entry['real'] = [complex(t).real for t in taps]
+            entry['imag'] = [complex(t).imag for t in taps]
+        else:
+            entry['real'] = [float(t) for t in taps]
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            pass  # the store is only an optimization
+
+    def lookup(self, key, design):
+        '''
+        Return the taps cached for key (a string), calling design() to
+        compute them on a miss. Exceptions of design are not cached.
+        '''
+        if not self.enabled:
+            return list(design())
+        with self._lock:
+            taps = self._entries.get(key)
+            if taps is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(taps)
+        if self.directory:
+            taps = self._load(key)
+            if taps is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._insert(key, taps)
+                return list(taps)
+
+        taps = tuple(design())
+        with self._lock:
+            self.misses += 1
+        self._insert(key, taps)
+        if self.directory:
+            self._store(key, taps)
+        return list(taps)
+
+    def _insert(self, key, taps):
+        with self._lock:
+            self._entries[key] = taps
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+default_cache = tap_cache(directory=os.environ.get('GR_FILTER_TAP_CACHE'))
+
+
+def design_key(kind, args):
+    '''
+    Cache key of a design: its kind and the repr of its arguments.
+    '''
+    return '{0}{1!r}'.format(kind, tuple(args))
+
+
+def cached_taps(kind, cache=None):
+    '''
+    Decorator memoizing a tap design function in cache (default_cache by
+    default). Arguments are normalized with the function's signature, so
+    passing a default explicitly hits the same entry.
+    '''
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = design_key(kind, bound.arguments.items())
+            return (cache or default_cache).lookup(
+                key, lambda: func(*args, **kwargs))
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+class _cached_firdes(object):
+    '''
+    filter.firdes with every design going through default_cache.
+    '''
+
+    def __getattr__(self, name):
+        from .filter_python import firdes
+        design = getattr(firdes, name)
+
+        def cached(*args):
+            return default_cache.lookup(
+                design_key('firdes.' + name, args), lambda: design(*args))
+        cached.__name__ = name
+        cached.__doc__ = design.__doc__
+        return cached
+
+
+firdes = _cached_firdes()
@@ -9,6 +9,7 @@
 #
 
 
+import functools
 import math
 import sys
 
@@ -49,6 +50,38 @@ def base2dec(s, base):
     return num
 
 
+def dec2base_array(num, base, l):
+    """
+    Vectorized dec2base: convert an array of numbers at once.
+    Returns an array with one more axis than 'num', holding the 'l'
+    digits of each number to base 'base' (most significant symbol first).
+    """
+    num = numpy.asarray(num, dtype=numpy.int64)
+    powers = base ** numpy.arange(l - 1, -1, -1, dtype=numpy.int64)
+    return (num[..., numpy.newaxis] // powers) % base
+
+
+# Cache size of the memoized table generators, see clear_cache()
+CACHE_SIZE = 64
+
+
+def _as_key(values):
+    # keep complex values complex, the tables are computed from the key
+    convert = complex if numpy.iscomplexobj(values) else float
+    return tuple(convert(v) for v in numpy.ravel(values))
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _isi_lookup(dim, constellation, channel):
+    points = numpy.reshape(constellation, (-1, dim))
+    M = points.shape[0]
+    L = len(channel)
+    # output symbol o is the channel input sequence of its base M digits
+    digits = dec2base_array(numpy.arange(M**L), M, L)
+    lookup = numpy.einsum('oid,i->od', points[digits], channel)
+    return tuple(lookup.ravel().tolist())
+
+
 def make_isi_lookup(mod, channel, normalize):
     """
     Automatically generate the lookup table that maps the FSM outputs
@@ -56,94 +89,96 @@ def make_isi_lookup(mod, channel, normalize):
     'mod'. Optional normalization of channel to unit energy.
     This table is used by the 'metrics' block to translate
     channel outputs to metrics for use with the Viterbi algorithm.
-    Limitations: currently supports only one-dimensional modulations.
+    For multi-dimensional modulations the channel is applied to every
+    dimension.
+    Tables are memoized per modulation and channel, so retraining
+    receivers can rebuild them cheaply.
     """
     dim = mod[0]
     constellation = mod[1]
 
     if normalize:
-        p = 0
+        p = math.sqrt(sum(c**2 for c in channel))
         for i in range(len(channel)):
-            p = p + channel[i]**2
-        for i in range(len(channel)):
-            channel[i] = channel[i] / math.sqrt(p)
+            channel[i] = channel[i] / p
 
-    lookup = list(range(len(constellation)**len(channel)))
-    for o in range(len(constellation)**len(channel)):
-        ss = dec2base(o, len(constellation), len(channel))
-        ll = 0
-        for i in range(len(channel)):
-            ll = ll + constellation[ss[i]] * channel[i]
-        lookup[o] = ll
-    return (1, lookup)
+    lookup = _isi_lookup(dim, _as_key(constellation), _as_key(channel))
+    return (dim, list(lookup))
 
 
-def make_cpm_signals(K, P, M, L, q, frac):
-    """
-    Automatically generate the signals appropriate for CPM
-    decomposition.
-    This decomposition is based on the paper by B. Rimoldi
-    "A decomposition approach to CPM", IEEE Trans. Info Theory, March 1988
-    See also my own notes at http://www.eecs.umich.edu/~anastas/docs/cpm.pdf
-    """
-    Q = numpy.size(q) / L
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _cpm_signals(K, P, M, L, q, frac):
+    q = numpy.array(q)
+    Q = numpy.size(q) // L
     h = (1.0 * K) / P
     f0 = -h * (M - 1) / 2
     dt = 0.0
     # maybe start at t=0.5
     t = (dt + numpy.arange(0, Q)) / Q
-    qq = numpy.zeros(Q)
-    for m in range(L):
-        qq = qq + q[m * Q:m * Q + Q]
-        w = math.pi * h * (M - 1) * t - 2 * math.pi * h * (
-            M - 1) * qq + math.pi * h * (L - 1) * (M - 1)
+    q = q[:L * Q].reshape(L, Q)
+    w = math.pi * h * (M - 1) * t - 2 * math.pi * h * (
+        M - 1) * q.sum(axis=0) + math.pi * h * (L - 1) * (M - 1)
 
+    # state x is the symbol history x // P (base M, L digits) and the
+    # phase state x % P
     X = (M**L) * P
-    PSI = numpy.empty((X, Q))
-    for x in range(X):
-        xv = dec2base(x / P, M, L)
-        xv = numpy.append(xv, x % P)
-        qq1 = numpy.zeros(Q)
-        for m in range(L):
-            qq1 = qq1 + xv[m] * q[m * Q:m * Q + Q]
-        psi = 2 * math.pi * h * xv[-1] + 4 * math.pi * h * qq1 + w
-        # print(psi)
-        PSI[x] = psi
+    x = numpy.arange(X)
+    xv = dec2base_array(x // P, M, L)
+    PSI = (2 * math.pi * h * (x % P)[:, numpy.newaxis] +
+           4 * math.pi * h * numpy.dot(xv, q) + w)
     PSI = numpy.transpose(PSI)
     SS = numpy.exp(1j * PSI)  # contains all signals as columns
-    # print(SS)
 
     # Now we need to orthogonalize the signals
     F = scipy.linalg.orth(SS)  # find an orthonormal basis for SS
-    # print(numpy.dot(numpy.transpose(F.conjugate()),F) # check for orthonormality)
     S = numpy.dot(numpy.transpose(F.conjugate()), SS)
-    # print(F)
-    # print(S)
 
     # We only want to keep those dimensions that contain most
     # of the energy of the overall constellation (eg, frac=0.9 ==> 90%)
     # evaluate mean energy in each dimension
     E = numpy.sum(numpy.absolute(S)**2, axis=1) / Q
     E = E / numpy.sum(E)
-    # print(E)
     Es = -numpy.sort(-E)
     Esi = numpy.argsort(-E)
-    # print(Es)
-    # print(Esi)
     Ecum = numpy.cumsum(Es)
-    # print(Ecum)
     v0 = numpy.searchsorted(Ecum, frac)
     N = v0 + 1
-    # print(v0)
-    # print(Esi[0:v0+1])
     Ff = numpy.transpose(numpy.transpose(F)[Esi[0:v0 + 1]])
-    # print(Ff)
     Sf = S[Esi[0:v0 + 1]]
-    # print(Sf)
 
     return (f0, SS, S, F, Sf, Ff, N)
 
 
+def make_cpm_signals(K, P, M, L, q, frac):
+    """
+    Automatically generate the signals appropriate for CPM
+    decomposition.
+    This decomposition is based on the paper by B. Rimoldi
+    "A decomposition approach to CPM", IEEE Trans. Info Theory, March 1988
+    See also my own notes at http://www.eecs.umich.edu/~anastas/docs/cpm.pdf
+    Results are memoized; the returned arrays are copies.
+    """
+    f0, SS, S, F, Sf, Ff, N = _cpm_signals(
+        K, P, M, L, _as_key(q), frac)
+    return (f0, SS.copy(), S.copy(), F.copy(), Sf.copy(), Ff.copy(), N)
+
+
+def clear_cache():
+    """
+    Drop the memoized lookup tables and CPM signals.
+    """
+    _isi_lookup.cache_clear()
+    _cpm_signals.cache_clear()
+
+
+def cache_info():
+    """
+    Hit/miss statistics of the memoized table generators.
+    """
+    return {'isi_lookup': _isi_lookup.cache_info(),
+            'cpm_signals': _cpm_signals.cache_info()}
+
+
 # return f0
 
 ######################################################################
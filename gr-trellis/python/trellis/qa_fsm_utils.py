@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+#
+
+import math
+
+import numpy
+
+from gnuradio import gr_unittest
+from gnuradio.trellis import fsm_utils
+
+
+class test_fsm_utils(gr_unittest.TestCase):
+
+    def setUp(self):
+        fsm_utils.clear_cache()
+
+    def test_001_dec2base_array(self):
+        digits = fsm_utils.dec2base_array(numpy.arange(3**4), 3, 4)
+        for n in range(3**4):
+            self.assertEqual(list(digits[n]), fsm_utils.dec2base(n, 3, 4))
+
+    def test_002_isi_lookup(self):
+        mod = fsm_utils.pam4
+        channel = list(fsm_utils.c_channel)
+        dim, lookup = fsm_utils.make_isi_lookup(mod, channel, True)
+        self.assertEqual(dim, 1)
+        self.assertAlmostEqual(sum(c**2 for c in channel), 1.0, 12)
+        expected = []
+        for o in range(4**len(channel)):
+            ss = fsm_utils.dec2base(o, 4, len(channel))
+            expected.append(sum(mod[1][s] * c for s, c in zip(ss, channel)))
+        self.assertFloatTuplesAlmostEqual(lookup, expected, 12)
+
+        # The same channel again comes from the cache
+        again = fsm_utils.make_isi_lookup(mod, channel, False)
+        self.assertFloatTuplesAlmostEqual(again[1], lookup, 12)
+        self.assertEqual(fsm_utils.cache_info()['isi_lookup'].hits, 1)
+
+    def test_003_isi_lookup_2d(self):
+        dim, lookup = fsm_utils.make_isi_lookup(
+            fsm_utils.psk4, [1.0, 0.5], False)
+        self.assertEqual(dim, 2)
+        self.assertEqual(len(lookup), 2 * 4**2)
+        # symbols 1 then 2: (0, 1) + 0.5 * (0, -1)
+        self.assertFloatTuplesAlmostEqual(lookup[2 * 6:2 * 7], [0.0, 0.5])
+
+    def test_004_isi_lookup_complex(self):
+        mod = (1, [1 + 1j, -1 - 1j])
+        dim, lookup = fsm_utils.make_isi_lookup(mod, [1, .5], False)
+        self.assertEqual(dim, 1)
+        self.assertComplexTuplesAlmostEqual(
+            lookup, [1.5 + 1.5j, 0.5 + 0.5j, -0.5 - 0.5j, -1.5 - 1.5j])
+
+        # a complex channel
+        dim, lookup = fsm_utils.make_isi_lookup(
+            fsm_utils.pam2, [1, 0.5j], False)
+        self.assertComplexTuplesAlmostEqual(
+            lookup, [-1 - 0.5j, -1 + 0.5j, 1 - 0.5j, 1 + 0.5j])
+
+    def test_005_cpm_signals(self):
+        K, P, M, L, Q = 1, 2, 2, 2, 4
+        q = numpy.arange(1, L * Q + 1) / (2.0 * L * Q)
+        f0, SS, S, F, Sf, Ff, N = fsm_utils.make_cpm_signals(
+            K, P, M, L, q, 0.999)
+        self.assertEqual(SS.shape, (Q, M**L * P))
+        h = float(K) / P
+        t = numpy.arange(Q) / float(Q)
+        qq = q[:Q] + q[Q:]
+        w = (math.pi * h * (M - 1) * t - 2 * math.pi * h * (M - 1) * qq +
+             math.pi * h * (L - 1) * (M - 1))
+        for x in range(M**L * P):
+            xv = fsm_utils.dec2base(x // P, M, L)
+            psi = (2 * math.pi * h * (x % P) + 4 * math.pi * h *
+                   (xv[0] * q[:Q] + xv[1] * q[Q:]) + w)
+            self.assertComplexTuplesAlmostEqual(
+                SS[:, x], numpy.exp(1j * psi), 12)
+        # The signals are recovered from their decomposition
+        self.assertComplexTuplesAlmostEqual(
+            numpy.dot(F, S).ravel(), SS.ravel(), 9)
+
+        # Cached results are copies
+        SS[:] = 0
+        again = fsm_utils.make_cpm_signals(K, P, M, L, q, 0.999)
+        self.assertFalse(numpy.all(again[1] == 0))
+        self.assertEqual(fsm_utils.cache_info()['cpm_signals'].hits, 1)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(test_fsm_utils)
@@ -0,0 +1,355 @@
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+"""
+Compile many flow graphs with the block library loaded only once.
+
+compile_files() compiles in a pool of worker processes, forked after the
+library was loaded so they all share it. CompileServer keeps a loaded
+library and its worker pool around in a long running process listening
+on a local socket; grcc --serve starts one and grcc --server sends it the
+files to compile.
+
+Hier blocks the flow graphs depend on are generated in the parent process
+before the work is handed to the workers, see generate_hier_blocks.
+"""
+
+import io
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import socketserver
+import threading
+
+from .core import Messages, errors
+from .core.io import yaml
+
+logger = logging.getLogger(__name__)
+
+# The platform of a worker process, inherited from the parent
+_worker_platform = None
+
+
+class _MessageCapture(object):
+    """Collects what Messages.send() gives to the messengers."""
+
+    def __enter__(self):
+        self._messengers = Messages.MESSENGERS_LIST[:]
+        self._buffer = io.StringIO()
+        Messages.MESSENGERS_LIST[:] = [self._buffer.write]
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Messages.MESSENGERS_LIST[:] = self._messengers
+
+    def getvalue(self):
+        return self._buffer.getvalue()
+
+
+def compile_file(platform, grc_file, output_dir):
+    """
+    Load and generate a flow graph.
+
+    Returns:
+        the generated file (None on errors), the status ("compiled",
+        "unchanged" if the generated files were up to date, or "error")
+        and the messages sent meanwhile
+    """
+    with _MessageCapture() as messages:
+        Messages.send('\n')
+        flow_graph, file_path = platform.load_and_generate_flow_graph(
+            os.path.abspath(grc_file), os.path.abspath(output_dir))
+    if not file_path:
+        status = 'error'
+    elif flow_graph.generation_skipped:
+        status = 'unchanged'
+    else:
+        status = 'compiled'
+    return file_path, status, messages.getvalue()
+
+
+def _init_worker(platform):
+    global _worker_platform
+    _worker_platform = platform
+
+
+def _compile_in_worker(job):
+    grc_file, output_dir = job
+    return compile_file(_worker_platform, grc_file, output_dir)
+
+
+def can_fork():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+class WorkerPool(object):
+    """
+    Worker processes forked from the current state of a platform.
+
+    Blocks loaded into the platform afterwards are unknown to the
+    workers, a new pool is needed then, see is_current.
+    """
+
+    def __init__(self, platform, jobs):
+        self.platform = platform
+        self.jobs = jobs
+        self._library = dict(platform.blocks)
+        # with fork, the platform is inherited instead of pickled
+        self._pool = multiprocessing.get_context('fork').Pool(
+            jobs, initializer=_init_worker, initargs=(platform,))
+
+    def compile(self, grc_files, output_dir):
+        """Like compile_file for each file, in order"""
+        return self._pool.imap(_compile_in_worker,
+                               [(f, output_dir) for f in grc_files])
+
+    def is_current(self):
+        """True if the library didn't change since the workers were forked"""
+        return self._library == self.platform.blocks
+
+    def close(self):
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _hier_block_src_path(platform, options):
+    if 'hier_block_src_path' in options:
+        return options['hier_block_src_path']
+    for param in platform.block_classes['options'].parameters_data:
+        if param.get('id') == 'hier_block_src_path':
+            return param.get('default', '')
+    return ''
+
+
+def _load_generated_block(platform, file_path):
+    """Load the description of a generated hier block into the library"""
+    yml_path = os.path.splitext(file_path)[0] + '.block.yml'
+    if not os.path.isfile(yml_path):
+        return None
+    with open(yml_path, encoding='utf-8') as fp:
+        data = yaml.safe_load(fp)
+    # Platform.load_block_description would also start the docstring
+    # extractor thread, which we don't want around when forking.
+    block_id = data['id'] = data['id'].rstrip('_')
+    try:
+        block_cls = platform.new_block_class(**data)
+    except errors.BlockLoadError:
+        logger.exception('Unable to load block %s', block_id)
+        return None
+    block_cls.loaded_from = yml_path
+    platform.blocks[block_id] = block_cls
+    return block_id
+
+
+def generate_hier_blocks(platform, grc_files):
+    """
+    Generate the hier blocks used by the flow graphs that are missing from
+    the library and load them into it, nested ones first.
+
+    Compiling the flow graphs would generate them as well, but in worker
+    processes several workers would write the same files at the same
+    time and the generated blocks would only be known to the one worker.
+    Errors are left to be reported when compiling the flow graphs.
+
+    Returns:
+        the ids of the loaded blocks
+    """
+    loaded = []
+    visited = set()
+
+    def visit(grc_file):
+        try:
+            data = platform.parse_flow_graph(grc_file)
+        except Exception:
+            return
+        search_path = _hier_block_src_path(
+            platform, data.get('options', {}).get('parameters', {}))
+        for block_data in data.get('blocks', []):
+            block_id = block_data.get('id')
+            if block_id in platform.blocks or block_id in visited:
+                continue
+            visited.add(block_id)
+            file_path = platform.find_file_in_paths(
+                filename=block_id + '.grc', paths=search_path, cwd=grc_file)
+            if not file_path:
+                continue
+            visit(file_path)
+            _, generated = platform.load_and_generate_flow_graph(
+                file_path, hier_only=True)
+            if generated:
+                loaded_id = _load_generated_block(platform, generated)
+                if loaded_id:
+                    loaded.append(loaded_id)
+
+    for grc_file in grc_files:
+        visit(os.path.abspath(grc_file))
+    return loaded
+
+
+def compile_files(platform, grc_files, output_dir, jobs=1, pool=None):
+    """
+    Compile flow graphs, in jobs worker processes sharing the platform.
+
+    Worker processes are forked, where that isn't available the files are
+    compiled one after the other. A WorkerPool given as pool is used
+    instead of forking new workers; it has to know the hier blocks of the
+    flow graphs already, see generate_hier_blocks.
+
+    Yields:
+        (grc_file, generated file or None, status, messages), in the order
+        given, see compile_file
+    """
+    grc_files = list(grc_files)
+    jobs = min(jobs, len(grc_files))
+    if pool is None and jobs > 1 and can_fork():
+        generate_hier_blocks(platform, grc_files)
+        with WorkerPool(platform, jobs) as new_pool:
+            yield from compile_files(platform, grc_files, output_dir,
+                                     pool=new_pool)
+        return
+
+    if pool is not None:
+        results = pool.compile(grc_files, output_dir)
+    else:
+        results = (compile_file(platform, grc_file, output_dir)
+                   for grc_file in grc_files)
+    for grc_file, result in zip(grc_files, results):
+        yield (grc_file,) + result
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        # One request per connection: workers forked meanwhile inherit the
+        # connection, so waiting for the client to close it would not end.
+        try:
+            reply = self.server.handle_request_data(
+                json.loads(self.rfile.readline().decode('utf-8')))
+        except Exception as error:
+            reply = {'error': str(error)}
+        self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+
+class CompileServer(socketserver.UnixStreamServer):
+    """
+    Compiles flow graphs on request, keeping the block library loaded.
+
+    A connection carries one request and its reply, JSON objects on a line
+    each:
+
+        {"files": [...], "output": dir, "user_lib_dir": false, "jobs": n}
+        -> {"results": [{"file": ..., "output": ..., "status": ...}],
+            "messages": "..."}
+
+    The status is "compiled", "unchanged" or "error". A file is unchanged
+    if the generated files are up to date, see Generator.write. The block
+    library stays as loaded though: after changing block descriptions or
+    hier block sources, {"command": "reload"} loads it again.
+    {"command": "shutdown"} stops the server.
+
+    The worker pool is kept between requests. It is forked again when the
+    library changed since, e.g. on reload or when new hier blocks were
+    loaded, and when a request asks for a different number of jobs.
+    """
+
+    def __init__(self, platform, socket_path, jobs=1):
+        self.platform = platform
+        self.jobs = jobs
+        self.socket_path = socket_path
+        self._pool = None
+        _remove_stale_socket(socket_path)
+        socketserver.UnixStreamServer.__init__(
+            self, socket_path, _RequestHandler)
+
+    def server_close(self):
+        self._close_pool()
+        socketserver.UnixStreamServer.server_close(self)
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+
+    def handle_request_data(self, data):
+        command = data.get('command', 'compile')
+        if command == 'compile':
+            if data.get('user_lib_dir'):
+                output_dir = self.platform.config.hier_block_lib_dir
+            else:
+                output_dir = data.get('output') or '.'
+            return self.compile(data['files'], output_dir,
+                                data.get('jobs') or self.jobs)
+        if command == 'reload':
+            self._close_pool()
+            self.platform.build_library()
+            return {'status': 'reloaded'}
+        if command == 'shutdown':
+            # shutdown() waits for serve_forever(), which is waiting for us
+            threading.Thread(target=self.shutdown).start()
+            return {'status': 'shutdown'}
+        raise ValueError('Unknown command {!r}'.format(command))
+
+    def compile(self, grc_files, output_dir, jobs=1):
+        output_dir = os.path.abspath(output_dir)
+        os.makedirs(os.path.realpath(output_dir), exist_ok=True)
+        grc_files = [os.path.abspath(f) for f in grc_files]
+        with _MessageCapture() as hier_messages:
+            pool = self._get_pool(grc_files, jobs)
+
+        reply = {'results': [], 'messages': hier_messages.getvalue()}
+        for grc_file, file_path, status, messages in compile_files(
+                self.platform, grc_files, output_dir, pool=pool):
+            reply['results'].append(
+                {'file': grc_file, 'output': file_path, 'status': status})
+            reply['messages'] += messages
+        return reply
+
+    def _get_pool(self, grc_files, jobs):
+        """The worker pool for compiling grc_files, None to compile here"""
+        if len(grc_files) < 2 or jobs < 2 or not can_fork():
+            return None
+        generate_hier_blocks(self.platform, grc_files)
+        if self._pool and (self._pool.jobs != jobs or
+                           not self._pool.is_current()):
+            self._close_pool()
+        if self._pool is None:
+            self._pool = WorkerPool(self.platform, jobs)
+        return self._pool
+
+    def _close_pool(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+
+def _remove_stale_socket(socket_path):
+    """Remove the socket of a server that is gone"""
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)
+            return
+    raise OSError('A compile server is already listening on ' + socket_path)
+
+
+def send_request(socket_path, data):
+    """Send a request to a CompileServer and return its reply"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(data).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reply:
+            return json.loads(reply.readline().decode('utf-8'))
@@ -12,6 +12,7 @@ import subprocess
 
 from gnuradio import gr
 
+from . import batch_compiler
 from .core import Messages
 from .core.platform import Platform
 
@@ -26,14 +27,19 @@ def argument_parser():
                         help="Output to default hier_block library (overwrites -o)")
     parser.add_argument("-r", "--run", action="store_true", default=False,
                         help="Run the program after compiling [default=%(default)s]")
-    parser.add_argument(metavar="GRC_FILE", dest='grc_files', nargs='+',
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of flow graphs to compile in parallel [default=%(default)s]")
+    parser.add_argument("--serve", metavar='SOCKET',
+                        help="Run a compile server listening on this socket, "
+                        "keeping the block library loaded")
+    parser.add_argument("--server", metavar='SOCKET',
+                        help="Compile on the server listening on this socket")
+    parser.add_argument(metavar="GRC_FILE", dest='grc_files', nargs='*',
                         help=".grc file to compile")
     return parser
 
 
-def main(args=None):
-    args = args or argument_parser().parse_args()
-
+def make_platform():
     platform = Platform(
         name='GNU Radio Companion Compiler',
         prefs=gr.prefs(),
@@ -42,6 +48,53 @@ def main(args=None):
                        gr.api_version(), gr.minor_version())
     )
     platform.build_library()
+    return platform
+
+
+def compile_on_server(args):
+    if args.run:
+        exit('Error: --run is not supported with --server')
+    try:
+        reply = batch_compiler.send_request(args.server, {
+            'files': [os.path.abspath(f) for f in args.grc_files],
+            'output': os.path.abspath(args.output),
+            'user_lib_dir': args.user_lib_dir,
+            'jobs': args.jobs,
+        })
+    except OSError as e:
+        exit('Error: no compile server at {}: {}'.format(args.server, e))
+    if 'error' in reply:
+        exit('Error: ' + reply['error'])
+    Messages.send(reply['messages'])
+    for result in reply['results']:
+        Messages.send('>>> {status}: {file}\n'.format(**result))
+    if any(result['status'] == 'error' for result in reply['results']):
+        exit('Compilation error')
+
+
+def serve(platform, args):
+    Messages.send_init(platform)
+    server = batch_compiler.CompileServer(platform, args.serve, args.jobs)
+    Messages.send('>>> Compile server listening on {}\n'.format(args.serve))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(args=None):
+    args = args or argument_parser().parse_args()
+
+    if not args.grc_files and not args.serve:
+        exit('Error: no GRC_FILE given')
+    if args.server:
+        return compile_on_server(args)
+
+    platform = make_platform()
+    if args.serve:
+        return serve(platform, args)
 
     output_dir = args.output if not args.user_lib_dir else platform.config.hier_block_lib_dir
     try:
@@ -52,6 +105,23 @@ def main(args=None):
 
     Messages.send_init(platform)
     flow_graph = file_path = None
+    if args.jobs > 1:
+        for grc_file in args.grc_files:
+            os.path.exists(grc_file) or exit('Error: missing ' + grc_file)
+        # with --run, the last one is compiled here to get its flow graph
+        batch = args.grc_files[:-1] if args.run else args.grc_files
+        failed = []
+        for grc_file, file_path, _, messages in batch_compiler.compile_files(
+                platform, batch, output_dir, args.jobs):
+            Messages.send(messages)
+            if not file_path:
+                failed.append(grc_file)
+        if failed:
+            exit('Compilation error: ' + ', '.join(failed))
+        if not args.run:
+            return
+        args.grc_files = args.grc_files[-1:]
+
     for grc_file in args.grc_files:
         os.path.exists(grc_file) or exit('Error: missing ' + grc_file)
         Messages.send('\n')
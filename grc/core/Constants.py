@@ -22,7 +22,7 @@ DEFAULT_FLOW_GRAPH = os.path.join(DATA_DIR, 'default_flow_graph.grc')
 DEFAULT_HIER_BLOCK_LIB_DIR = os.path.expanduser('~/.grc_gnuradio')
 DEFAULT_FLOW_GRAPH_ID = 'default'
 
-CACHE_FILE = os.path.expanduser('~/.cache/grc_gnuradio/cache_v2.json')
+CACHE_FILE = os.path.expanduser('~/.cache/grc_gnuradio/cache_v3.pickle')
 
 BLOCK_DESCRIPTION_FILE_FORMAT_VERSION = 1
 # File format versions:
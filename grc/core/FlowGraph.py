@@ -18,6 +18,7 @@ from .Constants import FLOW_GRAPH_FILE_FORMAT_VERSION
 from .base import Element
 from .utils import expr_utils
 from .utils.backports import shlex
+from .utils.dependency_graph import FlowGraphDependencies
 
 log = logging.getLogger(__name__)
 
@@ -43,10 +44,16 @@ class FlowGraph(Element):
         self.connections = set()
 
         self._eval_cache = {}
+        self._eval_stats = collections.Counter()
         self.namespace = {}
+        self.namespace_generation = 0
         self.imported_names = []
+        self._dependencies = FlowGraphDependencies(self)
+        self.rewrite_stats = {'mode': None, 'variables': 0, 'blocks': 0}
 
         self.grc_file_path = ''
+        # the generated files were up to date, see Generator.write
+        self.generation_skipped = False
 
     def __str__(self):
         return 'FlowGraph - {}({})'.format(self.get_option('title'), self.get_option('id'))
@@ -228,6 +235,81 @@ class FlowGraph(Element):
         """
         self.renew_namespace()
         Element.rewrite(self)
+        self._dependencies.reset()
+        self.rewrite_stats = {'mode': 'full',
+                              'variables': sum(1 for b in self.blocks if b.is_variable),
+                              'blocks': len(self.blocks)}
+
+    def validate(self):
+        Element.validate(self)
+        self._dependencies.validated = True
+
+    def rewrite_and_validate(self, incremental=True):
+        """
+        Rewrite and validate the flow graph.
+
+        With incremental set, only what changed since the last rewrite is
+        redone: changed variables and the variables depending on them are
+        re-evaluated, and the changed blocks and all blocks using a
+        re-evaluated variable are rewritten and validated. Anything else
+        (blocks or connections added or removed, ids, states, imports,
+        parameters, the options block...) falls back to a full rewrite.
+        """
+        plan = None
+        if incremental and self._dependencies.validated:
+            changed = self._dependencies.changed_blocks()
+            if changed == []:
+                self.rewrite_stats = {'mode': 'none', 'variables': 0, 'blocks': 0}
+                return
+            if changed is not None:
+                plan = self._dependencies.plan(changed)
+        if plan is None:
+            self.rewrite()
+            self.validate()
+            return
+
+        variables, blocks = plan
+        for variable_block in variables:
+            self._evaluate_variable(variable_block)
+
+        connections = set(self.connections)
+        blocks = [block for block in self.blocks if block in blocks]
+        touched = [c for c in self.connections
+                   if c.source_block in blocks or c.sink_block in blocks]
+        for block in blocks:
+            block.rewrite()
+        for connection in touched:
+            if connection in self.connections:
+                connection.rewrite()
+
+        if connections != self.connections:
+            # ports were hidden or removed, other blocks may be affected
+            self.validate()
+        else:
+            for block in blocks:
+                block.validate()
+            for connection in touched:
+                connection.validate()
+        self._dependencies.update(blocks)
+        self.rewrite_stats = {'mode': 'incremental', 'variables': len(variables),
+                              'blocks': len(blocks)}
+
+    def _evaluate_variable(self, variable_block):
+        try:
+            variable_block.rewrite()
+            value = eval(variable_block.value, self.namespace,
+                         variable_block.namespace)
+            self.namespace[variable_block.name] = value
+            self.namespace_changed()
+            return
+        except TypeError:  # Type Errors may happen, but that doesn't matter as they are displayed in the gui
+            pass
+        except Exception:
+            log.exception('Failed to evaluate variable block {0}'.format(
+                variable_block.name), exc_info=True)
+        # like a full rewrite, leave the failed variable out
+        self.namespace.pop(variable_block.name, None)
+        self.namespace_changed()
 
     def renew_namespace(self):
         namespace = {}
@@ -235,6 +317,7 @@ class FlowGraph(Element):
         # to get rid of entries of blocks that
         # are no longer valid ( deleted, disabled, ...)
         self.namespace.clear()
+        self.namespace_changed()
         # Load imports
         for expr in self.imports():
             try:
@@ -277,6 +360,7 @@ class FlowGraph(Element):
         # We need the updated namespace to evaluate the variable blocks
         # otherwise sometimes variable_block rewrite / eval fails
         self.namespace.update(namespace)
+        self.namespace_changed()
         # Load variables
         for variable_block in self.get_variables():
             try:
@@ -286,6 +370,7 @@ class FlowGraph(Element):
                 namespace[variable_block.name] = value
                 # rewrite on subsequent blocks depends on an updated self.namespace
                 self.namespace.update(namespace)
+                self.namespace_changed()
             except TypeError:  # Type Errors may happen, but that doesn't matter as they are displayed in the gui
                 pass
             except Exception:
@@ -293,19 +378,56 @@ class FlowGraph(Element):
                     variable_block.name), exc_info=True)
                 pass
 
+    def namespace_changed(self):
+        """
+        Start a new namespace generation: values cached by evaluate() are
+        dropped. Call after changing the namespace.
+        """
+        self.namespace_generation += 1
         self._eval_cache.clear()
 
     def evaluate(self, expr, namespace=None, local_namespace=None):
         """
         Evaluate the expression.
+
+        Expressions are compiled once. Values of expressions evaluated in
+        the flow graph namespace alone are cached until the namespace
+        changes.
         """
         # Evaluate
         if not expr:
             raise Exception('Cannot evaluate empty statement.')
+        code = expr_utils.compile_expr(expr) if isinstance(expr, str) else expr
         if namespace is not None:
-            return eval(expr, namespace, local_namespace)
+            self._eval_stats['uncached'] += 1
+            return eval(code, namespace, local_namespace)
+        if local_namespace is not None:
+            # the value depends on the local namespace as well
+            self._eval_stats['uncached'] += 1
+            return eval(code, self.namespace, local_namespace)
+        try:
+            value = self._eval_cache[expr]
+        except KeyError:
+            self._eval_stats['misses'] += 1
+            value = self._eval_cache[expr] = eval(code, self.namespace)
         else:
-            return self._eval_cache.setdefault(expr, eval(expr, self.namespace, local_namespace))
+            self._eval_stats['hits'] += 1
+        return value
+
+    def eval_cache_info(self):
+        """
+        Statistics of evaluate() since the flow graph was created: value
+        cache 'hits' and 'misses', 'uncached' evaluations (in another or
+        a local namespace), the current namespace 'generation' and number
+        of cached values ('size'), and the 'compiled' expression cache
+        info of the process.
+        """
+        info = {key: self._eval_stats[key]
+                for key in ('hits', 'misses', 'uncached')}
+        info['generation'] = self.namespace_generation
+        info['size'] = len(self._eval_cache)
+        info['compiled'] = expr_utils.compile_expr.cache_info()._asdict()
+        return info
 
     ##############################################
     # Add/remove stuff
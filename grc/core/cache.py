@@ -4,88 +4,201 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 #
 
-import json
+import concurrent.futures
 import logging
 import os
-import time
+import pickle
+import tempfile
 
+from . import schema_checker
 from .io import yaml
 
 logger = logging.getLogger(__name__)
 
+# Schema of each kind of description file
+SCHEMES = {
+    'block': schema_checker.BLOCK_SCHEME,
+    'domain': schema_checker.DOMAIN_SCHEME,
+    'tree': None,
+    None: None,  # no check
+}
+
+# Fewer changed files than this are parsed in-process
+PARALLEL_THRESHOLD = 32
+
+
+def file_key(filename):
+    """The modification time and size of a file, an entry is valid while they match"""
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_and_check(filename, scheme):
+    """Parse a description file and run the schema check of its kind on it"""
+    with open(filename, encoding='utf-8') as fp:
+        data = yaml.safe_load(fp)
+    checker = schema_checker.Validator(SCHEMES[scheme])
+    passed = checker.run(data)
+    return data, passed, [str(msg) for msg in checker.messages]
+
+
+def _load_and_check_in_worker(filename, scheme):
+    try:
+        return load_and_check(filename, scheme)
+    except Exception:
+        return None  # parsed again when loaded, to report the error there
+
 
 class Cache(object):
+    """
+    Snapshot of parsed and schema checked description files.
 
-    def __init__(self, filename, version=None):
+    Entries are pickled to filename and stay valid as long as the
+    modification time and size of their file match. prefetch() parses the
+    changed files in a process pool.
+    """
+
+    def __init__(self, filename, version=None, processes=None):
         self.cache_file = filename
         self.version = version
+        self.processes = processes  # None: one per CPU, 1: no pool
         self.cache = {}
-        self._cachetime = None
         self.need_cache_write = True
         self._accessed_items = set()
+        self._keys = {}
         try:
             os.makedirs(os.path.dirname(filename))
         except OSError:
             pass
-        try:
-            self._converter_mtime = os.path.getmtime(filename)
-        except OSError:
-            self._converter_mtime = -1
 
     def load(self):
+        self.need_cache_write = True
+        logger.debug(f"Loading block cache from: {self.cache_file}")
         try:
+            with open(self.cache_file, 'rb') as cache_file:
+                cache = pickle.load(cache_file)
+        except FileNotFoundError:
+            return
+        except Exception:  # anything can come out of a broken pickle
+            logger.info(f"Unreadable cache {self.cache_file} found, "
+                        "will be overwritten.", exc_info=True)
+            return
+        cacheversion = cache.get("version", None)
+        logger.debug(f"Cache version {cacheversion}")
+        if cacheversion == self.version:
+            logger.debug("Loaded block cache")
+            self.cache = cache["cache"]
             self.need_cache_write = False
-            logger.debug(f"Loading block cache from: {self.cache_file}")
-            with open(self.cache_file, encoding='utf-8') as cache_file:
-                cache = json.load(cache_file)
-            cacheversion = cache.get("version", None)
-            logger.debug(f"Cache version {cacheversion}")
-            self._cachetime = cache.get("cached-at", 0)
-            if cacheversion == self.version:
-                logger.debug("Loaded block cache")
-                self.cache = cache["cache"]
-            else:
-                logger.info(f"Outdated cache {self.cache_file} found, "
-                            "will be overwritten.")
-                raise ValueError()
-        except (IOError, ValueError):
-            self.need_cache_write = True
+        else:
+            logger.info(f"Outdated cache {self.cache_file} found, "
+                        "will be overwritten.")
 
-    def get_or_load(self, filename):
-        self._accessed_items.add(filename)
-        modtime = os.path.getmtime(filename)
-        if modtime <= self._converter_mtime:
-            try:
-                cached = self.cache[filename]
-                if int(cached["cached-at"] + 0.5) >= modtime:
-                    return cached["data"]
-                logger.info(f"Cache for {filename} outdated, loading yaml")
-            except KeyError:
-                pass
-
-        with open(filename, encoding='utf-8') as fp:
-            data = yaml.safe_load(fp)
-        self.cache[filename] = {
-            "cached-at": int(time.time()),
-            "data": data
+    def _lookup(self, filename, scheme):
+        key = self._keys.pop(filename, None) or file_key(filename)
+        entry = self.cache.get(filename)
+        if entry is None or entry['key'] != key or entry['scheme'] != scheme:
+            return key, None
+        return key, entry
+
+    def _store(self, filename, scheme, key, result):
+        data, passed, messages = result
+        entry = self.cache[filename] = {
+            'key': key,
+            'scheme': scheme,
+            'data': data,
+            'passed': passed,
+            'messages': messages,
         }
         self.need_cache_write = True
-        return data
+        return entry
+
+    def prefetch(self, files):
+        """
+        Parse and check the files that changed since the snapshot, in a
+        process pool if there are many.
+
+        Args:
+            files: (filename, scheme) pairs, scheme being a key of SCHEMES
+        """
+        changed = []
+        for filename, scheme in files:
+            try:
+                key, entry = self._lookup(filename, scheme)
+            except OSError:
+                continue
+            if entry is None:
+                changed.append((filename, scheme, key))
+            else:
+                self._keys[filename] = key
+
+        if not changed:
+            return
+        logger.debug('Parsing %d changed files', len(changed))
+        results = None
+        workers = self.processes or os.cpu_count() or 1
+        if len(changed) >= PARALLEL_THRESHOLD and workers > 1:
+            results = self._map_in_pool(changed, workers)
+        if results is None:
+            results = (_load_and_check_in_worker(filename, scheme)
+                       for filename, scheme, _ in changed)
+
+        for (filename, scheme, key), result in zip(changed, results):
+            if result is not None:
+                self._store(filename, scheme, key, result)
+                self._keys[filename] = key
+
+    def _map_in_pool(self, changed, workers):
+        filenames, schemes, _ = zip(*changed)
+        chunksize = max(1, len(changed) // (4 * workers))
+        try:
+            with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+                return list(pool.map(_load_and_check_in_worker, filenames,
+                                     schemes, chunksize=chunksize))
+        except Exception:
+            logger.debug('Parsing in a process pool failed', exc_info=True)
+            return None
+
+    def get_checked(self, filename, scheme):
+        """
+        The data of a description file, whether it passed the schema check
+        and the check messages. Unchanged files come from the snapshot,
+        without parsing or checking them again.
+        """
+        self._accessed_items.add(filename)
+        key, entry = self._lookup(filename, scheme)
+        if entry is None:
+            entry = self._store(filename, scheme, key,
+                                load_and_check(filename, scheme))
+        return entry['data'], entry['passed'], entry['messages']
+
+    def get_or_load(self, filename):
+        return self.get_checked(filename, None)[0]
 
     def save(self):
         if not self.need_cache_write:
             return
 
-        logger.debug('Saving %d entries to json cache', len(self.cache))
-        # Dumping to binary file is only supported for Python3 >= 3.6
-        with open(self.cache_file, 'w', encoding='utf8') as cache_file:
-            cache_content = {
-                "version": self.version,
-                "cached-at": self._cachetime,
-                "cache": self.cache
-            }
-            cache_file.write(
-                json.dumps(cache_content, ensure_ascii=False))
+        logger.debug('Saving %d entries to block cache', len(self.cache))
+        cache_content = {
+            "version": self.version,
+            "cache": self.cache
+        }
+        # write and rename, another GRC might be reading it
+        try:
+            fd, tmp_file = tempfile.mkstemp(
+                dir=os.path.dirname(self.cache_file), suffix='.tmp')
+        except OSError:
+            logger.warning('Unable to write block cache %s', self.cache_file)
+            return
+        try:
+            with os.fdopen(fd, 'wb') as cache_file:
+                pickle.dump(cache_content, cache_file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.cache_file)
+        except Exception:
+            logger.warning('Unable to write block cache %s', self.cache_file,
+                           exc_info=True)
+            os.remove(tmp_file)
 
     def prune(self):
         for filename in (set(self.cache) - self._accessed_items):
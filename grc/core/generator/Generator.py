@@ -9,6 +9,8 @@ from .hier_block import HierBlockGenerator, QtHierBlockGenerator
 from .top_block import TopBlockGenerator
 from .cpp_top_block import CppTopBlockGenerator
 from .cpp_hier_block import CppHierBlockGenerator
+from .generation_cache import GenerationCache
+from .. import Messages
 
 
 class Generator(object):
@@ -45,6 +47,28 @@ class Generator(object):
                 generator_cls = CppTopBlockGenerator
 
         self._generator = generator_cls(flow_graph, output_dir)
+        self._flow_graph = flow_graph
+
+    def write(self, force=False):
+        """
+        Generate output and write it to files, unless the files written
+        last time are there and nothing they depend on changed.
+
+        Args:
+            force: write even if the files are up to date
+
+        Returns:
+            True if files were written
+        """
+        cache = GenerationCache(self._flow_graph, self._generator)
+        if not force and cache.up_to_date():
+            self._generator._warnings()
+            Messages.send('>>> Up to date: {}\n'.format(self.file_path))
+            return False
+        cache.invalidate()
+        self._generator.write()
+        cache.update(self._generator.files_written)
+        return True
 
     def __getattr__(self, item):
         """get all other attrib from actual generator object"""
@@ -49,6 +49,7 @@ class CppTopBlockGenerator(object):
         filename = self._flow_graph.get_option('id')
         self.file_path = os.path.join(output_dir, filename)
         self.output_dir = output_dir
+        self.files_written = []
 
     def _warnings(self):
         throttling_blocks = [b for b in self._flow_graph.get_enabled_blocks()
@@ -101,6 +102,7 @@ class CppTopBlockGenerator(object):
         for filename, data in self._build_cpp_header_code_from_template():
             with codecs.open(filename, 'w', encoding='utf-8') as fp:
                 fp.write(data)
+            self.files_written.append(filename)
 
         if not self._generate_options.startswith('hb'):
             if not os.path.exists(os.path.join(self.file_path, 'build')):
@@ -109,11 +111,13 @@ class CppTopBlockGenerator(object):
             for filename, data in self._build_cpp_source_code_from_template():
                 with codecs.open(filename, 'w', encoding='utf-8') as fp:
                     fp.write(data)
+                self.files_written.append(filename)
 
             if fg.get_option('gen_cmake') == 'On':
                 for filename, data in self._build_cmake_code_from_template():
                     with codecs.open(filename, 'w', encoding='utf-8') as fp:
                         fp.write(data)
+                    self.files_written.append(filename)
 
     def _build_cpp_source_code_from_template(self):
         """
@@ -0,0 +1,123 @@
+# Copyright 2026 Free Software Foundation, Inc.
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+#
+
+import functools
+import glob
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+
+from .. import Constants
+from ..cache import file_key
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.dirname(__file__)
+
+# Where the stamps go, one per generated flow graph
+STAMP_DIR = os.path.join(os.path.dirname(Constants.CACHE_FILE), 'generated')
+
+
+@functools.lru_cache(maxsize=None)
+def _generator_digest(generator_cls):
+    """Hash of the templates and the code of a generator class"""
+    digest = hashlib.sha256()
+    sources = set(glob.glob(os.path.join(DATA_DIR, '*.mako')) +
+                  glob.glob(os.path.join(DATA_DIR, 'cpp_templates', '*.mako')))
+    for cls in inspect.getmro(generator_cls):
+        if cls is not object:
+            sources.add(inspect.getsourcefile(cls) or inspect.getfile(cls))
+    for source in sorted(sources):
+        with open(source, 'rb') as fp:
+            digest.update(source.encode('utf-8') + b'\0' + fp.read())
+    return digest.hexdigest()
+
+
+def _file_state(path):
+    try:
+        return list(file_key(path))
+    except OSError:
+        return None
+
+
+def generation_key(flow_graph, generator):
+    """
+    Hash of everything the generated files depend on: the flow graph, the
+    description files of the blocks it uses, the templates and generator
+    code, the GRC version and where the files go.
+    """
+    platform = flow_graph.parent_platform
+    blocks = {}
+    for block in flow_graph.blocks:
+        loaded_from = block.loaded_from
+        blocks[block.key] = (loaded_from, _file_state(loaded_from)
+                             if os.path.isfile(loaded_from) else None)
+    inputs = {
+        'flow_graph': flow_graph.export_data(),
+        'grc_file': flow_graph.grc_file_path,
+        'blocks': blocks,
+        'generator': _generator_digest(type(generator)),
+        'version': platform.config.version,
+        'file_path': generator.file_path,
+    }
+    data = json.dumps(inputs, sort_keys=True, default=repr)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class GenerationCache(object):
+    """
+    Tells whether the files of a generator are up to date.
+
+    A stamp file in STAMP_DIR, named after a hash of the output path,
+    holds the generation key of the last write and the modification time
+    and size of the files it wrote. The files are up to date if the key
+    is the same and none of them was modified or removed since.
+    """
+
+    def __init__(self, flow_graph, generator):
+        self.key = generation_key(flow_graph, generator)
+        output = os.path.abspath(generator.file_path)
+        self.stamp_file = os.path.join(STAMP_DIR, hashlib.sha256(
+            output.encode('utf-8')).hexdigest() + '.json')
+
+    def _load(self):
+        try:
+            with open(self.stamp_file, encoding='utf-8') as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+    def up_to_date(self):
+        stamp = self._load()
+        if not stamp or stamp.get('key') != self.key or not stamp['files']:
+            return False
+        return all(_file_state(path) == state
+                   for path, state in stamp['files'].items())
+
+    def update(self, files):
+        """Record the files written for the current key"""
+        stamp = {
+            'key': self.key,
+            'files': {path: _file_state(path) for path in files},
+        }
+        try:
+            os.makedirs(os.path.dirname(self.stamp_file), exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(
+                dir=os.path.dirname(self.stamp_file), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                json.dump(stamp, fp)
+            os.replace(tmp_file, self.stamp_file)
+        except OSError:
+            logger.debug('Unable to write %s', self.stamp_file, exc_info=True)
+
+    def invalidate(self):
+        try:
+            os.remove(self.stamp_file)
+        except OSError:
+            pass
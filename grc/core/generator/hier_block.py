@@ -53,6 +53,7 @@ class HierBlockGenerator(TopBlockGenerator):
 
         # Windows only supports S_IREAD and S_IWRITE, other flags are ignored
         os.chmod(self.file_path_yml, self._mode)
+        self.files_written.append(self.file_path_yml)
 
     def _build_block_n_from_flow_graph_io(self):
         """
@@ -41,6 +41,7 @@ class TopBlockGenerator(object):
         filename = self._flow_graph.get_option('id') + '.py'
         self.file_path = os.path.join(output_dir, filename)
         self.output_dir = output_dir
+        self.files_written = []
 
     def _warnings(self):
         throttling_blocks = [b for b in self._flow_graph.get_enabled_blocks()
@@ -88,6 +89,7 @@ class TopBlockGenerator(object):
                 fp.write(data)
             if filename == self.file_path:
                 os.chmod(filename, self._mode)
+            self.files_written.append(filename)
 
     def _build_python_code_from_template(self):
         """
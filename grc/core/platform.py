@@ -107,7 +107,7 @@ class Platform(Element):
             else:
                 generator = self.Generator(flow_graph, out_dir or file_path)
             Messages.send('>>> Generating: {}\n'.format(generator.file_path))
-            generator.write()
+            flow_graph.generation_skipped = not generator.write()
         except Exception as e:
             Messages.send(
                 '>>> Generate Error: {}: {}\n'.format(file_path, str(e)))
@@ -129,33 +129,35 @@ class Platform(Element):
         self.cpp_connection_templates.clear()
         self._block_categories.clear()
 
+        loaders = {
+            'block': self.load_block_description,
+            'domain': self.load_domain_description,
+            'tree': self.load_category_tree_description,
+        }
+        files = []
+        for file_path in self._iter_files_in_block_path(path):
+            if file_path.endswith('.block.yml'):
+                files.append((file_path, 'block'))
+            elif file_path.endswith('.domain.yml'):
+                files.append((file_path, 'domain'))
+            elif file_path.endswith('.tree.yml'):
+                files.append((file_path, 'tree'))
+
         with Cache(Constants.CACHE_FILE, version=self.config.version) as cache:
-            for file_path in self._iter_files_in_block_path(path):
-
-                if file_path.endswith('.block.yml'):
-                    loader = self.load_block_description
-                    scheme = schema_checker.BLOCK_SCHEME
-                elif file_path.endswith('.domain.yml'):
-                    loader = self.load_domain_description
-                    scheme = schema_checker.DOMAIN_SCHEME
-                elif file_path.endswith('.tree.yml'):
-                    loader = self.load_category_tree_description
-                    scheme = None
-                else:
-                    continue
+            # parse and check all changed files first, in parallel
+            cache.prefetch(files)
 
+            for file_path, kind in files:
                 try:
-                    checker = schema_checker.Validator(scheme)
-                    data = cache.get_or_load(file_path)
-                    passed = checker.run(data)
-                    for msg in checker.messages:
+                    data, passed, messages = cache.get_checked(file_path, kind)
+                    for msg in messages:
                         logger.warning('{:<40s} {}'.format(
                             os.path.basename(file_path), msg))
                     if not passed:
                         logger.info(
                             'YAML schema check failed for: ' + file_path)
 
-                    loader(data, file_path)
+                    loaders[kind](data, file_path)
                 except Exception as error:
                     logger.exception('Error while loading %s', file_path)
                     logger.exception(error)
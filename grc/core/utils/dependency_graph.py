@@ -0,0 +1,177 @@
+"""
+Copyright 2026 Free Software Foundation, Inc.
+This file is part of GNU Radio
+
+SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+
+from operator import attrgetter, methodcaller
+
+from . import expr_utils
+
+
+# Blocks that define names other than variables, change how every block
+# evaluates or validates, or are resolved through other blocks. Editing one
+# of them takes a full rewrite.
+STRUCTURAL_BLOCK_KEYS = frozenset([
+    'options', 'import', 'parameter', 'epy_module',
+    'virtual_source', 'virtual_sink', 'pad_source', 'pad_sink',
+])
+
+
+def block_snapshot(block):
+    """
+    The state of a block that affects rewrite and validate: its key, its
+    states (but not its position) and its param values.
+    """
+    states = block.states
+    return (
+        block.key,
+        states.get('state'), states.get('bus_source'), states.get('bus_sink'),
+        tuple((key, param.value) for key, param in block.params.items()),
+    )
+
+
+def block_names(block):
+    """
+    The identifiers used in the param values of a block.
+    """
+    names = set()
+    for param in block.params.values():
+        names.update(expr_utils.expr_names(param.value))
+    return names
+
+
+class FlowGraphDependencies(object):
+    """
+    Tracks which blocks use which names of the flow graph namespace, to
+    find what an edit affects.
+
+    After every full rewrite, reset() records a snapshot of all blocks.
+    plan() compares the blocks against it. If only param values or states
+    of ordinary blocks changed, it returns the variables to re-evaluate and
+    the blocks to rewrite and validate: the changed blocks and everything
+    that uses a changed variable, directly or through other variables.
+    Otherwise it returns None and the caller falls back to a full rewrite.
+    """
+
+    def __init__(self, flow_graph):
+        self.flow_graph = flow_graph
+        self._snapshots = None
+        self._connections = None
+        self.validated = False  # set by FlowGraph.validate()
+        self._names = {}  # block -> names used in its params
+        self._users = {}  # name -> blocks using it
+
+    def reset(self):
+        """
+        Record the current flow graph, after a full rewrite.
+        """
+        self.validated = False
+        self._snapshots = {}
+        self._names.clear()
+        self._users.clear()
+        for block in self.flow_graph.blocks:
+            self._track(block)
+        self._connections = set(self.flow_graph.connections)
+
+    def _track(self, block):
+        for name in self._names.pop(block, ()):
+            self._users[name].discard(block)
+        names = block_names(block)
+        self._names[block] = names
+        for name in names:
+            self._users.setdefault(name, set()).add(block)
+        self._snapshots[block] = block_snapshot(block)
+
+    def changed_blocks(self):
+        """
+        The blocks changed since the last snapshot, None if blocks or
+        connections were added or removed.
+        """
+        if self._snapshots is None:
+            return None
+        blocks = self.flow_graph.blocks
+        if (len(blocks) != len(self._snapshots) or
+                self._connections != self.flow_graph.connections):
+            return None
+        changed = []
+        for block in blocks:
+            snapshot = self._snapshots.get(block)
+            if snapshot is None:
+                return None
+            if snapshot != block_snapshot(block):
+                changed.append(block)
+        return changed
+
+    def plan(self, changed):
+        """
+        Work out what the changed blocks affect.
+
+        Returns (variables, blocks): the variable blocks to re-evaluate, in
+        dependency order, and the set of blocks to rewrite and validate.
+        Returns None if a full rewrite is needed.
+        """
+        snapshots = self._snapshots
+        for block in changed:
+            old = snapshots[block]
+            new = block_snapshot(block)
+            if block.key in STRUCTURAL_BLOCK_KEYS or old[0] != new[0]:
+                return None
+            if old[1:4] != new[1:4]:
+                return None  # enabled, bypassed or bus state
+            if block.states.get('bus_source') or block.states.get('bus_sink'):
+                return None
+            if block.params.get('id') is not None and \
+                    dict(old[4]).get('id') != block.name:
+                return None  # a name appeared or disappeared
+
+        for block in changed:
+            self._track(block)
+
+        dirty = set(changed)
+        pending = [block.name for block in changed if block.is_variable]
+        seen = set(pending)
+        while pending:
+            for user in self._users.get(pending.pop(), ()):
+                dirty.add(user)
+                if user.is_variable and user.name not in seen:
+                    seen.add(user.name)
+                    pending.append(user.name)
+
+        # Ports with inherited types take them from the connected blocks
+        peers = {}
+        for connection in self.flow_graph.connections:
+            source, sink = connection.source_block, connection.sink_block
+            peers.setdefault(source, set()).add(sink)
+            peers.setdefault(sink, set()).add(source)
+        pending = list(dirty)
+        while pending:
+            for peer in peers.get(pending.pop(), ()):
+                if peer not in dirty and \
+                        any(port.inherit_type for port in peer.ports()):
+                    dirty.add(peer)
+                    pending.append(peer)
+
+        # Qt GUI hints validate against the hints of all other blocks
+        if any('gui_hint' in block.params for block in dirty):
+            dirty.update(block for block in self.flow_graph.blocks
+                         if 'gui_hint' in block.params)
+
+        variables = [block for block in dirty
+                     if block.is_variable and block.enabled]
+        try:
+            variables = expr_utils.sort_objects(
+                variables, attrgetter('name'), methodcaller('get_var_make'))
+        except Exception:
+            return None  # circular dependency, let the full rewrite report it
+        return variables, dirty
+
+    def update(self, blocks):
+        """
+        Record the state of blocks after an incremental rewrite.
+        """
+        for block in blocks:
+            self._track(block)
+        self._connections = set(self.flow_graph.connections)
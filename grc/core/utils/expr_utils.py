@@ -8,6 +8,7 @@ SPDX-License-Identifier: GPL-2.0-or-later
 
 
 import ast
+import functools
 import string
 
 
@@ -44,6 +45,36 @@ def get_variable_dependencies(expr, vars):
     return set(v for v in vars if v in expr_toks)
 
 
+def expr_names(expr):
+    """
+    Return the set of identifiers in this expression (without parsing it,
+    so any string works). Attribute names count as identifiers too.
+
+    Args:
+        expr: an expression string
+
+    Returns:
+        a set of identifier strings
+    """
+    return set(tok for tok in _expr_split(str(expr))
+               if tok[0] in _ID_START_CHARS)
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_expr(expr):
+    """
+    Compile an expression string for eval(), once per string.
+
+    Args:
+        expr: an expression string
+
+    Returns:
+        a code object, evaluating like eval(expr) would
+    """
+    # eval() strips leading spaces and tabs from strings, compile() doesn't
+    return compile(expr.lstrip(' \t'), '<string>', 'eval')
+
+
 def sort_objects(objects, get_id, get_expr):
     """
     Sort a list of objects according to their expressions.
@@ -93,6 +124,7 @@ def sort_objects2(objects, id_getter, expr_getter, check_circular=True):
 
 
 VAR_CHARS = string.ascii_letters + string.digits + '_'
+_ID_START_CHARS = frozenset(string.ascii_letters + '_')
 
 
 class _graph(object):
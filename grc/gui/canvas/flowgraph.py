@@ -189,8 +189,7 @@ class FlowGraph(CoreFlowgraph, Drawable):
         Call the top level rewrite and validate.
         Call the top level create labels and shapes.
         """
-        self.rewrite()
-        self.validate()
+        self.rewrite_and_validate()
         self.update_elements_to_draw()
         self.create_labels()
         self.create_shapes()
@@ -0,0 +1,97 @@
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+"""
+Time full and incremental rewrite/validate of a large synthetic flow graph.
+
+Run from the source tree with:
+    python -m grc.tests.benchmark_rewrite [--variables N] [--chains N]
+"""
+
+import argparse
+import timeit
+from os import path
+
+from grc.core.platform import Platform
+
+
+def make_platform():
+    platform = Platform(
+        name='GNU Radio Companion Compiler',
+        prefs=None,
+        version='0.0.0',
+    )
+    platform.build_library([
+        path.join(path.dirname(__file__), '../../grc/blocks'),
+        path.join(path.dirname(__file__), '../../gr-blocks/grc')
+    ])
+    return platform
+
+
+def add_block(flow_graph, key, name, **params):
+    block = flow_graph.new_block(key)
+    block.params['id'].set_value(name)
+    for param_id, value in params.items():
+        block.params[param_id].set_value(value)
+    return block
+
+
+def make_flow_graph(platform, variables, chains):
+    """
+    Variables in ten dependency chains, each source -> multiply -> sink chain
+    of blocks using one of them.
+    """
+    flow_graph = platform.make_flow_graph()
+    flow_graph.options_block.params['id'].set_value('benchmark')
+    for i in range(variables):
+        value = 'var_{0} + 1'.format(i - 10) if i >= 10 else str(i)
+        add_block(flow_graph, 'variable', 'var_{0}'.format(i), value=value)
+    for i in range(chains):
+        src = add_block(flow_graph, 'blocks_null_source', 'src_{0}'.format(i),
+                        type='float')
+        mult = add_block(flow_graph, 'blocks_multiply_const_xx',
+                         'mult_{0}'.format(i), type='float',
+                         const='var_{0}'.format(i % variables))
+        snk = add_block(flow_graph, 'blocks_null_sink', 'snk_{0}'.format(i),
+                        type='float')
+        for block in (src, mult, snk):
+            block.rewrite()  # creates the ports
+        flow_graph.connect(src.sources[0], mult.sinks[0])
+        flow_graph.connect(mult.sources[0], snk.sinks[0])
+    flow_graph.rewrite_and_validate()
+    return flow_graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--variables', type=int, default=150)
+    parser.add_argument('--chains', type=int, default=133)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    flow_graph = make_flow_graph(make_platform(), args.variables, args.chains)
+    print('{0} blocks, {1} variables, {2} connections'.format(
+        len(flow_graph.blocks), args.variables, len(flow_graph.connections)))
+
+    edited = next(b for b in flow_graph.blocks
+                  if b.name == 'var_{0}'.format(args.variables * 2 // 3))
+    values = iter(range(10 ** 9))
+
+    def edit(incremental):
+        edited.params['value'].set_value(str(next(values)))
+        flow_graph.rewrite_and_validate(incremental=incremental)
+
+    for incremental in (False, True):
+        seconds = min(timeit.repeat(lambda: edit(incremental),
+                                    number=1, repeat=args.repeat))
+        print('{0:>12}: {1:8.1f} ms, rewrote {2[blocks]} blocks, '
+              '{2[variables]} variables'.format(
+                  'incremental' if incremental else 'full',
+                  seconds * 1e3, flow_graph.rewrite_stats))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+from os import path
+
+import pytest
+
+from grc.core.generator import generation_cache
+from grc.core.platform import Platform
+
+FLOW_GRAPH = """\
+options:
+  parameters:
+    id: {id}
+    generate_options: no_gui
+    output_language: python
+  states: {{state: enabled}}
+blocks:
+- name: samp_rate
+  id: variable
+  parameters:
+    value: '{samp_rate}'
+  states: {{state: enabled}}
+- name: src
+  id: blocks_null_source
+  parameters:
+    type: float
+  states: {{state: enabled}}
+- name: snk
+  id: blocks_null_sink
+  parameters:
+    type: float
+  states: {{state: enabled}}
+connections:
+- [src, '0', snk, '0']
+metadata:
+  file_format: 1
+"""
+
+
+@pytest.fixture(scope='module')
+def platform():
+    platform = Platform(
+        name='GNU Radio Companion Compiler',
+        prefs=None,
+        version='0.0.0',
+    )
+    platform.build_library([
+        path.join(path.dirname(__file__), '../../grc/blocks'),
+        path.join(path.dirname(__file__), '../../gr-blocks/grc')
+    ])
+    return platform
+
+
+@pytest.fixture(autouse=True)
+def stamp_dir(tmp_path, monkeypatch):
+    """Keeps the generation stamps out of the user's cache directory"""
+    stamp_dir = str(tmp_path / 'stamps')
+    monkeypatch.setattr(generation_cache, 'STAMP_DIR', stamp_dir)
+    return stamp_dir
+
+
+@pytest.fixture
+def write_flow_graph(tmp_path):
+    """Writes a flow graph file with a source, a sink and a variable"""
+    def write(name, samp_rate=32000):
+        grc_file = str(tmp_path / (name + '.grc'))
+        with open(grc_file, 'w') as fp:
+            fp.write(FLOW_GRAPH.format(id=name, samp_rate=samp_rate))
+        return grc_file
+    return write
+
+
+def _add_block(flow_graph, key, name, **params):
+    block = flow_graph.new_block(key)
+    block.params['id'].set_value(name)
+    for param_id, value in params.items():
+        block.params[param_id].set_value(value)
+    return block
+
+
+@pytest.fixture
+def flow_graph(platform):
+    """
+    A validated flow graph of dependent variables; 'unused' and the
+    blocks 'other' and 'other_snk' don't depend on samp_rate.
+    """
+    flow_graph = platform.make_flow_graph()
+    flow_graph.options_block.params['id'].set_value('top_block')
+    _add_block(flow_graph, 'variable', 'samp_rate', value='32000')
+    _add_block(flow_graph, 'variable', 'gain', value='samp_rate / 1000')
+    _add_block(flow_graph, 'variable', 'offset', value='gain + 1')
+    _add_block(flow_graph, 'variable', 'unused', value='5')
+    src = _add_block(flow_graph, 'blocks_null_source', 'src', type='float')
+    mult = _add_block(flow_graph, 'blocks_multiply_const_xx', 'mult',
+                      type='float', const='offset')
+    other = _add_block(flow_graph, 'blocks_multiply_const_xx', 'other',
+                       type='float', const='unused')
+    snk = _add_block(flow_graph, 'blocks_null_sink', 'snk', type='float')
+    other_snk = _add_block(flow_graph, 'blocks_null_sink', 'other_snk',
+                           type='float')
+    flow_graph.connect(src.sources[0], mult.sinks[0])
+    flow_graph.connect(mult.sources[0], snk.sinks[0])
+    flow_graph.connect(src.sources[0], other.sinks[0])
+    flow_graph.connect(other.sources[0], other_snk.sinks[0])
+    flow_graph.rewrite_and_validate()
+    return flow_graph
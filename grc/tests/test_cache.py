@@ -0,0 +1,89 @@
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+import glob
+from os import path
+
+from grc.core import cache
+
+BLOCKS = sorted(glob.glob(path.join(
+    path.dirname(__file__), '../../gr-blocks/grc/blocks_add_*.block.yml')))
+
+
+def count_parses(monkeypatch):
+    parsed = []
+    load_and_check = cache.load_and_check
+
+    def counting(filename, scheme):
+        parsed.append(filename)
+        return load_and_check(filename, scheme)
+    monkeypatch.setattr(cache, 'load_and_check', counting)
+    return parsed
+
+
+def test_snapshot_reused(tmp_path, monkeypatch):
+    cache_file = str(tmp_path / 'cache.pickle')
+    files = [(filename, 'block') for filename in BLOCKS]
+
+    with cache.Cache(cache_file, version='1') as first:
+        first.prefetch(files)
+        data = [first.get_checked(filename, 'block') for filename in BLOCKS]
+    assert all(passed for _, passed, _ in data)
+
+    parsed = count_parses(monkeypatch)
+    with cache.Cache(cache_file, version='1') as second:
+        second.prefetch(files)
+        assert [second.get_checked(filename, 'block')
+                for filename in BLOCKS] == data
+        assert not second.need_cache_write
+    assert parsed == []
+
+    # another version does not use it
+    with cache.Cache(cache_file, version='2') as third:
+        third.get_checked(BLOCKS[0], 'block')
+    assert parsed == [BLOCKS[0]]
+
+
+def test_changed_file(tmp_path, monkeypatch):
+    cache_file = str(tmp_path / 'cache.pickle')
+    block_file = tmp_path / 'test.block.yml'
+    with open(BLOCKS[0]) as f:
+        block_file.write_text(f.read())
+    block_file = str(block_file)
+
+    with cache.Cache(cache_file) as first:
+        label = first.get_checked(block_file, 'block')[0]['label']
+
+    with open(block_file, 'a') as f:
+        f.write('\ndocumentation: changed\n')
+    parsed = count_parses(monkeypatch)
+    with cache.Cache(cache_file) as second:
+        data, passed, _ = second.get_checked(block_file, 'block')
+    assert parsed == [block_file]
+    assert data['label'] == label
+    assert data['documentation'] == 'changed'
+
+
+def test_broken_snapshot(tmp_path):
+    cache_file = tmp_path / 'cache.pickle'
+    cache_file.write_bytes(b'not a pickle')
+    with cache.Cache(str(cache_file)) as broken:
+        assert broken.cache == {}
+        broken.get_checked(BLOCKS[0], 'block')
+    with cache.Cache(str(cache_file)) as fixed:
+        assert list(fixed.cache) == [BLOCKS[0]]
+
+
+def test_process_pool(tmp_path, monkeypatch):
+    files = [(filename, 'block') for filename in BLOCKS]
+    serial = cache.Cache(str(tmp_path / 'serial.pickle'), processes=1)
+    serial.prefetch(files)
+
+    monkeypatch.setattr(cache, 'PARALLEL_THRESHOLD', 1)
+    parallel = cache.Cache(str(tmp_path / 'parallel.pickle'), processes=2)
+    parallel.prefetch(files)
+    assert parallel.cache == serial.cache
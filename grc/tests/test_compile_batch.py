@@ -0,0 +1,169 @@
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+import os
+import threading
+from os import path
+
+from grc import batch_compiler
+
+HIER_BLOCK = """\
+options:
+  parameters:
+    id: {id}
+    generate_options: hb
+    output_language: python
+  states: {{state: enabled}}
+blocks:
+- name: src
+  id: blocks_null_source
+  parameters:
+    type: float
+  states: {{state: enabled}}
+- name: out
+  id: pad_sink
+  parameters:
+    type: float
+  states: {{state: enabled}}
+connections:
+- [src, '0', out, '0']
+metadata:
+  file_format: 1
+"""
+
+USES_HIER_BLOCK = """\
+options:
+  parameters:
+    id: {id}
+    generate_options: no_gui
+    output_language: python
+    hier_block_src_path: '{src_path}'
+  states: {{state: enabled}}
+blocks:
+- name: hb
+  id: {hier_block}
+  parameters: {{}}
+  states: {{state: enabled}}
+- name: snk
+  id: blocks_null_sink
+  parameters:
+    type: float
+  states: {{state: enabled}}
+connections:
+- [hb, '0', snk, '0']
+metadata:
+  file_format: 1
+"""
+
+
+def test_compile_files(platform, tmp_path, write_flow_graph):
+    grc_files = [write_flow_graph('fg_{}'.format(i))
+                 for i in range(4)]
+    grc_files.append(str(tmp_path / 'missing.grc'))
+
+    (tmp_path / 'serial').mkdir()
+    (tmp_path / 'parallel').mkdir()
+    serial = list(batch_compiler.compile_files(
+        platform, grc_files, str(tmp_path / 'serial'), jobs=1))
+    parallel = list(batch_compiler.compile_files(
+        platform, grc_files, str(tmp_path / 'parallel'), jobs=3))
+
+    assert [r[0] for r in parallel] == grc_files
+    assert parallel[-1][1:3] == (None, 'error')
+    for (_, serial_path, _, _), (_, parallel_path, status, messages) in zip(
+            serial[:-1], parallel[:-1]):
+        assert status == 'compiled'
+        assert path.dirname(parallel_path) == str(tmp_path / 'parallel')
+        assert path.basename(parallel_path) == path.basename(serial_path)
+        assert '>>> Generating' in messages
+        with open(serial_path) as a, open(parallel_path) as b:
+            assert a.read() == b.read()
+
+
+def test_hier_blocks_generated_once(platform, tmp_path, monkeypatch):
+    hier_src = tmp_path / 'hier'
+    hier_src.mkdir()
+    with open(str(hier_src / 'batch_test_hb.grc'), 'w') as fp:
+        fp.write(HIER_BLOCK.format(id='batch_test_hb'))
+    lib_dir = tmp_path / 'lib'
+    monkeypatch.setattr(platform.config, 'hier_block_lib_dir', str(lib_dir))
+    monkeypatch.delitem(platform.blocks, 'batch_test_hb', raising=False)
+
+    grc_files = []
+    for i in range(3):
+        grc_file = str(tmp_path / 'uses_hb_{}.grc'.format(i))
+        with open(grc_file, 'w') as fp:
+            fp.write(USES_HIER_BLOCK.format(
+                id='uses_hb_{}'.format(i), src_path=str(hier_src),
+                hier_block='batch_test_hb'))
+        grc_files.append(grc_file)
+
+    (tmp_path / 'out').mkdir()
+    results = list(batch_compiler.compile_files(
+        platform, grc_files, str(tmp_path / 'out'), jobs=3))
+    monkeypatch.delitem(platform.blocks, 'batch_test_hb')
+
+    assert all(file_path for _, file_path, _, _ in results)
+    # generated in the parent before forking, not by the workers
+    assert path.exists(str(lib_dir / 'batch_test_hb.block.yml'))
+    for _, _, _, messages in results:
+        assert 'batch_test_hb.py' not in messages
+
+
+def test_compile_server(platform, tmp_path, monkeypatch,
+                        write_flow_graph):
+    socket_path = str(tmp_path / 'grcc.sock')
+    server = batch_compiler.CompileServer(platform, socket_path, jobs=2)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        grc_files = [write_flow_graph('fg_a'),
+                     write_flow_graph('fg_b')]
+        request = {'files': grc_files, 'output': str(tmp_path / 'out')}
+
+        reply = batch_compiler.send_request(socket_path, request)
+        assert [r['status'] for r in reply['results']] == ['compiled'] * 2
+        assert all(path.exists(r['output']) for r in reply['results'])
+        pool = server._pool
+        assert pool is not None or not batch_compiler.can_fork()
+
+        write_flow_graph('fg_b', samp_rate=48000)
+        reply = batch_compiler.send_request(socket_path, request)
+        assert [r['status'] for r in reply['results']] == \
+            ['unchanged', 'compiled']
+        with open(reply['results'][1]['output']) as fp:
+            assert '48000' in fp.read()
+
+        os.remove(reply['results'][0]['output'])
+        write_flow_graph('fg_b', samp_rate=44100)
+        reply = batch_compiler.send_request(socket_path, request)
+        assert [r['status'] for r in reply['results']] == ['compiled'] * 2
+        # the workers stay around between requests
+        assert server._pool is pool
+
+        # unless the library changed since they were forked
+        monkeypatch.setitem(platform.blocks, 'batch_test_block',
+                            platform.blocks['variable'])
+        os.remove(reply['results'][0]['output'])
+        os.remove(reply['results'][1]['output'])
+        reply = batch_compiler.send_request(socket_path, request)
+        assert [r['status'] for r in reply['results']] == ['compiled'] * 2
+        assert server._pool is not pool or pool is None
+
+        reply = batch_compiler.send_request(socket_path, {'command': 'bad'})
+        assert 'error' in reply
+
+        reply = batch_compiler.send_request(socket_path,
+                                            {'command': 'shutdown'})
+        assert reply == {'status': 'shutdown'}
+        thread.join(10)
+        assert not thread.is_alive()
+    finally:
+        if thread.is_alive():
+            server.shutdown()
+        server.server_close()
+    assert not path.exists(socket_path)
@@ -38,3 +38,17 @@ def test_circular():
     # Should fail due to circular dependency
     with pytest.raises(Exception):
         expr_utils.sort_objects(test, id_getter, expr_getter)
+
+
+def test_compile_expr():
+    code = expr_utils.compile_expr(' \t2 * a + b')
+    assert eval(code, {'a': 1, 'b': 3}) == 5
+    assert expr_utils.compile_expr(' \t2 * a + b') is code
+
+    with pytest.raises(SyntaxError):
+        expr_utils.compile_expr('2 * ')
+
+
+def test_expr_names():
+    assert expr_utils.expr_names('firdes.low_pass(1, samp_rate, 2e3)') == \
+        {'firdes', 'low_pass', 'samp_rate'}
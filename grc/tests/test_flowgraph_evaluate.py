@@ -0,0 +1,32 @@
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+def test_evaluate_cache(flow_graph):
+    generation = flow_graph.namespace_generation
+
+    before = flow_graph.eval_cache_info()
+    assert flow_graph.evaluate('offset * 2') == 66.0
+    assert flow_graph.evaluate('offset * 2') == 66.0
+    info = flow_graph.eval_cache_info()
+    assert info['misses'] == before['misses'] + 1
+    assert info['hits'] == before['hits'] + 1
+    assert info['generation'] == generation
+
+    # a local namespace bypasses the value cache
+    assert flow_graph.evaluate('offset * 2', local_namespace={'offset': 1}) == 2
+    assert flow_graph.evaluate('offset * 2') == 66.0
+
+
+def test_full_rewrite_sees_new_values(flow_graph):
+    assert flow_graph.evaluate('offset') == 33.0
+
+    flow_graph.get_block('samp_rate').params['value'].set_value('48000')
+    flow_graph.rewrite()
+    flow_graph.validate()
+    assert flow_graph.namespace['offset'] == 49.0
+    assert flow_graph.evaluate('offset') == 49.0
+    assert flow_graph.get_block('mult').params['const'].get_evaluated() == 49.0
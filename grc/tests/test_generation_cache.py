@@ -0,0 +1,55 @@
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+import os
+
+
+def generate(platform, grc_file, output_dir, force=False):
+    flow_graph = platform.make_flow_graph(grc_file)
+    flow_graph.rewrite()
+    flow_graph.validate()
+    assert flow_graph.is_valid()
+    generator = platform.Generator(flow_graph, output_dir)
+    return generator.write(force=force), generator.file_path
+
+
+def test_generate_only_changed(platform, tmp_path, stamp_dir,
+                               write_flow_graph):
+    output_dir = str(tmp_path)
+    grc_file = write_flow_graph('fg')
+
+    assert generate(platform, grc_file, output_dir) == \
+        (True, str(tmp_path / 'fg.py'))
+    written, file_path = generate(platform, grc_file, output_dir)
+    assert not written
+    # the stamp is kept out of the output directory
+    assert sorted(os.listdir(output_dir)) == ['fg.grc', 'fg.py', 'stamps']
+    assert len(os.listdir(stamp_dir)) == 1
+
+    write_flow_graph('fg', samp_rate=48000)
+    assert generate(platform, grc_file, output_dir)[0]
+    with open(file_path) as fp:
+        assert '48000' in fp.read()
+    assert not generate(platform, grc_file, output_dir)[0]
+    assert generate(platform, grc_file, output_dir, force=True)[0]
+
+    # generated files edited or removed are written again
+    with open(file_path, 'a') as fp:
+        fp.write('# edited\n')
+    assert generate(platform, grc_file, output_dir)[0]
+    os.remove(file_path)
+    assert generate(platform, grc_file, output_dir)[0]
+    assert os.path.exists(file_path)
+
+
+def test_output_dir_in_key(platform, tmp_path, write_flow_graph):
+    grc_file = write_flow_graph('fg')
+    os.mkdir(str(tmp_path / 'a'))
+    os.mkdir(str(tmp_path / 'b'))
+    assert generate(platform, grc_file, str(tmp_path / 'a'))[0]
+    assert generate(platform, grc_file, str(tmp_path / 'b'))[0]
+    assert not generate(platform, grc_file, str(tmp_path / 'a'))[0]
@@ -38,4 +38,4 @@ def test_generator():
 
     generator = platform.Generator(
         flow_graph, path.join(path.dirname(__file__), 'resources'))
-    generator.write()
+    generator.write(force=True)
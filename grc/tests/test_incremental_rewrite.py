@@ -0,0 +1,66 @@
+# Copyright 2026 Free Software Foundation, Inc.
+#
+# This file is part of GNU Radio
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+def state_of(flow_graph):
+    namespace = {name: value for name, value in flow_graph.namespace.items()
+                 if name in ('samp_rate', 'gain', 'offset', 'unused')}
+    errors = sorted(flow_graph.get_error_messages())
+    return namespace, errors
+
+
+def test_incremental_matches_full(flow_graph):
+    assert flow_graph.rewrite_stats['mode'] == 'full'
+    assert flow_graph.is_valid()
+
+    flow_graph.get_block('samp_rate').params['value'].set_value('48000')
+    flow_graph.rewrite_and_validate()
+    stats = flow_graph.rewrite_stats
+    assert stats['mode'] == 'incremental'
+    assert stats['variables'] == 3
+    assert stats['blocks'] < len(flow_graph.blocks)
+    assert flow_graph.get_block('mult').params['const'].get_evaluated() == 49.0
+
+    incremental = state_of(flow_graph)
+    flow_graph.rewrite_and_validate(incremental=False)
+    assert flow_graph.rewrite_stats['mode'] == 'full'
+    assert state_of(flow_graph) == incremental
+
+
+def test_incremental_errors(flow_graph):
+    flow_graph.get_block('gain').params['value'].set_value('samp_rate / ')
+    flow_graph.rewrite_and_validate()
+    assert flow_graph.rewrite_stats['mode'] == 'incremental'
+    assert not flow_graph.is_valid()
+    incremental = state_of(flow_graph)
+    flow_graph.rewrite_and_validate(incremental=False)
+    assert state_of(flow_graph) == incremental
+
+    flow_graph.get_block('gain').params['value'].set_value('samp_rate / 100')
+    flow_graph.rewrite_and_validate()
+    assert flow_graph.rewrite_stats['mode'] == 'incremental'
+    assert flow_graph.is_valid()
+    assert flow_graph.namespace['offset'] == 321.0
+
+
+def test_no_changes(flow_graph):
+    flow_graph.rewrite_and_validate()
+    assert flow_graph.rewrite_stats['mode'] == 'none'
+
+
+def test_structural_changes_fall_back(flow_graph):
+    flow_graph.get_block('unused').params['id'].set_value('renamed')
+    flow_graph.rewrite_and_validate()
+    assert flow_graph.rewrite_stats['mode'] == 'full'
+
+    flow_graph.get_block('other').state = 'disabled'
+    flow_graph.rewrite_and_validate()
+    assert flow_graph.rewrite_stats['mode'] == 'full'
+
+    flow_graph.remove_element(flow_graph.get_block('other'))
+    flow_graph.rewrite_and_validate()
+    assert flow_graph.rewrite_stats['mode'] == 'full'
+    assert not flow_graph.is_valid()  # other_snk is unconnected